@@ -9,6 +9,12 @@ import requests
 import re
 import logging
 import traceback
+
+from partitioned_store import PartitionedStore
+
+# 월 파티션 저장소 폴더 (python partitioned_store.py ingest csv/ENTR_INT_INS.csv 로 생성)
+STORE_DIR = os.getenv("STORE_DIR", "store")
+
 load_dotenv()
 
 # 로깅 설정
@@ -309,6 +315,75 @@ def detect_file_encoding(uploaded_file):
         logging.warning(f"⚠️ 인코딩 감지 실패: {e}")
         return None
 
+def load_uploaded_file(uploaded_file):
+    """업로드된 CSV/Excel 파일을 DataFrame으로 로드합니다 (실패 시 None)"""
+    file_type = uploaded_file.name.split('.')[-1].lower()
+    
+    if file_type == 'csv':
+        # CSV 파일 인코딩 자동 감지 및 처리
+        try:
+            df = pd.read_csv(uploaded_file, encoding='utf-8')
+            logging.info("✅ CSV 파일을 UTF-8로 성공적으로 로드했습니다.")
+        except UnicodeDecodeError:
+            try:
+                # 한국어 CSV 파일의 경우 EUC-KR 또는 CP949 시도
+                uploaded_file.seek(0)  # 파일 포인터 리셋
+                df = pd.read_csv(uploaded_file, encoding='euc-kr')
+                logging.info("✅ CSV 파일을 EUC-KR로 성공적으로 로드했습니다.")
+            except UnicodeDecodeError:
+                try:
+                    uploaded_file.seek(0)  # 파일 포인터 리셋
+                    df = pd.read_csv(uploaded_file, encoding='cp949')
+                    logging.info("✅ CSV 파일을 CP949로 성공적으로 로드했습니다.")
+                except UnicodeDecodeError:
+                    try:
+                        uploaded_file.seek(0)  # 파일 포인터 리셋
+                        df = pd.read_csv(uploaded_file, encoding='latin1')
+                        logging.info("✅ CSV 파일을 Latin1로 성공적으로 로드했습니다.")
+                    except Exception as e:
+                        st.error(f"❌ CSV 파일 인코딩을 인식할 수 없습니다: {str(e)}")
+                        st.info("💡 해결 방법: CSV 파일을 UTF-8 인코딩으로 저장해주세요.")
+                        return None
+    else:
+        try:
+            df = pd.read_excel(uploaded_file)
+            logging.info("✅ Excel 파일을 성공적으로 로드했습니다.")
+        except Exception as e:
+            st.error(f"❌ Excel 파일을 읽을 수 없습니다: {str(e)}")
+            st.info("💡 해결 방법: 파일이 손상되지 않았는지 확인해주세요.")
+            return None
+    return df
+
+@st.cache_data(show_spinner=False)
+def load_partitioned_data(store_dir, dataset, columns, start_month, end_month):
+    """파티션 저장소에서 월 범위 밖 파티션은 건너뛰고 선택한 컬럼만 읽습니다"""
+    store = PartitionedStore(store_dir)
+    return store.read(dataset, columns=list(columns) if columns else None,
+                      start=start_month, end=end_month, verbose=False)
+
+def select_partitioned_data(store, datasets):
+    """저장소 데이터셋/월 범위/컬럼 선택 UI (선택 결과 DataFrame과 표시 이름 반환)"""
+    dataset = st.selectbox("데이터셋 선택:", datasets)
+    manifest = store.manifest(dataset)
+    months = [month for month in manifest['partitions'] if month != 'unknown']
+    
+    start_month, end_month = None, None
+    if len(months) > 1:
+        start_month, end_month = st.select_slider("기간 (월):", options=months, value=(months[0], months[-1]))
+    
+    columns = st.multiselect("컬럼 선택 (비우면 전체):", manifest['columns'])
+    
+    try:
+        df = load_partitioned_data(store.root, dataset, tuple(columns), start_month, end_month)
+    except Exception as e:
+        st.error(f"❌ 저장소 데이터를 읽을 수 없습니다: {str(e)}")
+        return None, None
+    
+    selected = len(store.partitions(dataset, start_month, end_month))
+    logging.info(f"✅ 저장소 {dataset} 로드: 파티션 {selected}/{len(manifest['partitions'])}개, {len(df)}행")
+    period = f" ({start_month} ~ {end_month})" if start_month else ""
+    return df, f"{dataset}{period}"
+
 #######################  1단계 : code 생성 ########################
 def generate_code_prompt(user_query: str, df_preview: dict, df_types: dict) -> str:
     print("📌 df 타입정보")
@@ -627,47 +702,27 @@ def main():
         else:
             st.warning("📝 로그: 파일 없음")
     
-    # 파일 업로드
-    uploaded_file = st.file_uploader("파일 업로드", type=["xls", "xlsx", "csv"])
-    if uploaded_file:
-        file_type = uploaded_file.name.split('.')[-1].lower()
-        
-        if file_type == 'csv':
-            # CSV 파일 인코딩 자동 감지 및 처리
-            try:
-                df = pd.read_csv(uploaded_file, encoding='utf-8')
-                logging.info("✅ CSV 파일을 UTF-8로 성공적으로 로드했습니다.")
-            except UnicodeDecodeError:
-                try:
-                    # 한국어 CSV 파일의 경우 EUC-KR 또는 CP949 시도
-                    uploaded_file.seek(0)  # 파일 포인터 리셋
-                    df = pd.read_csv(uploaded_file, encoding='euc-kr')
-                    logging.info("✅ CSV 파일을 EUC-KR로 성공적으로 로드했습니다.")
-                except UnicodeDecodeError:
-                    try:
-                        uploaded_file.seek(0)  # 파일 포인터 리셋
-                        df = pd.read_csv(uploaded_file, encoding='cp949')
-                        logging.info("✅ CSV 파일을 CP949로 성공적으로 로드했습니다.")
-                    except UnicodeDecodeError:
-                        try:
-                            uploaded_file.seek(0)  # 파일 포인터 리셋
-                            df = pd.read_csv(uploaded_file, encoding='latin1')
-                            logging.info("✅ CSV 파일을 Latin1로 성공적으로 로드했습니다.")
-                        except Exception as e:
-                            st.error(f"❌ CSV 파일 인코딩을 인식할 수 없습니다: {str(e)}")
-                            st.info("💡 해결 방법: CSV 파일을 UTF-8 인코딩으로 저장해주세요.")
-                            return
-        else:
-            try:
-                df = pd.read_excel(uploaded_file)
-                logging.info("✅ Excel 파일을 성공적으로 로드했습니다.")
-            except Exception as e:
-                st.error(f"❌ Excel 파일을 읽을 수 없습니다: {str(e)}")
-                st.info("💡 해결 방법: 파일이 손상되지 않았는지 확인해주세요.")
+    # 데이터 소스 선택 (파티션 저장소가 있으면 저장소에서 필요한 월/컬럼만 읽기 가능)
+    df = None
+    source_name = None
+    store = PartitionedStore(STORE_DIR)
+    store_datasets = store.datasets()
+    data_source = st.radio("데이터 소스:", ["파일 업로드", "파티션 저장소"], horizontal=True) if store_datasets else "파일 업로드"
+    
+    if data_source == "파티션 저장소":
+        df, source_name = select_partitioned_data(store, store_datasets)
+    else:
+        # 파일 업로드
+        uploaded_file = st.file_uploader("파일 업로드", type=["xls", "xlsx", "csv"])
+        if uploaded_file:
+            df = load_uploaded_file(uploaded_file)
+            if df is None:
                 return
-
+            source_name = uploaded_file.name
+    
+    if df is not None:
         # 파일 정보 표시
-        st.success(f"✅ 파일 업로드 성공: {uploaded_file.name}")
+        st.success(f"✅ 데이터 로드 성공: {source_name}")
         st.info(f"📊 데이터 크기: {len(df)}행 × {len(df.columns)}열")
         
         with st.expander("데이터 미리보기(사람용)"):
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임베딩 전 중복/유사 청크 제거
+청크를 토큰 shingle 집합으로 보고 MinHash 서명 + LSH 밴드 버킷(minhash.py)으로 후보를 찾은 뒤,
+실제 Jaccard 유사도가 기준 이상인 청크는 먼저 나온 대표 청크 하나로 합칩니다.
+제거된 청크의 위치(파일명, 청크 번호, 줄 범위)는 대표 청크의 duplicates 목록에 남깁니다.
+"""
+
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from hybrid_search import tokenize
+from minhash import BandedLSH, MinHashSignature
+
+SHINGLE_SIZE = 5  # shingle 하나의 토큰 수 (한글은 글자 2-gram 토큰)
+MINHASH_PERMUTATIONS = 128  # MinHash 서명 길이
+LSH_BANDS = 32  # LSH 밴드 수 (밴드당 4개 값, 유사도 0.7 이상에서 후보가 될 확률이 높음)
+DEDUP_THRESHOLD = 0.85  # 이 Jaccard 유사도 이상이면 중복으로 보고 합침
+DEDUP_REPORT_FILE = 'dedup_report.json'
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    청크의 토큰 shingle 해시 집합
+
+    Args:
+        text (str): 청크 텍스트
+        size (int): shingle 하나의 토큰 수
+
+    Returns:
+        np.ndarray: 중복 없는 64비트 shingle 해시 (uint64)
+    """
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        grams = [' '.join(tokens)] if tokens else []
+    else:
+        grams = [' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    hashes = {int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'little')
+              for gram in grams}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """두 shingle 해시 집합의 Jaccard 유사도"""
+    if len(a) == 0 and len(b) == 0:
+        return 1.0
+    common = len(np.intersect1d(a, b, assume_unique=True))
+    return common / (len(a) + len(b) - common)
+
+def _location(record: dict) -> dict:
+    """청크 원본 위치"""
+    location = {'filename': record['filename'], 'chunk_index': record['chunk_index']}
+    if record.get('lines'):
+        location['lines'] = record['lines']
+    return location
+
+def deduplicate_chunks(records: List[dict], threshold: float = DEDUP_THRESHOLD, num_perm: int = MINHASH_PERMUTATIONS,
+                       bands: int = LSH_BANDS, shingle_size: int = SHINGLE_SIZE) -> Tuple[List[dict], Dict]:
+    """
+    중복/유사 청크 제거
+
+    레코드 순서대로 처리하며, 앞서 남긴 청크와 LSH 버킷이 겹치고 Jaccard 유사도가 threshold 이상이면
+    가장 비슷한 대표 청크에 위치만 추가하고 버립니다. 대표끼리만 비교하므로 유사도가 사슬처럼 번지지 않습니다.
+
+    Args:
+        records (List[dict]): filename, chunk_index, chunk_text (선택: lines)를 가진 청크 레코드 (대표로 남길 순서)
+        threshold (float): 중복으로 볼 Jaccard 유사도
+        num_perm (int): MinHash 서명 길이 (bands로 나누어 떨어져야 함)
+        bands (int): LSH 밴드 수
+        shingle_size (int): shingle 하나의 토큰 수
+
+    Returns:
+        Tuple[List[dict], Dict]: (남긴 레코드 - 중복이 있으면 'duplicates' 위치 목록 추가, 보고서)
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어 떨어져야 합니다")
+    lsh = BandedLSH(bands, num_perm // bands)  # 남긴 청크의 서명만 색인
+
+    kept, kept_shingles = [], []
+    exact = {}  # 정규화 텍스트 해시 → 남긴 위치
+    groups = {}  # 남긴 위치 → [(중복 레코드, 유사도)]
+    exact_removed = near_removed = 0
+
+    for record in records:
+        text = record['chunk_text']
+        text_key = hashlib.md5(' '.join(text.split()).encode('utf-8')).digest()
+        if text_key in exact:
+            groups.setdefault(exact[text_key], []).append((record, 1.0))
+            exact_removed += 1
+            continue
+
+        record_shingles = shingles(text, shingle_size)
+        signature = MinHashSignature(num_perm)
+        signature.update_hashes(record_shingles)
+
+        candidates = lsh.query(signature.signature)
+        best, best_similarity = None, threshold
+        for position in sorted(candidates):
+            similarity = jaccard(record_shingles, kept_shingles[position])
+            if similarity >= best_similarity:
+                best, best_similarity = position, similarity
+        if best is not None:
+            groups.setdefault(best, []).append((record, best_similarity))
+            near_removed += 1
+            continue
+
+        position = len(kept)
+        kept.append(dict(record))
+        kept_shingles.append(record_shingles)
+        exact[text_key] = position
+        lsh.insert(position, signature.signature)
+
+    report_groups = []
+    for position, duplicates in sorted(groups.items()):
+        kept[position]['duplicates'] = [dict(_location(record), similarity=round(similarity, 4))
+                                        for record, similarity in duplicates]
+        report_groups.append({'kept': _location(kept[position]), 'duplicates': kept[position]['duplicates']})
+
+    removed_chars = sum(len(record['chunk_text']) for dups in groups.values() for record, _ in dups)
+    report = {
+        'total_chunks': len(records),
+        'kept_chunks': len(kept),
+        'removed_chunks': exact_removed + near_removed,
+        'exact_duplicates': exact_removed,
+        'near_duplicates': near_removed,
+        'removed_chars': removed_chars,
+        'removed_ratio': round((exact_removed + near_removed) / len(records), 4) if records else 0.0,
+        'threshold': threshold,
+        'groups': report_groups
+    }
+    return kept, report
+
+def save_report(report: Dict, path: str = DEDUP_REPORT_FILE):
+    """중복 제거 보고서를 JSON으로 저장 (임시 파일 → 교체)"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(path)
+
+def print_report(report: Dict):
+    """중복 제거 요약 출력"""
+    print(f"🧹 중복 청크 제거: {report['total_chunks']}개 중 {report['removed_chunks']}개 제거 "
+          f"({report['removed_ratio']:.1%}, 동일 {report['exact_duplicates']}개 / 유사 {report['near_duplicates']}개, "
+          f"{report['removed_chars']:,}자) → {report['kept_chunks']}개 임베딩 대상")
+
+def main():
+    """메인 실행 함수"""
+    from document_embedder import load_markdown_records
+
+    parser = argparse.ArgumentParser(description='문서 폴더의 중복/유사 청크 확인')
+    parser.add_argument('doc_folder', nargs='?', default='doc', help='문서 폴더 경로 (하위 폴더 포함, 숨김 폴더 제외)')
+    parser.add_argument('--threshold', type=float, default=DEDUP_THRESHOLD, help='중복으로 볼 Jaccard 유사도')
+    parser.add_argument('--report', default=DEDUP_REPORT_FILE, help='보고서 JSON 경로')
+    args = parser.parse_args()
+
+    records = load_markdown_records(args.doc_folder)
+    kept, report = deduplicate_chunks(records, threshold=args.threshold)
+    print_report(report)
+    for group in report['groups'][:10]:
+        kept_location = group['kept']
+        print(f"  📌 {kept_location['filename']}#{kept_location['chunk_index']} ← "
+              + ', '.join(f"{d['filename']}#{d['chunk_index']} ({d['similarity']:.2f})" for d in group['duplicates']))
+    save_report(report, args.report)
+    print(f"💾 보고서 저장: {args.report}")
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,98 @@ M-1 신규 가입자 정보(ENTR_INT_INS.csv)와 M-2 정산내역(ENTR_BY_INS.cs
 """
 
 import pandas as pd
+import numpy as np
 import os
+import json
+import argparse
+from collections import Counter
 from datetime import datetime
 from difflib import SequenceMatcher
 
+class ColumnNameIndex:
+    """
+    컬럼명 문자(한글 음절) n-gram 역색인
+    
+    SequenceMatcher의 일치 문자 수는 두 문자열의 공통 문자(중복 포함) 수를 넘을 수 없으므로
+    2 * 공통문자수 / (길이 합)은 유사도의 상한(quick_ratio)입니다. 역색인으로 이 상한을
+    벡터 연산으로 한 번에 구하고, 상한이 임계값 이상인 후보만 정확한 유사도를 계산합니다.
+    """
+    
+    def __init__(self, column_names):
+        """
+        역색인 생성
+        
+        Args:
+            column_names (list): 색인할 컬럼명 리스트 (순서가 결과의 동률 처리 기준)
+        """
+        self.column_names = list(column_names)
+        self.lengths = np.array([len(name) for name in self.column_names], dtype=np.int64)
+        
+        postings = {}
+        for col_id, name in enumerate(self.column_names):
+            for gram, count in Counter(name).items():
+                postings.setdefault(gram, ([], []))
+                postings[gram][0].append(col_id)
+                postings[gram][1].append(count)
+        
+        self.postings = {
+            gram: (np.array(ids, dtype=np.int64), np.array(counts, dtype=np.int64))
+            for gram, (ids, counts) in postings.items()
+        }
+    
+    def upper_bounds(self, query):
+        """
+        질의 컬럼명과 색인된 모든 컬럼명 간 유사도 상한 계산
+        
+        Args:
+            query (str): 질의 컬럼명
+        
+        Returns:
+            np.ndarray: 컬럼별 유사도 상한
+        """
+        common = np.zeros(len(self.column_names), dtype=np.int64)
+        for gram, query_count in Counter(query).items():
+            if gram in self.postings:
+                ids, counts = self.postings[gram]
+                common[ids] += np.minimum(counts, query_count)
+        
+        total = self.lengths + len(query)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, 2.0 * common / total, 1.0)
+    
+    def top_k(self, query, similarity_func, k=1, threshold=0.7, exclude_exact=True):
+        """
+        질의 컬럼명과 가장 유사한 상위 k개 컬럼 검색 (전수 비교와 동일한 결과)
+        
+        Args:
+            query (str): 질의 컬럼명
+            similarity_func (callable): 정확한 유사도 함수 (str, str) -> float
+            k (int): 반환할 최대 결과 수
+            threshold (float): 최소 유사도
+            exclude_exact (bool): 동일한 컬럼명 제외 여부
+        
+        Returns:
+            list: (컬럼 위치, 유사도) 리스트 (유사도 내림차순, 동률은 색인 순서)
+        """
+        bounds = self.upper_bounds(query)
+        candidates = np.nonzero(bounds >= threshold)[0]
+        # 상한이 높은 후보부터 평가하여, 상한이 현재 k번째 점수보다 낮아지면 중단
+        candidates = candidates[np.argsort(-bounds[candidates], kind='stable')]
+        
+        scored = []
+        for col_id in candidates:
+            if len(scored) >= k and bounds[col_id] < scored[k - 1][1]:
+                break
+            name = self.column_names[col_id]
+            if exclude_exact and name == query:
+                continue
+            similarity = similarity_func(query, name)
+            if similarity >= threshold:
+                scored.append((int(col_id), similarity))
+                scored.sort(key=lambda x: (-x[1], x[0]))
+        
+        return scored[:k]
+
 class ColumnMapper:
     def __init__(self, column_info_file='column_info.csv'):
         """
@@ -24,6 +112,11 @@ class ColumnMapper:
         self.m2_columns = []  # M-2 정산내역 컬럼
         self.plan_columns = []  # 요금제 정보 컬럼
         self.mapping_results = []
+        self.value_join_keys = []  # 값 기반 조인 키 후보
+        self.plan_code_matches = []  # 가입자 요금제코드 컬럼별 요금제 정보 매핑 통계
+        self.file_columns = {}  # 파일명 -> 컬럼 정보 (column_info.csv의 모든 파일)
+        self.similarity_cache = {}  # 파일 쌍별 컬럼명 유사도 (column_similarity_cache.json)
+        self.name_indexes = {}  # 파일명 -> ColumnNameIndex
         
     def load_column_info(self):
         """컬럼 정보 CSV 파일을 로드하고 파일별로 분류"""
@@ -34,15 +127,24 @@ class ColumnMapper:
         try:
             df = pd.read_csv(self.column_info_file, encoding='utf-8')
             
-            # 파일별로 컬럼 정보 분류
+            # 파일별로 컬럼 정보 분류 (파일 수 제한 없음)
+            self.file_columns = {
+                file_name: group.copy()
+                for file_name, group in df.groupby('파일명', sort=False)
+            }
+            
+            # 기존 M-1/M-2/요금제 분석용
             self.m1_columns = df[df['파일명'] == 'ENTR_INT_INS.csv'].copy()
             self.m2_columns = df[df['파일명'] == 'ENTR_BY_INS.csv'].copy()
             self.plan_columns = df[df['파일명'] == 'MVNO_PRD_PLC.csv'].copy()
             
-            print(f"✅ 컬럼 정보 로드 완료:")
+            print(f"✅ 컬럼 정보 로드 완료 ({len(self.file_columns)}개 파일):")
             print(f"  - M-1 신규 가입자: {len(self.m1_columns)}개 컬럼")
             print(f"  - M-2 정산내역: {len(self.m2_columns)}개 컬럼")
             print(f"  - 요금제 정보: {len(self.plan_columns)}개 컬럼")
+            for file_name, columns in self.file_columns.items():
+                if file_name not in ('ENTR_INT_INS.csv', 'ENTR_BY_INS.csv', 'MVNO_PRD_PLC.csv'):
+                    print(f"  - {file_name}: {len(columns)}개 컬럼")
             
             return True
             
@@ -87,29 +189,29 @@ class ColumnMapper:
         
         return exact_matches
     
-    def find_similar_matches(self, threshold=0.7):
-        """유사한 컬럼명 찾기"""
+    def find_similar_matches(self, threshold=0.7, top_k=1):
+        """
+        유사한 컬럼명 찾기
+        
+        M-2 컬럼명 역색인으로 후보를 좁힌 뒤 후보에 대해서만 유사도를 계산합니다.
+        
+        Args:
+            threshold (float): 최소 유사도
+            top_k (int): M-1 컬럼별로 반환할 최대 유사 컬럼 수 (기본 1: 최고 유사 컬럼)
+        """
         similar_matches = []
         
+        m2_rows = self.m2_columns.reset_index(drop=True)
+        index = ColumnNameIndex(m2_rows['컬럼명'].tolist())
+        
         for _, m1_row in self.m1_columns.iterrows():
             m1_col = m1_row['컬럼명']
-            best_match = None
-            best_similarity = 0
             
-            for _, m2_row in self.m2_columns.iterrows():
-                m2_col = m2_row['컬럼명']
-                
-                # 완전 일치는 제외
-                if m1_col == m2_col:
-                    continue
+            # 완전 일치는 제외하고 역색인 후보 중 유사도가 높은 컬럼 검색
+            for m2_pos, similarity in index.top_k(m1_col, self.calculate_similarity,
+                                                  k=top_k, threshold=threshold):
+                best_match = m2_rows.iloc[m2_pos]
                 
-                similarity = self.calculate_similarity(m1_col, m2_col)
-                
-                if similarity > best_similarity and similarity >= threshold:
-                    best_similarity = similarity
-                    best_match = m2_row
-            
-            if best_match is not None:
                 # 엑셀 컬럼 ID 가져오기
                 m1_excel_id = m1_row.get('엑셀컬럼ID', f"Col{m1_row['컬럼번호']}")
                 m2_excel_id = best_match.get('엑셀컬럼ID', f"Col{best_match['컬럼번호']}")
@@ -124,12 +226,193 @@ class ColumnMapper:
                     'm2_column': best_match['컬럼명'],
                     'm2_type': best_match['데이터타입'],
                     'm2_missing': f"{best_match['결측값개수']}개 ({best_match['결측값비율(%)']}%)",
-                    'similarity': best_similarity,
-                    'notes': f'유사도: {best_similarity:.2f}'
+                    'similarity': similarity,
+                    'notes': f'유사도: {similarity:.2f}'
                 })
         
         return similar_matches
     
+    def build_similarity_cache(self, cache_file='column_similarity_cache.json', min_similarity=0.5):
+        """
+        모든 파일 쌍의 컬럼명 유사도를 계산하여 캐시 파일로 저장
+        
+        캐시에 이미 있는 파일(컬럼 구성이 동일한 경우)은 다시 비교하지 않으므로,
+        새 파일이 추가되면 새 파일의 컬럼만 기존 파일들의 역색인과 비교합니다.
+        
+        Args:
+            cache_file (str): 유사도 캐시 JSON 파일 경로
+            min_similarity (float): 캐시에 저장할 최소 유사도 (보고서 임계값은 이 이상이어야 함)
+        
+        Returns:
+            int: 새로 비교한 파일 수
+        """
+        cache = {'min_similarity': min_similarity, 'files': {}, 'pairs': {}}
+        
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                # 더 낮은 임계값이 필요하면 캐시를 재사용할 수 없음
+                if cached.get('min_similarity', 1.0) <= min_similarity:
+                    cache = cached
+                else:
+                    print(f"⚠️ 캐시 최소 유사도({cached.get('min_similarity')})가 요청값({min_similarity})보다 높아 다시 계산합니다.")
+            except Exception as e:
+                print(f"⚠️ 유사도 캐시 로드 실패, 다시 계산합니다: {str(e)}")
+        
+        current_files = {
+            file_name: columns['컬럼명'].tolist()
+            for file_name, columns in self.file_columns.items()
+        }
+        
+        # 삭제되었거나 컬럼 구성이 바뀐 파일은 캐시에서 제거
+        stale_files = [
+            file_name for file_name, column_names in cache['files'].items()
+            if current_files.get(file_name) != column_names
+        ]
+        for file_name in stale_files:
+            del cache['files'][file_name]
+        cache['pairs'] = {
+            pair_key: matches for pair_key, matches in cache['pairs'].items()
+            if all(file_name in cache['files'] for file_name in pair_key.split('|'))
+        }
+        
+        new_files = [file_name for file_name in current_files if file_name not in cache['files']]
+        
+        for new_file in new_files:
+            new_columns = current_files[new_file]
+            
+            # 새 파일의 컬럼만 이미 색인된 파일들과 비교
+            for indexed_file in list(cache['files']):
+                index = self._get_name_index(indexed_file, cache['files'][indexed_file])
+                matches = []
+                for new_col in new_columns:
+                    for pos, similarity in index.top_k(new_col, self.calculate_similarity,
+                                                       k=len(index.column_names),
+                                                       threshold=min_similarity,
+                                                       exclude_exact=False):
+                        matches.append((new_col, index.column_names[pos], round(similarity, 4)))
+                
+                file_a, file_b = sorted([new_file, indexed_file])
+                if file_a != new_file:
+                    matches = [(col_b, col_a, similarity) for col_a, col_b, similarity in matches]
+                cache['pairs'][f"{file_a}|{file_b}"] = [list(match) for match in matches]
+            
+            cache['files'][new_file] = new_columns
+            print(f"✅ {new_file}: {len(new_columns)}개 컬럼을 기존 {len(cache['files']) - 1}개 파일과 비교")
+        
+        if new_files or stale_files:
+            try:
+                with open(cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(cache, f, ensure_ascii=False, indent=1)
+                print(f"✅ 유사도 캐시가 '{cache_file}' 파일로 저장되었습니다.")
+            except Exception as e:
+                print(f"❌ 유사도 캐시 저장 중 오류: {str(e)}")
+        else:
+            print(f"✅ 유사도 캐시 재사용: {len(cache['pairs'])}개 파일 쌍")
+        
+        self.similarity_cache = cache
+        return len(new_files)
+    
+    def _get_name_index(self, file_name, column_names):
+        """파일별 컬럼명 역색인 (메모리 내 재사용)"""
+        index = self.name_indexes.get(file_name)
+        if index is None or index.column_names != list(column_names):
+            index = ColumnNameIndex(column_names)
+            self.name_indexes[file_name] = index
+        return index
+    
+    def get_pair_matches(self, file_a, file_b, threshold=0.7):
+        """
+        캐시에서 두 파일 간 유사도 임계값 이상의 컬럼 쌍 조회
+        
+        Args:
+            file_a (str): 첫 번째 파일명
+            file_b (str): 두 번째 파일명
+            threshold (float): 최소 유사도
+        
+        Returns:
+            list: (file_a 컬럼명, file_b 컬럼명, 유사도) 리스트 (유사도 내림차순)
+        """
+        first, second = sorted([file_a, file_b])
+        matches = self.similarity_cache.get('pairs', {}).get(f"{first}|{second}", [])
+        
+        if first != file_a:
+            matches = [(col_b, col_a, similarity) for col_a, col_b, similarity in matches]
+        
+        matches = [tuple(match) for match in matches if match[2] >= threshold]
+        return sorted(matches, key=lambda x: -x[2])
+    
+    def generate_pairwise_report(self, output_file='column_mapping_all_pairs.md', pairs=None, threshold=0.7):
+        """
+        파일 쌍별 매핑 보고서 생성 (전체 쌍 또는 선택한 쌍)
+        
+        Args:
+            output_file (str): 출력 마크다운 파일 경로
+            pairs (list): (파일A, 파일B) 튜플 리스트 (None이면 모든 파일 쌍)
+            threshold (float): 최소 유사도
+        """
+        if not self.similarity_cache:
+            print("❌ 유사도 캐시가 없습니다. build_similarity_cache()를 먼저 실행하세요.")
+            return
+        
+        if threshold < self.similarity_cache.get('min_similarity', 0):
+            print(f"⚠️ 임계값 {threshold}가 캐시 최소 유사도보다 낮아 {self.similarity_cache['min_similarity']}로 조정합니다.")
+            threshold = self.similarity_cache['min_similarity']
+        
+        file_names = list(self.file_columns)
+        if pairs is None:
+            pairs = [(file_names[i], file_names[j])
+                     for i in range(len(file_names)) for j in range(i + 1, len(file_names))]
+        
+        md_content = []
+        
+        # 헤더
+        md_content.append("# 파일 쌍별 컬럼 매핑 보고서")
+        md_content.append(f"\n**분석 일시**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        md_content.append(f"**분석 파일**: {len(file_names)}개, **파일 쌍**: {len(pairs)}개, **최소 유사도**: {threshold}")
+        
+        # 파일 쌍별 매핑 컬럼 수 요약
+        md_content.append("\n## 📊 매핑 요약")
+        md_content.append("| 파일 A | 파일 B | A 컬럼 수 | B 컬럼 수 | 완전 일치 | 유사 컬럼 |")
+        md_content.append("|--------|--------|-----------|-----------|-----------|-----------|")
+        
+        pair_matches = []
+        for file_a, file_b in pairs:
+            if file_a not in self.file_columns or file_b not in self.file_columns:
+                print(f"⚠️ {file_a} ↔ {file_b}: column_info에 없는 파일이 있어 건너뜁니다.")
+                continue
+            matches = self.get_pair_matches(file_a, file_b, threshold)
+            exact_count = sum(1 for _, _, similarity in matches if similarity >= 1.0)
+            md_content.append(f"| {file_a} | {file_b} | {len(self.file_columns[file_a])} | {len(self.file_columns[file_b])} | {exact_count} | {len(matches) - exact_count} |")
+            pair_matches.append((file_a, file_b, matches))
+        
+        # 파일 쌍별 상세
+        for file_a, file_b, matches in pair_matches:
+            md_content.append(f"\n## 🔗 {file_a} ↔ {file_b}")
+            
+            if not matches:
+                md_content.append("매핑 가능한 컬럼이 없습니다.")
+                continue
+            
+            types_a = self.file_columns[file_a].set_index('컬럼명')['데이터타입'].to_dict()
+            types_b = self.file_columns[file_b].set_index('컬럼명')['데이터타입'].to_dict()
+            
+            md_content.append("| 컬럼 A | A 타입 | 컬럼 B | B 타입 | 유사도 | 구분 |")
+            md_content.append("|--------|--------|--------|--------|--------|------|")
+            for col_a, col_b, similarity in matches:
+                match_type = '완전일치' if similarity >= 1.0 else '유사일치'
+                md_content.append(f"| `{col_a}` | {types_a.get(col_a, '')} | `{col_b}` | {types_b.get(col_b, '')} | {similarity:.2f} | {match_type} |")
+        
+        # 파일에 저장
+        try:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(md_content))
+            print(f"\n✅ 파일 쌍별 매핑 보고서가 '{output_file}' 파일로 저장되었습니다.")
+            
+        except Exception as e:
+            print(f"❌ 보고서 저장 중 오류 발생: {str(e)}")
+    
     def find_key_field_matches(self):
         """주요 키 필드 매칭 분석"""
         key_fields = {
@@ -201,6 +484,95 @@ class ColumnMapper:
         
         return True
     
+    def find_value_join_keys(self, csv_folder='csv', num_perm=256, min_jaccard=0.03, min_containment=0.2):
+        """
+        실제 값(MinHash/LSH)을 기준으로 파일 간 조인 키 후보 찾기
+        
+        컬럼명이 달라도 고유값 집합이 많이 겹치는 컬럼 쌍을 찾습니다.
+        각 CSV는 청크 단위로 한 번만 읽으며, LSH 덕분에 비교 비용은 컬럼 수에 선형입니다.
+        
+        Args:
+            csv_folder (str): CSV 파일들이 있는 폴더 경로
+            num_perm (int): MinHash 순열 개수
+            min_jaccard (float): 최소 Jaccard 유사도
+            min_containment (float): 최소 포함도
+            
+        Returns:
+            list: 조인 키 후보 리스트
+        """
+        from join_key_finder import JoinKeyFinder
+        
+        print("\n🔗 값 기반 조인 키 탐색 시작...")
+        finder = JoinKeyFinder(csv_folder=csv_folder, num_perm=num_perm)
+        finder.build_signatures()
+        self.value_join_keys = finder.find_join_keys(min_jaccard=min_jaccard, min_containment=min_containment)
+        print(f"✅ 값 기반 조인 키 후보: {len(self.value_join_keys)}개")
+        
+        return self.value_join_keys
+    
+    def find_plan_code_matches(self, csv_folder='csv', plan_file='MVNO_PRD_PLC.csv'):
+        """
+        가입자 파일의 요금제코드 컬럼별 요금제 정보 매핑 성공률 계산
+        
+        요금제 파일은 PlanCatalog로 한 번만 읽어 해시 색인을 만들고,
+        가입자 파일은 상품코드/요금제코드 컬럼만 읽어 색인에서 조회합니다.
+        
+        Args:
+            csv_folder (str): CSV 파일들이 있는 폴더 경로
+            plan_file (str): 요금제 정보 파일명
+            
+        Returns:
+            list: 파일/컬럼별 매핑 통계 딕셔너리 리스트
+        """
+        from csv_analyzer import get_encoding_candidates
+        from plan_catalog import load_plan_catalog
+        
+        plan_path = os.path.join(csv_folder, plan_file)
+        if not os.path.exists(plan_path):
+            print(f"⚠️ {plan_path} 파일이 없어 요금제코드 매핑 통계를 건너뜁니다.")
+            return []
+        
+        catalog = load_plan_catalog(plan_path)
+        self.plan_code_matches = []
+        
+        for file_name, columns in self.file_columns.items():
+            file_path = os.path.join(csv_folder, file_name)
+            if file_name == plan_file or not os.path.exists(file_path):
+                continue
+            
+            code_columns = [col for col in columns['컬럼명'] if '상품코드' in col or '요금제코드' in col]
+            if not code_columns:
+                continue
+            
+            for encoding in get_encoding_candidates(file_name):
+                try:
+                    codes = pd.read_csv(file_path, encoding=encoding, usecols=code_columns, dtype=str)
+                    break
+                except UnicodeDecodeError:
+                    continue
+                except ValueError as e:
+                    print(f"⚠️ {file_name} 요금제코드 컬럼 로드 실패: {str(e)}")
+                    codes = None
+                    break
+            else:
+                codes = None
+            if codes is None:
+                continue
+            
+            for col in code_columns:
+                stats = catalog.match_stats(codes[col].dropna().str.strip())
+                self.plan_code_matches.append({
+                    'file': file_name,
+                    'column': col,
+                    'total': stats['total'],
+                    'matched': stats['matched'],
+                    'match_rate': stats['match_rate'],
+                    'unmatched_codes': len(stats['unmatched_codes'])
+                })
+        
+        print(f"✅ 요금제코드 매핑 통계: {len(self.plan_code_matches)}개 컬럼")
+        return self.plan_code_matches
+    
     def generate_mapping_report(self, output_file='column_mapping_report.md'):
         """매핑 분석 결과를 마크다운 보고서로 생성"""
         if not self.mapping_results:
@@ -299,6 +671,16 @@ class ColumnMapper:
         if len(unmapped_m2) > 20:
             md_content.append(f"... 외 {len(unmapped_m2) - 20}개")
         
+        # 값 기반 조인 키 후보
+        if self.value_join_keys:
+            md_content.append("\n## 🔗 값 기반 조인 키 후보 (MinHash/LSH)")
+            md_content.append("컬럼명과 무관하게 실제 고유값 집합의 겹침으로 찾은 컬럼 쌍입니다. 모든 수치는 MinHash 추정값입니다.")
+            md_content.append("\n| 파일 A | 컬럼 A | 파일 B | 컬럼 B | Jaccard | A⊂B 포함도 | B⊂A 포함도 | 고유값 A | 고유값 B | 공통값 | 조인 선택도 | 예상 조인 행 수 |")
+            md_content.append("|--------|--------|--------|--------|---------|------------|------------|----------|----------|--------|-------------|-----------------|")
+            
+            for pair in self.value_join_keys:
+                md_content.append(f"| {pair['file_a']} | `{pair['column_a']}` | {pair['file_b']} | `{pair['column_b']}` | {pair['jaccard']:.2f} | {pair['containment_a']:.2f} | {pair['containment_b']:.2f} | {pair['distinct_a']:,.0f} | {pair['distinct_b']:,.0f} | {pair['common_values']:,.0f} | {pair['join_selectivity']:.2e} | {pair['estimated_join_rows']:,.0f} |")
+        
         # 요금제 정보와의 연결
         md_content.append("\n## 📋 요금제 정보 연결점")
         plan_col_names = self.plan_columns['컬럼명'].tolist()
@@ -306,6 +688,13 @@ class ColumnMapper:
         for col in plan_col_names:
             md_content.append(f"- `{col}`")
         
+        if self.plan_code_matches:
+            md_content.append("\n**가입자 요금제코드 컬럼별 매핑 결과 (요금제코드 해시 색인 조회):**")
+            md_content.append("\n| 파일 | 컬럼 | 값 수 | 매핑 성공 | 매핑률 | 매핑 실패 코드 수 |")
+            md_content.append("|------|------|-------|-----------|--------|-------------------|")
+            for match in self.plan_code_matches:
+                md_content.append(f"| {match['file']} | `{match['column']}` | {match['total']:,} | {match['matched']:,} | {match['match_rate'] * 100:.1f}% | {match['unmatched_codes']:,} |")
+        
         # 분석 권장사항
         md_content.append("\n## 💡 분석 권장사항")
         md_content.append("1. **완전 일치 컬럼**을 활용하여 M-1과 M-2 데이터 조인 가능")
@@ -326,6 +715,15 @@ class ColumnMapper:
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='컬럼 매핑 분석 프로그램')
+    parser.add_argument('--all-pairs', action='store_true',
+                        help='column_info.csv의 모든 파일 쌍에 대한 매핑 보고서 생성')
+    parser.add_argument('--pair', nargs=2, action='append', metavar=('FILE_A', 'FILE_B'),
+                        help='선택한 파일 쌍만 보고서에 포함 (반복 지정 가능)')
+    parser.add_argument('--cache-file', default='column_similarity_cache.json',
+                        help='컬럼명 유사도 캐시 파일 경로')
+    args = parser.parse_args()
+    
     print("🔗 컬럼 매핑 분석 프로그램 시작")
     print("=" * 60)
     
@@ -336,10 +734,22 @@ def main():
     if not mapper.load_column_info():
         return
     
+    # 파일 쌍별 매핑 (캐시된 유사도 구조 사용)
+    if args.all_pairs or args.pair:
+        mapper.build_similarity_cache(cache_file=args.cache_file)
+        mapper.generate_pairwise_report(pairs=[tuple(pair) for pair in args.pair] if args.pair else None)
+        print(f"\n🎉 파일 쌍별 매핑 분석 완료!")
+        return
+    
     # 매핑 분석 수행
     if not mapper.analyze_mappings():
         return
     
+    # 값 기반 조인 키 탐색 (CSV 원본이 있을 때만)
+    if os.path.isdir('csv'):
+        mapper.find_value_join_keys()
+        mapper.find_plan_code_matches()
+    
     # 보고서 생성
     mapper.generate_mapping_report()
     
@@ -7,11 +7,28 @@ CSV 데이터 분석 프로그램
 """
 
 import pandas as pd
+import numpy as np
 import os
+import io
 import glob
+import math
+import time
+import argparse
+import gc
+import sys
 from pathlib import Path
 from datetime import datetime
 
+# 파일별 최적 인코딩 설정
+PREFERRED_ENCODINGS = {
+    'ENTR_BY_INS.csv': 'cp949',      # M-2 가입자 정보 (한글 컬럼명)
+    'ENTR_INT_INS.csv': 'utf-8',     # M-1 신규 가입자 정보 
+    'MVNO_PRD_PLC.csv': 'utf-8'      # 요금제 정보
+}
+
+# 신뢰구간 계산에 사용하는 표준정규분포 분위수 (95%)
+Z_95 = 1.959963984540054
+
 def number_to_excel_column(n):
     """
     숫자를 엑셀 컬럼 ID로 변환 (1=A, 2=B, ..., 26=Z, 27=AA, ...)
@@ -29,24 +46,260 @@ def number_to_excel_column(n):
         n //= 26
     return result
 
+def get_encoding_candidates(file_name):
+    """
+    파일별 최적 인코딩을 우선으로 하는 인코딩 시도 순서 반환
+
+    Args:
+        file_name (str): CSV 파일명
+
+    Returns:
+        list: 중복이 제거된 인코딩 후보 리스트
+    """
+    preferred_encoding = PREFERRED_ENCODINGS.get(file_name, 'utf-8')
+    encodings = [preferred_encoding] + ['utf-8', 'cp949', 'euc-kr', 'latin1']
+    return list(dict.fromkeys(encodings))  # 중복 제거
+
+def detect_encoding(file_path, sample_bytes=1024 * 1024):
+    """
+    파일 앞부분을 디코딩해 보고 사용할 인코딩 결정
+
+    스트리밍 중간에 인코딩 오류가 나면 이미 쓴 출력을 버려야 하므로 미리 확인합니다.
+
+    Args:
+        file_path (str): CSV 파일 경로
+        sample_bytes (int): 확인할 바이트 수
+
+    Returns:
+        str: 인코딩 (모두 실패하면 None)
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    # 멀티바이트 문자가 잘리지 않도록 마지막 줄바꿈까지만 사용
+    if len(sample) == sample_bytes and b'\n' in sample:
+        sample = sample[:sample.rindex(b'\n')]
+
+    for encoding in get_encoding_candidates(Path(file_path).name):
+        try:
+            sample.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+def sample_rows_by_offset(file_path, sample_size=10000, seed=42):
+    """
+    임의의 바이트 오프셋으로 이동하여 행을 샘플링 (파일 크기와 무관하게 빠름)
+
+    오프셋 직후의 다음 줄을 표본으로 사용하므로 한 행이 한 줄인 CSV를 가정합니다.
+    따옴표 안에 줄바꿈이 있는 파일은 sample_rows_by_reservoir를 사용하세요.
+
+    Args:
+        file_path (str): CSV 파일 경로
+        sample_size (int): 샘플링할 행 수 (복원추출)
+        seed (int): 난수 시드
+
+    Returns:
+        tuple: (헤더 바이트, 샘플 행 바이트 리스트, 데이터 영역 바이트 수)
+    """
+    rng = np.random.default_rng(seed)
+    file_size = os.path.getsize(file_path)
+
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        data_bytes = file_size - data_start
+        if data_bytes <= 0:
+            return header, [], 0
+
+        # data_start - 1 (헤더의 줄바꿈) 위치도 포함해야 첫 데이터 행이 선택될 수 있음
+        offsets = np.sort(rng.integers(data_start - 1, file_size - 1, size=sample_size))
+        lines = []
+        for offset in offsets:
+            f.seek(offset)
+            f.readline()  # 오프셋이 속한 행의 나머지 부분 건너뛰기
+            line = f.readline()
+            if not line.strip():
+                continue
+            if not line.endswith(b'\n'):
+                line += b'\n'
+            lines.append(line)
+
+    return header, lines, data_bytes
+
+def sample_rows_by_reservoir(file_path, encoding, sample_size=10000, seed=42, chunksize=100000):
+    """
+    청크 단위로 파일을 한 번 읽으며 비복원 균등 표본(reservoir sample)을 생성
+
+    각 행에 균등 난수 우선순위를 부여하고 우선순위가 가장 작은 sample_size개 행만
+    유지하므로 메모리 사용량은 sample_size + chunksize 행으로 제한됩니다.
+
+    Args:
+        file_path (str): CSV 파일 경로
+        encoding (str): 파일 인코딩
+        sample_size (int): 샘플링할 행 수
+        seed (int): 난수 시드
+        chunksize (int): 한 번에 읽을 행 수
+
+    Returns:
+        tuple: (샘플 DataFrame, 전체 행 수)
+    """
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    total_rows = 0
+
+    for chunk in pd.read_csv(file_path, encoding=encoding, chunksize=chunksize, low_memory=False):
+        total_rows += len(chunk)
+        chunk = chunk.assign(_priority=rng.random(len(chunk)))
+        if reservoir is not None:
+            chunk = pd.concat([reservoir, chunk])
+        reservoir = chunk.nsmallest(sample_size, '_priority') if len(chunk) > sample_size else chunk
+
+    if reservoir is None:
+        return pd.DataFrame(), 0
+    return reservoir.drop(columns='_priority').reset_index(drop=True), total_rows
+
+def proportion_ci(count, n, z=Z_95):
+    """
+    비율의 Wilson 신뢰구간 계산
+
+    Args:
+        count (int): 해당 사건 발생 수
+        n (int): 표본 크기
+        z (float): 표준정규분포 분위수
+
+    Returns:
+        tuple: (추정 비율, 하한, 상한)
+    """
+    if n == 0:
+        return float('nan'), float('nan'), float('nan')
+    p = count / n
+    denom = 1 + z**2 / n
+    center = (p + z**2 / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denom
+    return p, max(0.0, center - half), min(1.0, center + half)
+
+def mean_ci(values, z=Z_95):
+    """
+    평균의 정규근사 신뢰구간 계산
+
+    Args:
+        values (np.ndarray): 결측값이 제거된 숫자 배열
+        z (float): 표준정규분포 분위수
+
+    Returns:
+        tuple: (표본 평균, 하한, 상한)
+    """
+    n = len(values)
+    if n == 0:
+        return float('nan'), float('nan'), float('nan')
+    mean = float(np.mean(values))
+    if n == 1:
+        return mean, float('nan'), float('nan')
+    half = z * float(np.std(values, ddof=1)) / math.sqrt(n)
+    return mean, mean - half, mean + half
+
+def quantile_ci(sorted_values, q, z=Z_95):
+    """
+    분위수의 분포무관(순서통계량) 신뢰구간 계산
+
+    Args:
+        sorted_values (np.ndarray): 정렬된 숫자 배열
+        q (float): 분위수 (0~1)
+        z (float): 표준정규분포 분위수
+
+    Returns:
+        tuple: (표본 분위수, 하한, 상한)
+    """
+    n = len(sorted_values)
+    if n == 0:
+        return float('nan'), float('nan'), float('nan')
+    estimate = float(np.quantile(sorted_values, q))
+    half = z * math.sqrt(n * q * (1 - q))
+    lower_rank = max(0, int(math.floor(n * q - half)) - 1)
+    upper_rank = min(n - 1, int(math.ceil(n * q + half)))
+    return estimate, float(sorted_values[lower_rank]), float(sorted_values[upper_rank])
+
+def get_current_rss_mb():
+    """
+    현재 프로세스의 상주 메모리(RSS) 사용량 (MB)
+
+    Returns:
+        float: 현재 RSS (측정 불가 시 NaN)
+    """
+    try:
+        # psutil 라이브러리가 있으면 사용
+        import psutil
+        return psutil.Process().memory_info().rss / 1024**2
+    except ImportError:
+        pass
+
+    try:
+        # Linux: /proc/self/statm 의 두 번째 값이 RSS 페이지 수
+        with open('/proc/self/statm') as f:
+            rss_pages = int(f.read().split()[1])
+        return rss_pages * os.sysconf('SC_PAGE_SIZE') / 1024**2
+    except (OSError, ValueError, IndexError, AttributeError):
+        return float('nan')
+
+def get_peak_rss_mb():
+    """
+    프로세스 시작 이후 최대 상주 메모리(peak RSS) 사용량 (MB)
+
+    Returns:
+        float: 최대 RSS
+    """
+    try:
+        import resource
+    except ImportError:
+        # Windows 등 resource 모듈이 없는 환경
+        return get_current_rss_mb()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    if sys.platform == 'darwin':
+        return peak / 1024**2
+    return peak / 1024
+
 class CSVAnalyzer:
-    def __init__(self, csv_folder='csv', output_file='database.md'):
+    def __init__(self, csv_folder='csv', output_file='database.md',
+                 release_after_analysis=False, usecols=None, memory_budget_mb=None,
+                 store_dir=None, start_month=None, end_month=None):
         """
         CSV 분석기 초기화
         
         Args:
             csv_folder (str): CSV 파일들이 있는 폴더 경로
             output_file (str): 분석 결과를 저장할 마크다운 파일명
+            release_after_analysis (bool): True면 파일을 하나씩 로드/분석한 뒤
+                요약 결과만 남기고 DataFrame을 즉시 해제
+            usecols (dict): 파일별로 읽을 컬럼 목록 {'파일명': ['컬럼1', ...]}
+            memory_budget_mb (float): 로드 중 허용할 최대 RSS (MB), 초과 시 해당 파일 로드 중단
+            store_dir (str): 월 파티션 저장소 폴더 (지정하면 CSV 대신 저장소의 데이터셋을 읽음)
+            start_month (str): 저장소에서 읽을 시작 월 (포함, 예: '2024-06')
+            end_month (str): 저장소에서 읽을 종료 월 (포함)
         """
         self.csv_folder = csv_folder
         self.output_file = output_file
+        self.release_after_analysis = release_after_analysis
+        self.usecols = usecols or {}
+        self.memory_budget_mb = memory_budget_mb
+        self.store_dir = store_dir
+        self.start_month = start_month
+        self.end_month = end_month
         self.dataframes = {}
         self.analysis_results = []
         self.column_info = []
         self.file_encodings = {}
+        self.quick_profiles = []
         
     def load_csv_files(self):
-        """CSV 폴더의 모든 CSV 파일을 로드"""
+        """CSV 폴더의 모든 CSV 파일을 로드 (저장소를 지정하면 저장소의 모든 데이터셋)"""
+        if self.store_dir:
+            for file_name in self.list_store_files():
+                self.load_store_dataset(file_name)
+            return
+        
         csv_files = glob.glob(os.path.join(self.csv_folder, '*.csv'))
         
         if not csv_files:
@@ -56,42 +309,160 @@ class CSVAnalyzer:
         print(f"📁 {len(csv_files)}개의 CSV 파일을 발견했습니다.\n")
         
         for file_path in csv_files:
-            try:
-                # 파일명 추출
-                file_name = Path(file_path).name
-                
-                # 파일별 최적 인코딩 설정
-                file_encodings = {
-                    'ENTR_BY_INS.csv': 'cp949',      # M-2 가입자 정보 (한글 컬럼명)
-                    'ENTR_INT_INS.csv': 'utf-8',     # M-1 신규 가입자 정보 
-                    'MVNO_PRD_PLC.csv': 'utf-8'      # 요금제 정보
-                }
-                
-                # 파일별 최적 인코딩 우선 시도, 실패시 다른 인코딩들 시도
-                preferred_encoding = file_encodings.get(file_name, 'utf-8')
-                encodings = [preferred_encoding] + ['utf-8', 'cp949', 'euc-kr', 'latin1']
-                encodings = list(dict.fromkeys(encodings))  # 중복 제거
-                
-                df = None
-                used_encoding = None
-                
-                for encoding in encodings:
-                    try:
-                        df = pd.read_csv(file_path, encoding=encoding)
-                        used_encoding = encoding
-                        print(f"✅ {file_name} 로드 성공 (인코딩: {encoding})")
-                        break
-                    except UnicodeDecodeError:
-                        continue
+            self.load_csv_file(file_path)
+    
+    def load_csv_file(self, file_path):
+        """
+        단일 CSV 파일 로드 (파일별 컬럼 선택 및 메모리 예산 적용)
+        
+        Args:
+            file_path (str): CSV 파일 경로
+        
+        Returns:
+            bool: 로드 성공 여부
+        """
+        # 파일명 추출
+        file_name = Path(file_path).name
+        
+        try:
+            # 파일별 최적 인코딩 우선 시도, 실패시 다른 인코딩들 시도
+            encodings = get_encoding_candidates(file_name)
+            usecols = self.usecols.get(file_name)
+            
+            df = None
+            used_encoding = None
+            
+            for encoding in encodings:
+                try:
+                    if self.memory_budget_mb is None:
+                        df = pd.read_csv(file_path, encoding=encoding, usecols=usecols)
+                    else:
+                        df = self._read_csv_within_budget(file_path, encoding, usecols)
+                        if df is None:
+                            return False
+                    used_encoding = encoding
+                    print(f"✅ {file_name} 로드 성공 (인코딩: {encoding})")
+                    break
+                except UnicodeDecodeError:
+                    continue
+            
+            if df is not None:
+                self.dataframes[file_name] = df
+                self.file_encodings[file_name] = used_encoding
+                return True
+            
+            print(f"❌ {file_name} 로드 실패 - 인코딩 문제")
+            return False
                 
-                if df is not None:
-                    self.dataframes[file_name] = df
-                    self.file_encodings[file_name] = used_encoding
-                else:
-                    print(f"❌ {file_name} 로드 실패 - 인코딩 문제")
-                    
-            except Exception as e:
-                print(f"❌ {file_name} 로드 중 오류: {str(e)}")
+        except Exception as e:
+            print(f"❌ {file_name} 로드 중 오류: {str(e)}")
+            return False
+    
+    def list_store_files(self):
+        """저장소의 데이터셋을 'ENTR_INT_INS.csv' 형식의 파일명 목록으로 반환"""
+        from partitioned_store import PartitionedStore
+        datasets = PartitionedStore(self.store_dir).datasets()
+        if not datasets:
+            print(f"❌ {self.store_dir} 저장소에 데이터셋이 없습니다.")
+        else:
+            print(f"📁 {self.store_dir} 저장소에서 {len(datasets)}개의 데이터셋을 발견했습니다.\n")
+        return [f'{dataset}.csv' for dataset in datasets]
+    
+    def load_store_dataset(self, file_name):
+        """
+        월 파티션 저장소에서 데이터셋 로드 (월 범위 밖 파티션은 건너뛰고 usecols 컬럼만 읽음)
+        
+        Args:
+            file_name (str): 데이터셋 파일명 (예: 'ENTR_INT_INS.csv', usecols 키와 같은 형식)
+        
+        Returns:
+            bool: 로드 성공 여부
+        """
+        from partitioned_store import PartitionedStore
+        
+        try:
+            df = PartitionedStore(self.store_dir).read(Path(file_name).stem, columns=self.usecols.get(file_name),
+                                                       start=self.start_month, end=self.end_month)
+        except Exception as e:
+            print(f"❌ {file_name} 저장소 로드 중 오류: {str(e)}")
+            return False
+        
+        self.dataframes[file_name] = df
+        self.file_encodings[file_name] = 'parquet'
+        print(f"✅ {file_name} 로드 성공 (저장소: {self.store_dir})")
+        return True
+    
+    def _read_csv_within_budget(self, file_path, encoding, usecols, chunksize=100000):
+        """청크 단위로 읽으며 RSS가 메모리 예산을 넘으면 로드를 중단"""
+        chunks = []
+        for chunk in pd.read_csv(file_path, encoding=encoding, usecols=usecols, chunksize=chunksize):
+            chunks.append(chunk)
+            current_rss = get_current_rss_mb()
+            if current_rss > self.memory_budget_mb:
+                print(f"❌ {Path(file_path).name} 로드 중단 - 메모리 예산 초과 "
+                      f"({current_rss:.1f} MB > {self.memory_budget_mb:.1f} MB)")
+                print("💡 usecols로 필요한 컬럼만 선택하거나 메모리 예산을 늘려주세요.")
+                del chunks
+                gc.collect()
+                return None
+        
+        if not chunks:
+            return pd.read_csv(file_path, encoding=encoding, usecols=usecols)
+        return pd.concat(chunks, ignore_index=True)
+    
+    def analyze_with_release(self):
+        """
+        파일을 하나씩 로드 → 분석 → 해제하여 최대 메모리를 가장 큰 파일 하나 수준으로 제한
+        
+        분석 요약(컬럼 정보, 통계, 샘플 10행)만 유지하며, 종료 시 최대 RSS를 보고합니다.
+        """
+        if self.store_dir:
+            for file_name in self.list_store_files():
+                if not self.load_store_dataset(file_name):
+                    continue
+                self.analyze_file(file_name)
+                self.release_dataframe(file_name)
+                print(f"🧹 {file_name} 해제 완료 (현재 RSS: {get_current_rss_mb():.1f} MB)")
+            self.report_peak_memory()
+            return
+        
+        csv_files = glob.glob(os.path.join(self.csv_folder, '*.csv'))
+        
+        if not csv_files:
+            print(f"❌ {self.csv_folder} 폴더에 CSV 파일이 없습니다.")
+            return
+        
+        print(f"📁 {len(csv_files)}개의 CSV 파일을 발견했습니다. (분석 후 해제 모드)\n")
+        
+        for file_path in csv_files:
+            file_name = Path(file_path).name
+            if not self.load_csv_file(file_path):
+                continue
+            
+            self.analyze_file(file_name)
+            
+            # 요약만 남기고 원본 DataFrame 해제
+            self.release_dataframe(file_name)
+            print(f"🧹 {file_name} 해제 완료 (현재 RSS: {get_current_rss_mb():.1f} MB)")
+        
+        self.report_peak_memory()
+    
+    def release_dataframe(self, file_name):
+        """로드된 DataFrame을 해제하고 메모리를 회수"""
+        if file_name in self.dataframes:
+            del self.dataframes[file_name]
+            gc.collect()
+    
+    def report_peak_memory(self):
+        """프로세스 최대 메모리 사용량 출력 및 예산 초과 여부 확인"""
+        peak_rss = get_peak_rss_mb()
+        print(f"\n📈 최대 메모리 사용량 (peak RSS): {peak_rss:.1f} MB")
+        if self.memory_budget_mb is not None:
+            if peak_rss > self.memory_budget_mb:
+                print(f"⚠️  메모리 예산 초과: {peak_rss:.1f} MB > {self.memory_budget_mb:.1f} MB")
+            else:
+                print(f"✅ 메모리 예산 이내: {peak_rss:.1f} MB ≤ {self.memory_budget_mb:.1f} MB")
+        return peak_rss
     
     def analyze_file(self, file_name):
         """개별 CSV 파일 분석"""
@@ -112,7 +483,7 @@ class CSVAnalyzer:
             'shape': df.shape,
             'memory_usage': df.memory_usage(deep=True).sum() / 1024**2,
             'columns': list(zip(df.columns, df.dtypes.astype(str))),
-            'sample_data': df.head(10),
+            'sample_data': df.head(10).copy(),  # 원본 DataFrame 참조를 끊어 해제 가능하게 함
             'numeric_stats': None,
             'missing_info': df.isnull().sum()
         }
@@ -178,22 +549,28 @@ class CSVAnalyzer:
     
     def get_summary(self):
         """전체 요약 정보"""
-        if not self.dataframes:
+        # 분석 후 해제 모드에서는 DataFrame 대신 분석 요약의 크기 정보 사용
+        if self.dataframes:
+            shapes = {file_name: df.shape for file_name, df in self.dataframes.items()}
+        else:
+            shapes = {result['file_name']: result['shape'] for result in self.analysis_results}
+        
+        if not shapes:
             return
             
         print(f"\n{'='*60}")
         print(f"📊 전체 요약")
         print(f"{'='*60}")
         
-        total_rows = sum(df.shape[0] for df in self.dataframes.values())
-        total_cols = sum(df.shape[1] for df in self.dataframes.values())
+        total_rows = sum(shape[0] for shape in shapes.values())
+        total_cols = sum(shape[1] for shape in shapes.values())
         
-        print(f"📁 총 파일 수: {len(self.dataframes)}개")
+        print(f"📁 총 파일 수: {len(shapes)}개")
         print(f"📏 총 데이터: {total_rows:,}행")
         print(f"📋 총 컬럼 수: {total_cols}개")
         
-        for file_name, df in self.dataframes.items():
-            print(f"  - {file_name}: {df.shape[0]:,}행 × {df.shape[1]}열")
+        for file_name, shape in shapes.items():
+            print(f"  - {file_name}: {shape[0]:,}행 × {shape[1]}열")
     
     def save_to_markdown(self):
         """분석 결과를 database.md 파일로 저장"""
@@ -273,6 +650,189 @@ class CSVAnalyzer:
         except Exception as e:
             print(f"❌ 파일 저장 중 오류 발생: {str(e)}")
     
+    def quick_profile_file(self, file_path, sample_size=10000, method='offset', seed=42):
+        """
+        표본 기반 빠른 프로파일 생성 (근사치)
+        
+        Args:
+            file_path (str): CSV 파일 경로
+            sample_size (int): 표본 행 수
+            method (str): 'offset' (바이트 오프셋 임의 추출, 파일 크기와 무관) 또는
+                'reservoir' (청크 단위 전체 1회 스캔, 정확한 행 수 제공)
+            seed (int): 난수 시드
+        
+        Returns:
+            dict: 근사 통계 결과 (실패 시 None)
+        """
+        file_name = Path(file_path).name
+        start_time = time.perf_counter()
+        
+        print(f"\n{'='*60}")
+        print(f"⚡ 빠른 프로파일 (근사치): {file_name}")
+        print(f"{'='*60}")
+        
+        df = None
+        used_encoding = None
+        total_rows = None
+        row_ci = (float('nan'), float('nan'))
+        
+        try:
+            if method == 'offset':
+                header, lines, data_bytes = sample_rows_by_offset(file_path, sample_size, seed)
+                if lines:
+                    # 평균 행 길이(바이트)로 전체 행 수를 추정
+                    line_bytes = np.array([len(line) for line in lines], dtype=float)
+                    avg_bytes, low_bytes, high_bytes = mean_ci(line_bytes)
+                    total_rows = data_bytes / avg_bytes
+                    if not math.isnan(low_bytes) and low_bytes > 0:
+                        row_ci = (data_bytes / high_bytes, data_bytes / low_bytes)
+                    # 표본보다 작은 파일은 전체를 읽는 편이 더 정확하고 빠름
+                    if total_rows <= sample_size:
+                        method = 'reservoir'
+                raw = header + b''.join(lines)
+            
+            for encoding in get_encoding_candidates(file_name):
+                try:
+                    if method == 'offset':
+                        df = pd.read_csv(io.BytesIO(raw), encoding=encoding, low_memory=False)
+                    else:
+                        df, total_rows = sample_rows_by_reservoir(file_path, encoding, sample_size, seed)
+                        row_ci = (total_rows, total_rows)
+                    used_encoding = encoding
+                    break
+                except UnicodeDecodeError:
+                    continue
+        except Exception as e:
+            print(f"❌ {file_name} 샘플링 중 오류: {str(e)}")
+            if method == 'offset':
+                print("💡 행 안에 줄바꿈이 포함된 파일이면 method='reservoir'를 사용하세요.")
+            return None
+        
+        if df is None:
+            print(f"❌ {file_name} 샘플링 실패 - 인코딩 문제")
+            return None
+        
+        n = len(df)
+        profile = {
+            'file_name': file_name,
+            'encoding': used_encoding,
+            'method': method,
+            'sample_rows': n,
+            'estimated_rows': total_rows,
+            'estimated_rows_ci': row_ci,
+            'columns': list(zip(df.columns, df.dtypes.astype(str))),
+            'null_stats': [],
+            'numeric_stats': [],
+            'elapsed': 0.0
+        }
+        
+        # 결측 비율 (Wilson 95% 신뢰구간)
+        null_counts = df.isnull().sum()
+        for col in df.columns:
+            ratio, low, high = proportion_ci(int(null_counts[col]), n)
+            profile['null_stats'].append((col, ratio, low, high))
+        
+        # 숫자형 컬럼 평균/분위수 (95% 신뢰구간)
+        for col in df.select_dtypes(include=['number']).columns:
+            values = np.sort(df[col].dropna().to_numpy(dtype=float))
+            if len(values) == 0:
+                continue
+            profile['numeric_stats'].append({
+                'column': col,
+                'count': len(values),
+                'mean': mean_ci(values),
+                'q25': quantile_ci(values, 0.25),
+                'q50': quantile_ci(values, 0.50),
+                'q75': quantile_ci(values, 0.75),
+                'min': float(values[0]),
+                'max': float(values[-1])
+            })
+        
+        profile['elapsed'] = time.perf_counter() - start_time
+        
+        print(f"📏 표본 크기: {n:,}행 × {df.shape[1]}열 (방식: {method}, 인코딩: {used_encoding})")
+        if total_rows is not None:
+            print(f"📏 추정 전체 행 수: 약 {total_rows:,.0f}행 (95% CI {row_ci[0]:,.0f} ~ {row_ci[1]:,.0f})")
+        print(f"⏱️  소요 시간: {profile['elapsed']:.2f}초")
+        for col, ratio, low, high in profile['null_stats']:
+            if ratio > 0:
+                print(f"⚠️  {col}: 결측 약 {ratio*100:.1f}% (95% CI {low*100:.1f}% ~ {high*100:.1f}%)")
+        
+        self.quick_profiles.append(profile)
+        return profile
+    
+    def quick_profile_all(self, sample_size=10000, method='offset', seed=42):
+        """CSV 폴더의 모든 CSV 파일을 표본 기반으로 빠르게 프로파일링"""
+        csv_files = glob.glob(os.path.join(self.csv_folder, '*.csv'))
+        
+        if not csv_files:
+            print(f"❌ {self.csv_folder} 폴더에 CSV 파일이 없습니다.")
+            return
+        
+        print(f"📁 {len(csv_files)}개의 CSV 파일을 발견했습니다. (빠른 프로파일 모드)")
+        
+        for file_path in csv_files:
+            self.quick_profile_file(file_path, sample_size=sample_size, method=method, seed=seed)
+    
+    def save_quick_profile_to_markdown(self, output_file='database_quick.md'):
+        """빠른 프로파일 결과를 근사치 보고서로 저장"""
+        if not self.quick_profiles:
+            print("❌ 저장할 빠른 프로파일 결과가 없습니다.")
+            return
+        
+        md_content = []
+        
+        # 헤더
+        md_content.append("# CSV 데이터베이스 빠른 프로파일 보고서 (근사치)")
+        md_content.append(f"\n**분석 일시**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        md_content.append(f"**분석 파일 수**: {len(self.quick_profiles)}개")
+        md_content.append("\n> ⚠️ **근사치 보고서**: 모든 수치는 표본에서 계산된 추정값이며, "
+                          "괄호 안의 범위는 95% 신뢰구간입니다. 정확한 값은 전체 분석(`python csv_analyzer.py`)으로 확인하세요.")
+        
+        for i, profile in enumerate(self.quick_profiles, 1):
+            md_content.append(f"\n## {i}. {profile['file_name']} (근사치)")
+            
+            # 기본 정보
+            md_content.append(f"\n### 📋 기본 정보")
+            md_content.append(f"- **파일명**: `{profile['file_name']}`")
+            md_content.append(f"- **인코딩**: {profile['encoding']}")
+            md_content.append(f"- **샘플링 방식**: {profile['method']}")
+            md_content.append(f"- **표본 크기**: {profile['sample_rows']:,}행 × {len(profile['columns'])}열")
+            if profile['estimated_rows'] is not None:
+                low, high = profile['estimated_rows_ci']
+                md_content.append(f"- **추정 전체 행 수**: 약 {profile['estimated_rows']:,.0f}행 ({low:,.0f} ~ {high:,.0f})")
+            md_content.append(f"- **소요 시간**: {profile['elapsed']:.2f}초")
+            
+            # 결측 비율
+            md_content.append(f"\n### ⚠️ 결측 비율 추정")
+            md_content.append("| 컬럼명 | 데이터 타입 | 결측 비율(%) | 95% 신뢰구간(%) |")
+            md_content.append("|--------|-------------|--------------|-----------------|")
+            dtypes = dict(profile['columns'])
+            for col, ratio, low, high in profile['null_stats']:
+                md_content.append(f"| `{col}` | {dtypes[col]} | {ratio*100:.2f} | {low*100:.2f} ~ {high*100:.2f} |")
+            
+            # 숫자형 컬럼 통계
+            if profile['numeric_stats']:
+                md_content.append(f"\n### 📈 숫자형 컬럼 추정 통계")
+                md_content.append("| 컬럼명 | 표본 수 | 평균 (95% CI) | 25% (95% CI) | 50% (95% CI) | 75% (95% CI) | 표본 최소 | 표본 최대 |")
+                md_content.append("|--------|---------|---------------|--------------|--------------|--------------|-----------|-----------|")
+                for stat in profile['numeric_stats']:
+                    cells = []
+                    for key in ['mean', 'q25', 'q50', 'q75']:
+                        est, low, high = stat[key]
+                        cells.append(f"{est:,.2f} ({low:,.2f} ~ {high:,.2f})")
+                    md_content.append(f"| `{stat['column']}` | {stat['count']:,} | {' | '.join(cells)} | {stat['min']:,.2f} | {stat['max']:,.2f} |")
+            
+            md_content.append("\n---")
+        
+        # 파일에 저장
+        try:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(md_content))
+            print(f"\n✅ 빠른 프로파일 결과가 '{output_file}' 파일로 저장되었습니다.")
+        except Exception as e:
+            print(f"❌ 파일 저장 중 오류 발생: {str(e)}")
+    
     def save_column_info_to_csv(self, output_file='column_info.csv'):
         """컬럼 정보를 CSV 파일로 저장"""
         if not self.column_info:
@@ -300,17 +860,48 @@ class CSVAnalyzer:
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='CSV 데이터 분석 프로그램')
+    parser.add_argument('--quick', action='store_true', help='표본 기반 빠른 프로파일 (근사치) 모드')
+    parser.add_argument('--sample-size', type=int, default=10000, help='빠른 프로파일 표본 행 수')
+    parser.add_argument('--method', choices=['offset', 'reservoir'], default='offset', help='빠른 프로파일 샘플링 방식')
+    parser.add_argument('--release', action='store_true', help='파일별 분석 후 DataFrame을 해제하여 최대 메모리 제한')
+    parser.add_argument('--usecols', action='append', default=[], metavar='파일명=컬럼1,컬럼2',
+                        help='파일별로 읽을 컬럼 지정 (여러 번 사용 가능)')
+    parser.add_argument('--memory-budget-mb', type=float, default=None, help='로드 중 허용할 최대 RSS (MB)')
+    parser.add_argument('--store', default=None, help='월 파티션 저장소 폴더 (partitioned_store.py ingest로 생성)')
+    parser.add_argument('--start-month', default=None, help='저장소에서 읽을 시작 월 (예: 2024-06)')
+    parser.add_argument('--end-month', default=None, help='저장소에서 읽을 종료 월 (예: 2024-08)')
+    args = parser.parse_args()
+    
+    usecols = {}
+    for spec in args.usecols:
+        file_name, _, columns = spec.partition('=')
+        usecols[file_name] = [col.strip() for col in columns.split(',') if col.strip()]
+    
     print("🚀 CSV 데이터 분석 프로그램 시작")
     print("=" * 60)
     
     # CSV 분석기 초기화
-    analyzer = CSVAnalyzer()
+    analyzer = CSVAnalyzer(release_after_analysis=args.release, usecols=usecols,
+                           memory_budget_mb=args.memory_budget_mb, store_dir=args.store,
+                           start_month=args.start_month, end_month=args.end_month)
     
-    # CSV 파일들 로드
-    analyzer.load_csv_files()
+    if args.quick:
+        # 표본 기반 빠른 프로파일 (근사치)
+        analyzer.quick_profile_all(sample_size=args.sample_size, method=args.method)
+        analyzer.save_quick_profile_to_markdown()
+        print(f"\n🎉 빠른 프로파일 완료!")
+        return
     
-    # 모든 파일 분석
-    analyzer.analyze_all()
+    if analyzer.release_after_analysis:
+        # 파일별 로드 → 분석 → 해제
+        analyzer.analyze_with_release()
+    else:
+        # CSV 파일들 로드
+        analyzer.load_csv_files()
+        
+        # 모든 파일 분석
+        analyzer.analyze_all()
     
     # 전체 요약
     analyzer.get_summary()
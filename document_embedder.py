@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+문서 임베딩 생성
+마크다운 문서를 청크로 나누고 Ollama 임베딩을 배치 요청(요청 하나에 여러 청크)으로 생성합니다.
+배치는 제한된 수의 스레드에서 동시에 요청하고, 실패한 배치는 지수 백오프로 재시도하며,
+진행 상황과 처리량(청크/초, 글자/초)을 출력합니다.
+청크는 텍스트 + 모델 해시로 식별하여, 바뀌지 않은 청크는 다시 임베딩하지 않습니다 (증분 색인).
+"""
+
+import time
+import random
+import hashlib
+import sqlite3
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from markdown_chunker import MAX_CHUNK_TOKENS, chunk_markdown
+from chunk_dedup import DEDUP_REPORT_FILE, DEDUP_THRESHOLD, deduplicate_chunks, print_report, save_report
+
+# 임베딩 설정
+EMBEDDING_MODEL = 'nomic-embed-text'  # Ollama 임베딩 모델
+EMBEDDING_DIMENSION = 768  # 임베딩 차원수
+CHUNK_SIZE = 1000  # 텍스트 청크 크기
+MIN_CHUNK_LENGTH = 50  # 이보다 짧은 청크는 임베딩하지 않음
+
+# 배치 임베딩 설정
+EMBED_BATCH_SIZE = 32  # 요청 하나에 담을 최대 청크 수
+EMBED_BATCH_CHARS = 32000  # 요청 하나에 담을 최대 글자 수 (긴 청크가 모인 배치가 너무 커지지 않도록)
+EMBED_MAX_WORKERS = 4  # 동시에 보낼 배치 요청 수
+EMBED_MAX_RETRIES = 3  # 배치별 재시도 횟수
+EMBED_BACKOFF_SECONDS = 1.0  # 첫 재시도 대기 시간 (재시도마다 2배)
+
+# 청크 해시(텍스트 + 모델) → 벡터 로컬 캐시
+EMBEDDING_CACHE_FILE = 'embedding_cache.sqlite'
+
+def _ollama():
+    """ollama 클라이언트 모듈 (필요할 때만 import)"""
+    try:
+        import ollama
+    except ImportError:
+        raise ImportError("임베딩 생성에는 ollama 패키지가 필요합니다. pip install ollama")
+    return ollama
+
+def ollama_embed_batch(texts: List[str], model: str = EMBEDDING_MODEL) -> List[List[float]]:
+    """
+    Ollama 배치 임베딩 요청 (ollama.embed가 없는 구버전 클라이언트는 청크별 요청)
+
+    Args:
+        texts (List[str]): 임베딩할 텍스트 리스트
+        model (str): 사용할 임베딩 모델
+
+    Returns:
+        List[List[float]]: 텍스트 순서의 임베딩 벡터 리스트
+    """
+    ollama = _ollama()
+    if hasattr(ollama, 'embed'):
+        response = ollama.embed(model=model, input=texts)
+        return [list(vector) for vector in response['embeddings']]
+    return [ollama.embeddings(model=model, prompt=text)['embedding'] for text in texts]
+
+def generate_embedding(text: str, model: str = EMBEDDING_MODEL) -> Optional[List[float]]:
+    """
+    Ollama를 사용하여 텍스트 임베딩 생성 (단일 텍스트, 질의 임베딩용)
+
+    Args:
+        text (str): 임베딩할 텍스트
+        model (str): 사용할 임베딩 모델
+
+    Returns:
+        List[float]: 임베딩 벡터 (실패 시 None)
+    """
+    try:
+        response = _ollama().embeddings(model=model, prompt=text)
+        return response['embedding']
+    except Exception as e:
+        print(f"❌ 임베딩 생성 실패: {e}")
+        print(f"💡 '{model}' 모델이 설치되어 있는지 확인하세요: ollama pull {model}")
+        return None
+
+def make_batches(texts: List[str], batch_size: int = EMBED_BATCH_SIZE,
+                 batch_chars: int = EMBED_BATCH_CHARS) -> List[List[int]]:
+    """
+    텍스트 위치를 배치로 묶기 (청크 수와 글자 수 한도를 모두 지킴)
+
+    Returns:
+        List[List[int]]: 배치별 텍스트 위치 리스트
+    """
+    batches = []
+    current, current_chars = [], 0
+    for position, text in enumerate(texts):
+        if current and (len(current) >= batch_size or current_chars + len(text) > batch_chars):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(position)
+        current_chars += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+def _embed_with_retry(embed_batch: Callable, texts: List[str], max_retries: int, backoff: float):
+    """배치 하나를 임베딩하고 실패하면 지수 백오프로 재시도 (마지막 실패는 예외 전달)"""
+    for attempt in range(max_retries + 1):
+        try:
+            vectors = embed_batch(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(f"임베딩 수가 맞지 않습니다 ({len(vectors)} != {len(texts)})")
+            return vectors
+        except Exception:
+            if attempt == max_retries:
+                raise
+            # 동시에 실패한 배치들이 같은 시각에 몰리지 않도록 대기 시간에 약간의 무작위 값 추가
+            time.sleep(backoff * (2 ** attempt) * (1 + random.random() * 0.1))
+
+def embed_texts(texts: List[str], model: str = EMBEDDING_MODEL, embed_batch: Optional[Callable] = None,
+                batch_size: int = EMBED_BATCH_SIZE, batch_chars: int = EMBED_BATCH_CHARS,
+                max_workers: int = EMBED_MAX_WORKERS, max_retries: int = EMBED_MAX_RETRIES,
+                backoff: float = EMBED_BACKOFF_SECONDS, verbose: bool = True) -> List[Optional[List[float]]]:
+    """
+    여러 텍스트의 임베딩을 배치 요청으로 동시에 생성
+
+    Args:
+        texts (List[str]): 임베딩할 텍스트 리스트
+        model (str): 사용할 임베딩 모델
+        embed_batch (Callable): 텍스트 리스트 → 벡터 리스트 함수 (기본: Ollama 배치 요청)
+        batch_size (int): 요청 하나에 담을 최대 청크 수
+        batch_chars (int): 요청 하나에 담을 최대 글자 수
+        max_workers (int): 동시에 보낼 배치 요청 수
+        max_retries (int): 배치별 재시도 횟수
+        backoff (float): 첫 재시도 대기 시간 (초, 재시도마다 2배)
+        verbose (bool): 진행 상황 및 처리량 출력
+
+    Returns:
+        List[Optional[List[float]]]: 텍스트 순서의 임베딩 (재시도 후에도 실패한 배치의 텍스트는 None)
+    """
+    if embed_batch is None:
+        embed_batch = lambda batch_texts: ollama_embed_batch(batch_texts, model)
+
+    embeddings = [None] * len(texts)
+    batches = make_batches(texts, batch_size, batch_chars)
+    total_chars = sum(len(text) for text in texts)
+    done_chunks, done_chars, failed_batches = 0, 0, 0
+    start_time = time.time()
+
+    if verbose:
+        print(f"🔄 임베딩 생성: {len(texts):,}개 청크 ({total_chars:,}자) → 배치 {len(batches)}개, 동시 요청 {max_workers}개")
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(_embed_with_retry, embed_batch, [texts[i] for i in batch], max_retries, backoff): batch
+                   for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                for position, vector in zip(batch, future.result()):
+                    embeddings[position] = vector
+            except Exception as e:
+                failed_batches += 1
+                print(f"  ❌ 배치 임베딩 실패 ({len(batch)}개 청크, 재시도 {max_retries}회 후): {e}")
+                continue
+
+            done_chunks += len(batch)
+            done_chars += sum(len(texts[i]) for i in batch)
+            if verbose:
+                elapsed = max(time.time() - start_time, 1e-9)
+                print(f"    ⚡ {done_chunks:,}/{len(texts):,}개 청크 "
+                      f"({done_chunks / elapsed:.1f} 청크/초, {done_chars / elapsed:,.0f} 자/초)")
+
+    if verbose:
+        elapsed = time.time() - start_time
+        print(f"✅ 임베딩 완료: {done_chunks:,}개 청크, {elapsed:.1f}초"
+              + (f" (실패 배치 {failed_batches}개)" if failed_batches else ""))
+    return embeddings
+
+def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = 100) -> List[str]:
+    """
+    긴 텍스트를 글자 수 기준 청크로 분할 (마크다운 문서는 markdown_chunker.chunk_markdown 사용)
+
+    Args:
+        text (str): 분할할 텍스트
+        chunk_size (int): 청크 크기
+        overlap (int): 청크 간 겹치는 부분
+
+    Returns:
+        List[str]: 텍스트 청크 리스트
+    """
+    if len(text) <= chunk_size:
+        return [text]
+
+    chunks = []
+    start = 0
+
+    while start < len(text):
+        end = start + chunk_size
+
+        if end >= len(text):
+            chunks.append(text[start:])
+            break
+
+        # 단어 경계에서 자르기
+        while end > start and text[end] not in ' \n\t.!?;':
+            end -= 1
+
+        if end == start:
+            end = start + chunk_size
+
+        chunks.append(text[start:end])
+        start = end - overlap
+
+    return chunks
+
+class EmbeddingCache:
+    """
+    청크 해시(content_hash) → 임베딩 벡터 로컬 캐시 (SQLite, float32 BLOB)
+    """
+
+    def __init__(self, path: str = EMBEDDING_CACHE_FILE):
+        """
+        Args:
+            path (str): 캐시 파일 경로
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                content_hash TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def get_many(self, hashes: List[str]) -> Dict[str, List[float]]:
+        """캐시에 있는 해시의 벡터 (없는 해시는 결과에 없음)"""
+        found = {}
+        hashes = list(hashes)
+        # SQLite 바인딩 변수 개수 제한 때문에 나누어 조회
+        for start in range(0, len(hashes), 500):
+            part = hashes[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT content_hash, vector FROM embeddings WHERE content_hash IN ({','.join('?' * len(part))})", part)
+            for chunk_hash, blob in rows:
+                found[chunk_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, items: Dict[str, List[float]], model: str = EMBEDDING_MODEL):
+        """해시 → 벡터 저장"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (content_hash, model, dimension, vector) VALUES (?, ?, ?, ?)",
+                [(chunk_hash, model, len(vector), np.asarray(vector, dtype=np.float32).tobytes())
+                 for chunk_hash, vector in items.items()])
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+def content_hash(text: str, model: str = EMBEDDING_MODEL) -> str:
+    """청크 텍스트 + 임베딩 모델 이름의 SHA-256 (모델이 바뀌면 다른 키)"""
+    return hashlib.sha256(f'{model}\0{text}'.encode('utf-8')).hexdigest()
+
+def markdown_files(doc_folder: str) -> List[Path]:
+    """
+    문서 폴더의 마크다운 파일 (하위 폴더 포함, .ipynb_checkpoints 등 숨김 폴더 제외)
+
+    체크포인트 사본은 원본이 바뀌면 옛 내용이 유사도 기준 아래로 내려가 현재 문서처럼 색인되므로
+    아예 읽지 않습니다. 상위 폴더의 파일이 먼저 오도록 정렬하여, 실제로 반복된 내용은
+    중복 제거 시 상위 폴더의 원본이 대표 청크로 남습니다.
+    """
+    doc_path = Path(doc_folder)
+    files = [path for path in doc_path.rglob('*.md')
+             if not any(part.startswith('.') for part in path.relative_to(doc_path).parts[:-1])]
+    return sorted(files, key=lambda path: (len(path.relative_to(doc_path).parts), path.as_posix()))
+
+def load_markdown_records(doc_folder: str = 'doc', model: str = EMBEDDING_MODEL,
+                          max_tokens: int = MAX_CHUNK_TOKENS) -> List[Dict]:
+    """
+    문서 폴더의 마크다운을 구조 기반으로 청킹하여 청크 레코드 생성
+
+    Args:
+        doc_folder (str): 문서 폴더 경로
+        model (str): 청크 해시에 넣을 임베딩 모델
+        max_tokens (int): 청크 최대 추정 토큰 수
+
+    Returns:
+        List[Dict]: filename(문서 폴더 기준 상대 경로), content, content_md5, chunk_index, chunk_text,
+                    content_hash, heading_path, tokens, lines
+    """
+    doc_path = Path(doc_folder)
+    records = []
+    for md_file in markdown_files(doc_folder):
+        filename = md_file.relative_to(doc_path).as_posix()
+        print(f"\n📄 처리 중: {filename}")
+        try:
+            with open(md_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            print(f"  ❌ {filename} 처리 실패: {e}")
+            continue
+
+        # 마크다운 구조 기반 청킹
+        chunks = chunk_markdown(content, max_tokens=max_tokens)
+        print(f"  📝 {len(chunks)}개 청크로 분할 (추정 토큰 {sum(chunk.tokens for chunk in chunks):,})")
+        content_md5 = hashlib.md5(content.encode('utf-8')).hexdigest()
+        for i, chunk in enumerate(chunks):
+            if len(chunk.text.strip()) < MIN_CHUNK_LENGTH:  # 너무 짧은 청크는 스킵
+                continue
+            records.append({'filename': filename, 'content': content, 'content_md5': content_md5,
+                            'chunk_index': i, 'chunk_text': chunk.text, 'content_hash': content_hash(chunk.text, model),
+                            'heading_path': chunk.heading_path, 'tokens': chunk.tokens,
+                            'lines': [chunk.start_line, chunk.end_line]})
+    return records
+
+def load_and_embed_documents(vector_db, doc_folder: str = 'doc', model: str = EMBEDDING_MODEL,
+                             embed_batch: Optional[Callable] = None, max_workers: int = EMBED_MAX_WORKERS,
+                             batch_size: int = EMBED_BATCH_SIZE, cache_path: Optional[str] = EMBEDDING_CACHE_FILE,
+                             rebuild: bool = False, max_tokens: int = MAX_CHUNK_TOKENS,
+                             dedup: bool = True, dedup_threshold: float = DEDUP_THRESHOLD,
+                             dedup_report_path: Optional[str] = DEDUP_REPORT_FILE) -> bool:
+    """
+    문서를 로딩하고 임베딩을 생성하여 데이터베이스에 증분 저장
+
+    문서(하위 폴더 포함)는 마크다운 구조(제목/목록/코드 블록) 기준으로 겹침 없이 청킹하고,
+    중복/유사 청크는 임베딩 전에 대표 청크 하나로 합칩니다 (다른 위치는 metadata의 duplicates에 보관).
+    청크는 (파일명, 청크 텍스트 + 모델 해시)로 식별합니다.
+    - 이미 저장된 청크는 그대로 두고 (청크 번호만 바뀌면 갱신)
+    - 새 청크의 벡터는 로컬 캐시 → 벡터 저장소(같은 해시의 행) 순으로 재사용하고, 없을 때만 배치 임베딩
+    - 문서에서 사라진 청크와 삭제된 파일의 행은 제거
+    벡터 저장소는 doc_folder 하나의 색인으로 간주합니다.
+
+    Args:
+        vector_db (VectorDatabase | LocalVectorStore): 연결된 벡터 저장소
+        doc_folder (str): 문서 폴더 경로
+        model (str): 사용할 임베딩 모델
+        embed_batch (Callable): 텍스트 리스트 → 벡터 리스트 함수 (기본: Ollama 배치 요청)
+        max_workers (int): 동시에 보낼 배치 요청 수
+        batch_size (int): 요청 하나에 담을 최대 청크 수
+        cache_path (str): 임베딩 캐시 파일 경로 (None이면 캐시 사용 안 함)
+        rebuild (bool): True면 기존 행을 모두 지우고 다시 저장 (캐시는 계속 사용)
+        max_tokens (int): 청크 최대 추정 토큰 수
+        dedup (bool): 중복/유사 청크 제거 여부
+        dedup_threshold (float): 중복으로 볼 shingle Jaccard 유사도
+        dedup_report_path (str): 중복 제거 보고서 JSON 경로 (None이면 저장 안 함)
+
+    Returns:
+        bool: 성공 여부
+    """
+    if not vector_db.conn:
+        print("❌ 데이터베이스 연결이 필요합니다")
+        return False
+
+    doc_path = Path(doc_folder)
+    if not doc_path.exists():
+        print(f"❌ '{doc_folder}' 폴더가 존재하지 않습니다")
+        return False
+
+    md_files = markdown_files(doc_folder)
+    if not md_files:
+        print(f"❌ '{doc_folder}' 폴더에 마크다운 파일이 없습니다")
+        return False
+
+    print(f"📚 {len(md_files)}개 문서 처리 시작...")
+    start_time = time.time()
+
+    records = load_markdown_records(doc_folder, model=model, max_tokens=max_tokens)
+
+    if dedup:
+        print()
+        records, dedup_report = deduplicate_chunks(records, threshold=dedup_threshold)
+        print_report(dedup_report)
+        if dedup_report_path:
+            save_report(dedup_report, dedup_report_path)
+
+    cache = EmbeddingCache(cache_path) if cache_path else None
+    try:
+        if rebuild:
+            vector_db.clear()
+
+        # 기존 행: 파일명 → 청크 해시 → [(id, 청크 번호, 원문 md5)]
+        existing = {}
+        for row_id, filename, chunk_index, chunk_hash, old_md5 in vector_db.chunk_rows():
+            existing.setdefault(filename, {}).setdefault(chunk_hash, []).append((row_id, chunk_index, old_md5))
+
+        kept, updates, new_records = 0, [], []
+        for record in records:
+            rows = existing.get(record['filename'], {}).get(record['content_hash'])
+            if rows:
+                row_id, old_index, old_md5 = rows.pop(0)
+                kept += 1
+                # 중복 위치 목록은 다른 파일이 바뀌어도 달라지므로 중복이 있는 청크는 metadata를 다시 씀
+                if old_index != record['chunk_index'] or old_md5 != record['content_md5'] or record.get('duplicates'):
+                    updates.append((row_id, record['content'], record['chunk_index'], _chunk_metadata(record)))
+            else:
+                new_records.append(record)
+        stale_ids = [row[0] for hashes in existing.values() for rows in hashes.values() for row in rows]
+
+        # 새 청크 벡터: 로컬 캐시 → 벡터 저장소(같은 해시의 다른 행) → 임베딩 생성
+        needed = list(dict.fromkeys(record['content_hash'] for record in new_records))
+        vectors = cache.get_many(needed) if cache is not None else {}
+        from_cache = len(vectors)
+        missing = [chunk_hash for chunk_hash in needed if chunk_hash not in vectors]
+        from_table, embedded = 0, 0
+        if missing:
+            reused = {chunk_hash: np.asarray(embedding, dtype=np.float32).tolist()
+                      for chunk_hash, embedding in vector_db.embeddings_for(missing).items()}
+            vectors.update(reused)
+            from_table = len(reused)
+            if cache is not None and reused:
+                cache.put_many(reused, model)
+            missing = [chunk_hash for chunk_hash in missing if chunk_hash not in vectors]
+
+        if missing:
+            texts = {record['content_hash']: record['chunk_text'] for record in new_records}
+            embeddings = embed_texts([texts[chunk_hash] for chunk_hash in missing], model=model,
+                                     embed_batch=embed_batch, batch_size=batch_size, max_workers=max_workers)
+            created = {chunk_hash: vector for chunk_hash, vector in zip(missing, embeddings) if vector is not None}
+            vectors.update(created)
+            embedded = len(created)
+            if cache is not None and created:
+                cache.put_many(created, model)
+
+        # 저장소 반영: 삭제 → 갱신 → 추가
+        if stale_ids:
+            vector_db.delete(stale_ids)
+        if updates:
+            vector_db.update_chunks(updates)
+
+        rows = [{
+            'filename': record['filename'],
+            'content': record['content'],
+            'chunk_index': record['chunk_index'],
+            'chunk_text': record['chunk_text'],
+            'embedding': vectors[record['content_hash']],
+            'metadata': _chunk_metadata(record),
+            'content_hash': record['content_hash']
+        } for record in new_records if vectors.get(record['content_hash']) is not None]
+        total_chunks = vector_db.insert(rows) if rows else 0
+
+        print(f"\n✅ 증분 색인 완료 ({time.time() - start_time:.1f}초)")
+        print(f"  - 변경 없음: {kept}개 청크 (번호/원문 갱신 {len(updates)}개)")
+        print(f"  - 추가: {total_chunks}개 청크 (벡터 캐시 재사용 {from_cache}, 저장소 재사용 {from_table}, "
+              f"새 임베딩 {embedded})")
+        print(f"  - 삭제: {len(stale_ids)}개 청크")
+        return True
+
+    except Exception as e:
+        print(f"❌ 문서 임베딩 처리 실패: {e}")
+        return False
+    finally:
+        if cache is not None:
+            cache.close()
+
+def _chunk_metadata(record: dict) -> dict:
+    """청크 metadata 값"""
+    return {
+        'file_size': len(record['content']),
+        'chunk_size': len(record['chunk_text']),
+        'heading_path': record.get('heading_path', []),
+        'tokens': record.get('tokens'),
+        'lines': record.get('lines'),
+        'duplicates': record.get('duplicates', [])
+    }
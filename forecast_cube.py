@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+월별 예상 금액 집계 큐브
+예상 금액(M1 ~ Mn)을 월 × 요금제코드 × 유치대리점코드 × 개통유형 단위의 합계/건수로 미리 집계해
+Parquet 파일로 저장하고, 슬라이스/롤업 질의를 고객 행을 다시 읽지 않고 큐브에서 바로 답합니다.
+합계와 건수는 더할 수 있으므로 청크별 큐브를 합쳐도 전체 큐브와 같습니다.
+"""
+
+import pandas as pd
+import numpy as np
+import re
+import argparse
+
+# 큐브 차원 (요금제코드는 고객 데이터의 요금제코드 컬럼을 이 이름으로 저장)
+PLAN_DIMENSION = '요금제코드'
+DEFAULT_DIMENSIONS = ['유치대리점코드', '개통유형']
+MONTH_COLUMN = 'month'
+MEASURE_COLUMNS = ['amount_sum', 'count']
+
+# 컬럼이 없거나 값이 비어 있는 차원 값
+MISSING_LABEL = '(없음)'
+
+def _dimension_values(df, column):
+    """차원 컬럼을 문자열로 정규화 (결측/없는 컬럼은 MISSING_LABEL, 정수형 실수의 '.0' 제거)"""
+    if column not in df.columns:
+        return pd.Series(MISSING_LABEL, index=df.index, dtype=object)
+    values = df[column].astype(object)
+    missing = values.isna()
+    values = values.astype(str).str.strip().str.replace(r'\.0+$', '', regex=True)
+    values[missing | (values == '')] = MISSING_LABEL
+    return values
+
+def _dimension_key(value):
+    """질의 값을 큐브의 차원 값과 같은 방식으로 정규화"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return MISSING_LABEL
+    return re.sub(r'\.0+$', '', str(value).strip()) or MISSING_LABEL
+
+class ForecastCube:
+    """
+    월 × 차원별 예상 금액 합계/건수 큐브
+    """
+
+    def __init__(self, data, dimensions=None):
+        """
+        Args:
+            data (pd.DataFrame): 차원 컬럼 + month + amount_sum + count (long 형식)
+            dimensions (list): 요금제코드를 제외한 차원 컬럼 (기본: 유치대리점코드, 개통유형)
+        """
+        self.dimensions = [PLAN_DIMENSION] + list(DEFAULT_DIMENSIONS if dimensions is None else dimensions)
+        data = data.reset_index(drop=True)
+        # 차원은 범주형으로 두어 필터 비교를 정수 코드 비교로 처리
+        for column in self.dimensions:
+            data[column] = data[column].astype(str).astype('category')
+        data[MONTH_COLUMN] = data[MONTH_COLUMN].astype(np.int64)
+        data['amount_sum'] = data['amount_sum'].astype(np.float64)
+        data['count'] = data['count'].astype(np.int64)
+        self.data = data
+
+    @classmethod
+    def from_forecast(cls, df, forecast_columns, code_column=PLAN_DIMENSION, dimensions=None):
+        """
+        예상 금액이 추가된 고객 데이터에서 큐브 생성
+
+        Args:
+            df (pd.DataFrame): add_forecast_columns 결과
+            forecast_columns (list): 예상 금액 컬럼 (M1 ~ Mn)
+            code_column (str): 고객 데이터의 요금제코드 컬럼명 (예: 'MVNO상품코드', '개통요금제코드')
+            dimensions (list): 요금제코드 외 차원 컬럼 (없는 컬럼은 MISSING_LABEL 하나로 집계)
+
+        Returns:
+            ForecastCube: 집계 큐브
+        """
+        dimensions = list(DEFAULT_DIMENSIONS if dimensions is None else dimensions)
+        keys = pd.DataFrame({PLAN_DIMENSION: _dimension_values(df, code_column)})
+        for column in dimensions:
+            keys[column] = _dimension_values(df, column)
+        key_columns = [PLAN_DIMENSION] + dimensions
+
+        amounts = df[forecast_columns].apply(pd.to_numeric, errors='coerce')
+        amounts.columns = range(1, len(forecast_columns) + 1)
+        grouped = pd.concat([keys, amounts], axis=1).groupby(key_columns, sort=False)
+
+        # (그룹 × 월) 합계/건수를 long 형식으로 변환
+        sums = grouped.sum(min_count=0).stack()
+        counts = grouped.count().stack()
+        data = pd.DataFrame({'amount_sum': sums, 'count': counts})
+        data.index = data.index.set_names(key_columns + [MONTH_COLUMN])
+        return cls(data.reset_index(), dimensions)
+
+    @classmethod
+    def merge(cls, cubes):
+        """
+        여러 큐브(청크별, 파일별)를 하나로 합치기 (합계/건수를 키별로 더함)
+
+        Args:
+            cubes (list): ForecastCube 리스트 (차원이 같아야 함)
+
+        Returns:
+            ForecastCube: 합쳐진 큐브
+        """
+        cubes = [cube for cube in cubes if cube is not None]
+        if not cubes:
+            raise ValueError("합칠 큐브가 없습니다.")
+        dimensions = cubes[0].dimensions
+        if any(cube.dimensions != dimensions for cube in cubes):
+            raise ValueError("차원이 다른 큐브는 합칠 수 없습니다.")
+
+        combined = pd.concat([cube.data.astype({col: str for col in dimensions}) for cube in cubes],
+                             ignore_index=True)
+        data = combined.groupby(dimensions + [MONTH_COLUMN], sort=False)[MEASURE_COLUMNS].sum().reset_index()
+        return cls(data, dimensions[1:])
+
+    def save(self, output_file):
+        """큐브를 Parquet 파일로 저장"""
+        self.data.to_parquet(output_file, index=False)
+        print(f"✅ 예상 금액 큐브 저장: {output_file} ({len(self.data):,}행)")
+
+    @classmethod
+    def load(cls, input_file):
+        """Parquet 파일에서 큐브 로드 (차원은 저장된 컬럼에서 결정)"""
+        data = pd.read_parquet(input_file)
+        dimensions = [col for col in data.columns if col not in [PLAN_DIMENSION, MONTH_COLUMN] + MEASURE_COLUMNS]
+        return cls(data, dimensions)
+
+    def _mask(self, filters=None, months=None):
+        """필터 조건에 맞는 큐브 행 마스크"""
+        mask = np.ones(len(self.data), dtype=bool)
+        for column, value in (filters or {}).items():
+            if column not in self.dimensions:
+                raise ValueError(f"큐브에 없는 차원입니다: {column} (차원: {self.dimensions})")
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= self.data[column].isin([_dimension_key(v) for v in values]).to_numpy()
+        if months is not None:
+            months = months if isinstance(months, (list, tuple, set)) else [months]
+            mask &= self.data[MONTH_COLUMN].isin(list(months)).to_numpy()
+        return mask
+
+    def query(self, filters=None, months=None, by=None):
+        """
+        슬라이스/롤업 질의
+
+        Args:
+            filters (dict): 차원 → 값 또는 값 리스트 (예: {'유치대리점코드': 'X', '요금제코드': 'Y'})
+            months (int | list): 월 번호 (1 = M1, 기본: 전체)
+            by (list): 결과를 나눌 차원 (MONTH_COLUMN 포함 가능, 기본: 전체 합계 한 행)
+
+        Returns:
+            pd.DataFrame: by별 amount_sum, count, amount_mean
+        """
+        by = list(by or [])
+        selected = self.data[self._mask(filters, months)]
+
+        if by:
+            result = selected.groupby(by, observed=True, sort=True)[MEASURE_COLUMNS].sum().reset_index()
+        else:
+            result = pd.DataFrame({column: [selected[column].sum()] for column in MEASURE_COLUMNS})
+        result['amount_mean'] = result['amount_sum'] / result['count'].where(result['count'] > 0)
+        return result
+
+    def monthly_totals(self, filters=None):
+        """
+        월별 총 예상 금액 (M1 ~ Mn)
+
+        Args:
+            filters (dict): 차원 → 값 또는 값 리스트
+
+        Returns:
+            pd.DataFrame: M1 ~ Mn 인덱스의 amount_sum, count, amount_mean
+        """
+        result = self.query(filters, by=[MONTH_COLUMN]).set_index(MONTH_COLUMN)
+        result.index = [f'M{month}' for month in result.index]
+        return result
+
+    def summary(self):
+        """큐브 요약 출력"""
+        print(f"✅ 예상 금액 큐브: {len(self.data):,}행, 차원 {self.dimensions} + {MONTH_COLUMN}")
+        for column in self.dimensions:
+            print(f"  - {column}: {self.data[column].nunique():,}개 값")
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='월별 예상 금액 큐브 질의')
+    parser.add_argument('cube_file', help='큐브 Parquet 파일 경로')
+    parser.add_argument('--filter', nargs=2, action='append', metavar=('DIMENSION', 'VALUE'), default=[],
+                        help='차원 필터 (여러 번 지정 가능, 같은 차원은 OR)')
+    parser.add_argument('--month', type=int, action='append', default=None, help='월 번호 (1 = M1)')
+    parser.add_argument('--by', nargs='*', default=['month'], help='결과를 나눌 차원')
+    args = parser.parse_args()
+
+    filters = {}
+    for dimension, value in args.filter:
+        filters.setdefault(dimension, []).append(value)
+
+    cube = ForecastCube.load(args.cube_file)
+    cube.summary()
+    print(cube.query(filters, months=args.month, by=args.by).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+월별 예상 금액 산정 엔진
+forecasting_analysis.ipynb의 calculate_monthly_forecast를 고객 × 월 행렬 연산으로 계산합니다.
+행 단위 iterrows/relativedelta/pd.to_datetime 반복 없이 NumPy 배열 연산만 사용하며,
+결과는 기존 함수와 동일합니다.
+"""
+
+import pandas as pd
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+# 예상 금액 계산에 사용하는 요금제 금액 컬럼
+FEE_COLUMNS = ['기본료', '평생할인', '기간할인', '이벤트가', '정책금']
+
+# 정책반영시작일/종료일 컬럼이 없을 때 기존 함수가 사용하는 기본값
+DEFAULT_POLICY_START = '1900-01-01'
+DEFAULT_POLICY_END = '9999-12-31'
+
+def calculate_monthly_forecast(row, months_ahead=12):
+    """
+    가입 고객의 월별 예상 금액을 계산하는 함수 (행 단위 기준 구현)
+
+    벡터화 엔진(calculate_forecast_matrix)의 검증 기준으로 유지합니다.
+
+    Parameters:
+    - row: 고객 데이터 행 (pandas Series)
+    - months_ahead: 예상할 개월 수 (기본 12개월)
+
+    Returns:
+    - 월별 예상 금액 리스트
+    """
+    try:
+        # 기본료 (정책금이 있으면 정책금, 없으면 기본료)
+        base_fee = row.get('정책금', 0) if pd.notna(row.get('정책금', 0)) and row.get('정책금', 0) > 0 else row.get('기본료', 0)
+
+        # 할인 정보
+        lifetime_discount = row.get('평생할인', 0) if pd.notna(row.get('평생할인', 0)) else 0
+        period_discount = row.get('기간할인', 0) if pd.notna(row.get('기간할인', 0)) else 0
+        event_fee = row.get('이벤트가', 0) if pd.notna(row.get('이벤트가', 0)) else 0
+
+        # 정책 반영 기간 확인
+        policy_start = row.get('정책반영시작일', DEFAULT_POLICY_START)
+        policy_end = row.get('정책반영종료일', DEFAULT_POLICY_END)
+
+        # 가입일 (ENTR_BY_INS의 경우 처리일자, ENTR_INT_INS의 경우 처리일자)
+        join_date = None
+        if '처리일자' in row.index and pd.notna(row['처리일자']):
+            join_date = pd.to_datetime(row['처리일자'], errors='coerce')
+        elif '가입일자' in row.index and pd.notna(row['가입일자']):
+            join_date = pd.to_datetime(row['가입일자'], errors='coerce')
+
+        if join_date is None or pd.isna(join_date):
+            return [0] * months_ahead
+
+        # 월별 예상 금액 계산
+        monthly_forecasts = []
+
+        for month in range(months_ahead):
+            # 해당 월의 날짜 계산
+            target_date = join_date + relativedelta(months=month)
+
+            # 정책 반영 기간 확인
+            policy_start_date = pd.to_datetime(policy_start, errors='coerce')
+            policy_end_date = pd.to_datetime(policy_end, errors='coerce')
+
+            # 정책이 적용되는 기간인지 확인
+            is_policy_period = False
+            if pd.notna(policy_start_date) and pd.notna(policy_end_date):
+                is_policy_period = policy_start_date <= target_date <= policy_end_date
+
+            # 월별 금액 계산
+            monthly_amount = base_fee
+
+            # 평생할인 적용 (정책 기간이거나 평생할인이 있는 경우)
+            if lifetime_discount > 0 and (is_policy_period or lifetime_discount > 0):
+                monthly_amount = max(0, monthly_amount - lifetime_discount)
+
+            # 기간할인 적용 (정책 기간인 경우)
+            if period_discount > 0 and is_policy_period:
+                monthly_amount = max(0, monthly_amount - period_discount)
+
+            # 이벤트가 적용 (정책 기간인 경우)
+            if event_fee > 0 and is_policy_period:
+                monthly_amount = max(0, monthly_amount - event_fee)
+
+            monthly_forecasts.append(monthly_amount)
+
+        return monthly_forecasts
+
+    except Exception as e:
+        print(f"월별 예상 금액 계산 중 오류: {e}")
+        return [0] * months_ahead
+
+def parse_dates(values):
+    """
+    날짜 값 배열을 datetime64[ns]로 변환 (파싱 실패는 NaT)
+
+    고유값만 파싱합니다. format='mixed'는 값마다 형식을 따로 추론하므로
+    행 단위 pd.to_datetime(value, errors='coerce')와 결과가 같고, 날짜 종류 수만큼만 비용이 듭니다.
+
+    Args:
+        values (array-like): 날짜 문자열/정수/Timestamp 배열
+
+    Returns:
+        np.ndarray: datetime64[ns] 배열
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+
+    parsed = np.empty(len(uniques) + 1, dtype='datetime64[ns]')
+    parsed[-1] = np.datetime64('NaT')  # 결측값(코드 -1)
+    try:
+        parsed[:-1] = pd.to_datetime(pd.Index(uniques, dtype=object), errors='coerce', format='mixed').to_numpy()
+    except (TypeError, ValueError):
+        # 시간대가 섞인 경우 등은 값별로 파싱
+        for i, value in enumerate(uniques):
+            timestamp = pd.to_datetime(value, errors='coerce')
+            parsed[i] = np.datetime64('NaT') if pd.isna(timestamp) else timestamp.tz_localize(None).to_datetime64()
+
+    return parsed[codes]
+
+def add_months(dates, months_ahead=12):
+    """
+    날짜 배열에 0 ~ months_ahead-1 개월을 더한 (고객 × 월) 날짜 행렬
+
+    relativedelta(months=n)과 같이 일(day)은 해당 월의 말일로 맞추고 시각은 유지합니다.
+
+    Args:
+        dates (np.ndarray): datetime64[ns] 배열 (NaT 허용)
+        months_ahead (int): 개월 수
+
+    Returns:
+        np.ndarray: datetime64[ns] 행렬 (len(dates), months_ahead)
+    """
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    days = dates.astype('datetime64[D]')
+    months = dates.astype('datetime64[M]')
+
+    day_index = (days - months.astype('datetime64[D]')).astype(np.int64)  # 0부터 시작하는 일
+    time_of_day = dates - days.astype('datetime64[ns]')
+
+    offsets = np.arange(months_ahead)
+    target_months = months[:, np.newaxis] + offsets[np.newaxis, :]
+    month_starts = target_months.astype('datetime64[D]')
+    month_lengths = ((target_months + 1).astype('datetime64[D]') - month_starts).astype(np.int64)
+
+    clipped_days = np.minimum(day_index[:, np.newaxis], month_lengths - 1)
+    targets = (month_starts + clipped_days).astype('datetime64[ns]') + time_of_day[:, np.newaxis]
+
+    return np.where(np.isnat(dates)[:, np.newaxis], np.datetime64('NaT'), targets)
+
+def _column_or_default(df, column, default):
+    """컬럼 값 배열 (컬럼이 없으면 기본값으로 채운 배열)"""
+    if column in df.columns:
+        return df[column].to_numpy()
+    return np.full(len(df), default, dtype=object if isinstance(default, str) else None)
+
+def get_join_dates(df):
+    """
+    고객별 가입일 배열 (처리일자가 있으면 처리일자, 없으면 가입일자)
+
+    처리일자 값이 있는데 파싱에 실패하면 가입일자로 넘어가지 않고 NaT입니다 (기존 함수와 동일).
+
+    Args:
+        df (pd.DataFrame): 고객 데이터
+
+    Returns:
+        np.ndarray: datetime64[ns] 배열
+    """
+    join_values = np.full(len(df), np.nan, dtype=object)
+    if '처리일자' in df.columns:
+        processed = df['처리일자'].to_numpy(dtype=object)
+        has_processed = pd.notna(processed)
+        join_values[has_processed] = processed[has_processed]
+    else:
+        has_processed = np.zeros(len(df), dtype=bool)
+    if '가입일자' in df.columns:
+        joined = df['가입일자'].to_numpy(dtype=object)
+        use_joined = ~has_processed & pd.notna(joined)
+        join_values[use_joined] = joined[use_joined]
+
+    return parse_dates(join_values)
+
+def month_targets(join_dates, months_ahead=12):
+    """
+    고객별 가입일로부터 M1 ~ Mn 기준일 행렬 (고유 가입일만 계산 후 gather)
+
+    Args:
+        join_dates (np.ndarray): datetime64[ns] 가입일 배열
+        months_ahead (int): 개월 수
+
+    Returns:
+        np.ndarray: datetime64[ns] 행렬 (고객 수, months_ahead)
+    """
+    unique_dates, inverse = np.unique(join_dates, return_inverse=True)
+    return add_months(unique_dates, months_ahead)[inverse.reshape(-1)]
+
+def fee_inputs(fees):
+    """
+    요금제 금액 배열로 기본 요금과 할인 배열 구성
+
+    Args:
+        fees (dict): FEE_COLUMNS별 숫자 배열 (결측값은 NaN)
+
+    Returns:
+        dict: base_fee, 할인 배열, 원본 금액(fees), 정수형 여부
+    """
+    # 정책금이 있으면 정책금, 없으면 기본료
+    policy_fee = fees['정책금'].astype(np.float64)
+    use_policy_fee = ~np.isnan(policy_fee) & (policy_fee > 0)
+    base_fee = np.where(use_policy_fee, fees['정책금'], fees['기본료'])
+
+    return {
+        'base_fee': base_fee.astype(np.float64),
+        'lifetime_discount': np.nan_to_num(fees['평생할인'].astype(np.float64), nan=0.0),
+        'period_discount': np.nan_to_num(fees['기간할인'].astype(np.float64), nan=0.0),
+        'event_fee': np.nan_to_num(fees['이벤트가'].astype(np.float64), nan=0.0),
+        'fees': {column: values.astype(np.float64) for column, values in fees.items()},
+        'integer_fees': all(np.issubdtype(fees[column].dtype, np.integer) for column in FEE_COLUMNS)
+    }
+
+def prepare_forecast_inputs(df):
+    """
+    요금제 정보가 병합된 고객 데이터에서 예상 금액 계산용 배열 추출
+
+    Args:
+        df (pd.DataFrame): 요금제 정보(기본료, 할인, 정책반영기간)가 병합된 고객 데이터
+
+    Returns:
+        dict: 고객별 금액/날짜 배열 (forecast_matrix 입력)
+    """
+    fees = {}
+    for column in FEE_COLUMNS:
+        if column in df.columns:
+            fees[column] = pd.to_numeric(df[column], errors='coerce').to_numpy()
+        else:
+            fees[column] = np.zeros(len(df), dtype=np.int64)
+
+    inputs = fee_inputs(fees)
+    inputs.update({
+        'policy_start': parse_dates(_column_or_default(df, '정책반영시작일', DEFAULT_POLICY_START)),
+        'policy_end': parse_dates(_column_or_default(df, '정책반영종료일', DEFAULT_POLICY_END)),
+        'join_date': get_join_dates(df)
+    })
+    return inputs
+
+def prepare_policy_inputs(df, code_column, policy_index, months_ahead=12):
+    """
+    요금제 정책 색인으로 고객 × 월별 적용 정책 행을 찾아 예상 금액 계산용 배열 구성
+
+    요금제 정보를 병합하지 않은 고객 데이터를 받아, 월별 기준일마다
+    PlanPolicyIndex.lookup으로 정책 행을 고릅니다. 요금제별 정책 행이 하나뿐이면
+    병합 후 prepare_forecast_inputs를 쓴 결과와 같습니다.
+
+    Args:
+        df (pd.DataFrame): 고객 데이터
+        code_column (str): 요금제코드 컬럼명 (예: 'MVNO상품코드', '개통요금제코드')
+        policy_index (PlanPolicyIndex): 요금제 정책 색인
+        months_ahead (int): 예상할 개월 수
+
+    Returns:
+        dict: 고객 × 월 금액/날짜 행렬 (forecast_matrix 입력)
+    """
+    join_dates = get_join_dates(df)
+    targets = month_targets(join_dates, months_ahead)
+
+    codes = np.repeat(df[code_column].to_numpy(dtype=object), months_ahead)
+    rows, _ = policy_index.lookup(codes, targets.reshape(-1))
+    rows = rows.reshape(targets.shape)
+
+    fees = {}
+    for column in FEE_COLUMNS:
+        if column in policy_index.plan_df.columns:
+            fees[column] = policy_index.values(column, rows)
+        else:
+            fees[column] = np.zeros(targets.shape, dtype=np.int64)
+
+    policy_start, policy_end = policy_index.policy_dates(rows)
+
+    inputs = fee_inputs(fees)
+    inputs.update({
+        'policy_start': policy_start,
+        'policy_end': policy_end,
+        'join_date': join_dates,
+        'targets': targets
+    })
+    return inputs
+
+def _per_month(values):
+    """고객별 배열 (N,)은 (N, 1)로, 고객 × 월 행렬 (N, M)은 그대로"""
+    return values[:, np.newaxis] if values.ndim == 1 else values
+
+def policy_period_mask(policy_start, policy_end, targets):
+    """
+    정책 반영 기간 마스크 (시작일/종료일 중 하나라도 NaT면 정책 기간 아님)
+
+    Args:
+        policy_start (np.ndarray): datetime64 정책반영시작일 (targets와 broadcast 가능)
+        policy_end (np.ndarray): datetime64 정책반영종료일 (targets와 broadcast 가능)
+        targets (np.ndarray): datetime64 월별 기준일
+
+    Returns:
+        np.ndarray: bool 마스크
+    """
+    has_policy = ~np.isnat(policy_start) & ~np.isnat(policy_end)
+    return has_policy & (policy_start <= targets) & (targets <= policy_end)
+
+def apply_pricing(base_fee, lifetime_discount, period_discount, event_fee, is_policy_period):
+    """
+    기본 요금에 할인 적용 (입력은 서로 broadcast 가능한 배열)
+
+    평생할인은 항상, 기간할인/이벤트가는 정책 기간에만 적용합니다.
+    np.fmax는 기존 함수의 max(0, NaN) = 0과 같은 결과를 냅니다.
+
+    Returns:
+        np.ndarray: 할인 적용 후 금액 (float64)
+    """
+    amounts = np.asarray(base_fee, dtype=np.float64)
+    amounts = np.where(lifetime_discount > 0, np.fmax(0, amounts - lifetime_discount), amounts)
+    amounts = np.where((period_discount > 0) & is_policy_period, np.fmax(0, amounts - period_discount), amounts)
+    amounts = np.where((event_fee > 0) & is_policy_period, np.fmax(0, amounts - event_fee), amounts)
+    return amounts
+
+def forecast_matrix(inputs, months_ahead=12):
+    """
+    고객 × 월 예상 금액 행렬 계산
+
+    금액/정책 기간 입력은 고객별 배열 (N,) 또는 고객 × 월 행렬 (N, M) 모두 가능합니다.
+
+    Args:
+        inputs (dict): prepare_forecast_inputs 또는 prepare_policy_inputs 결과
+        months_ahead (int): 예상할 개월 수
+
+    Returns:
+        np.ndarray: (고객 수, months_ahead) 예상 금액 행렬
+    """
+    # 가입일 종류는 고객 수보다 훨씬 적으므로 고유 가입일에 대해서만 월 이동 후 gather
+    targets = inputs.get('targets')
+    if targets is None:
+        targets = month_targets(inputs['join_date'], months_ahead)
+    is_policy_period = policy_period_mask(_per_month(inputs['policy_start']),
+                                          _per_month(inputs['policy_end']), targets)
+
+    amounts = apply_pricing(_per_month(inputs['base_fee']),
+                            _per_month(inputs['lifetime_discount']),
+                            _per_month(inputs['period_discount']),
+                            _per_month(inputs['event_fee']),
+                            is_policy_period)
+    amounts = np.array(np.broadcast_to(amounts, targets.shape), dtype=np.float64)
+
+    # 가입일이 없는 고객은 0
+    amounts[np.isnat(inputs['join_date'])] = 0
+
+    if inputs['integer_fees'] and not np.isnan(amounts).any():
+        return amounts.astype(np.int64)
+    return amounts
+
+def calculate_forecast_matrix(df, months_ahead=12, policy_index=None, code_column=None):
+    """
+    고객 데이터의 월별 예상 금액 행렬 계산
+
+    Args:
+        df (pd.DataFrame): 요금제 정보가 병합된 고객 데이터 (policy_index 사용 시 병합 불필요)
+        months_ahead (int): 예상할 개월 수 (기본 12개월)
+        policy_index (PlanPolicyIndex): 월별 적용 정책 행을 찾을 요금제 정책 색인 (선택)
+        code_column (str): policy_index 사용 시 고객 데이터의 요금제코드 컬럼명
+
+    Returns:
+        np.ndarray: (고객 수, months_ahead) 예상 금액 행렬
+    """
+    if policy_index is not None:
+        return forecast_matrix(prepare_policy_inputs(df, code_column, policy_index, months_ahead), months_ahead)
+    return forecast_matrix(prepare_forecast_inputs(df), months_ahead)
+
+def add_forecast_columns(df, months_ahead=12, policy_index=None, code_column=None):
+    """
+    고객 데이터에 월별 예상 금액 컬럼(M1 ~ Mn)을 추가한 복사본 반환
+
+    Args:
+        df (pd.DataFrame): 요금제 정보가 병합된 고객 데이터
+        months_ahead (int): 예상할 개월 수 (기본 12개월)
+        policy_index (PlanPolicyIndex): 월별 적용 정책 행을 찾을 요금제 정책 색인 (선택)
+        code_column (str): policy_index 사용 시 고객 데이터의 요금제코드 컬럼명
+
+    Returns:
+        tuple: (예상 금액이 추가된 DataFrame, 예상 금액 컬럼 리스트)
+    """
+    forecast_columns = [f'M{month+1}' for month in range(months_ahead)]
+    forecast_df = pd.DataFrame(calculate_forecast_matrix(df, months_ahead, policy_index, code_column),
+                               columns=forecast_columns, index=df.index)
+
+    return pd.concat([df.drop(columns=forecast_columns, errors='ignore'), forecast_df], axis=1), forecast_columns
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스트리밍 월별 예상 금액 산정 파이프라인
+가입자 CSV를 청크 단위로 읽어 요금제 정책 색인으로 요금제 정보를 붙이고,
+월별 예상 금액(M1 ~ Mn)을 계산한 뒤 CSV 또는 Parquet 파일에 이어 씁니다.
+최대 메모리는 청크 크기에 비례하므로 1년치 이상의 이력도 처리할 수 있습니다.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import time
+import argparse
+from pathlib import Path
+
+from csv_analyzer import detect_encoding
+from forecast_engine import add_forecast_columns, get_join_dates
+from forecast_cube import ForecastCube, DEFAULT_DIMENSIONS
+from plan_catalog import load_plan_catalog
+from plan_policy_index import code_keys
+
+# 가입자 파일에서 요금제코드로 사용할 컬럼 후보 (앞에 있을수록 우선)
+CODE_COLUMN_CANDIDATES = ['MVNO상품코드', '개통요금제코드', '요금제코드']
+
+# 출력에 붙일 요금제 정보 컬럼
+PLAN_COLUMNS = ['요금제코드', '요금제명', '기본료', '평생할인', '기간할인', '이벤트가', '정책금', '정책반영시작일', '정책반영종료일']
+
+# 숫자처럼 보여도 문자열로 읽고 쓰는 코드/ID 컬럼 (2^53을 넘는 가입번호, 앞자리 0이 있는 코드 보존)
+ID_COLUMNS = ['가입번호', '고객번호', '청구계정번호']
+TEXT_COLUMNS = list(dict.fromkeys(CODE_COLUMN_CANDIDATES + ID_COLUMNS + DEFAULT_DIMENSIONS))
+
+class _ParquetAppender:
+    """청크를 하나의 Parquet 파일에 이어 쓰는 도구 (첫 청크에서 정한 명시적 스키마로 고정)"""
+
+    def __init__(self, output_file, text_columns=()):
+        """
+        Args:
+            output_file (str): 출력 Parquet 경로
+            text_columns (list): 항상 문자열로 쓸 코드/ID 컬럼 (숫자처럼 보여도 문자열)
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet 출력에는 pyarrow가 필요합니다. pip install pyarrow")
+        self.pa = pa
+        self.pq = pq
+        self.output_file = output_file
+        self.text_columns = set(text_columns)
+        self.writer = None
+        self.schema = None
+
+    def _field(self, name, values):
+        """첫 청크 컬럼으로 스키마 필드 결정 (정수는 결측을 허용하는 int64로, 실수로 바꾸지 않음)"""
+        if name in self.text_columns:
+            return self.pa.field(name, self.pa.string())
+        if pd.api.types.is_bool_dtype(values):
+            return self.pa.field(name, self.pa.bool_())
+        if pd.api.types.is_integer_dtype(values):
+            return self.pa.field(name, self.pa.int64())
+        if pd.api.types.is_float_dtype(values):
+            return self.pa.field(name, self.pa.float64())
+        arrow_type = self.pa.Array.from_pandas(values).type
+        # 문자열/혼합 타입이거나 첫 청크에서 값이 모두 결측인 컬럼은 문자열로 고정
+        if self.pa.types.is_null(arrow_type) or not self.pa.types.is_temporal(arrow_type):
+            return self.pa.field(name, self.pa.string())
+        return self.pa.field(name, arrow_type)
+
+    def _array(self, values, arrow_type):
+        """청크 컬럼을 스키마 타입의 Arrow 배열로 변환"""
+        if self.pa.types.is_string(arrow_type):
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                # 다른 청크에서 숫자로 추론된 코드도 같은 문자열(100.0 → '100')로 기록
+                return self.pa.array(code_keys(values), type=arrow_type)
+            return self.pa.array(values.astype('string'), type=arrow_type, from_pandas=True)
+        if self.pa.types.is_integer(arrow_type):
+            # 결측값이 있는 청크는 pandas가 실수로 읽으므로 nullable Int64로 되돌림
+            return self.pa.array(values.astype('Int64'), type=arrow_type)
+        return self.pa.array(values, type=arrow_type, from_pandas=True)
+
+    def write(self, df):
+        if self.writer is None:
+            self.schema = self.pa.schema([self._field(col, df[col]) for col in df.columns])
+            self.writer = self.pq.ParquetWriter(self.output_file, self.schema)
+
+        arrays = []
+        for field in self.schema:
+            try:
+                arrays.append(self._array(df[field.name], field.type))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"'{field.name}' 컬럼 값을 Parquet 스키마({field.type})로 쓸 수 없습니다. "
+                                 f"코드/ID 컬럼이면 text_columns에 추가하세요: {e}")
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+class ForecastPipeline:
+    """
+    청크 단위 가입자 데이터 → 요금제 정보 결합 → 월별 예상 금액 → 파일 추가 쓰기
+    """
+
+    def __init__(self, plan_file='csv/MVNO_PRD_PLC.csv', months_ahead=12, chunksize=50000):
+        """
+        Args:
+            plan_file (str): 요금제 정보 CSV 경로 (한 번만 로드하여 요금제 카탈로그 생성)
+            months_ahead (int): 예상할 개월 수
+            chunksize (int): 한 번에 처리할 가입자 행 수
+        """
+        self.plan_file = plan_file
+        self.months_ahead = months_ahead
+        self.chunksize = chunksize
+        self.forecast_columns = [f'M{month+1}' for month in range(months_ahead)]
+
+        # 같은 프로세스에서 이미 로드한 요금제 카탈로그(해시 색인 포함)는 재사용
+        self.catalog = load_plan_catalog(plan_file)
+        self.plan_df = self.catalog.plan_df
+        self.policy_index = self.catalog.policy_index
+        self.catalog.summary()
+
+    def run(self, input_file, output_file, code_column=None, matched_only=True, usecols=None, cube_file=None,
+            text_columns=None):
+        """
+        가입자 파일 전체를 스트리밍으로 예상 금액 산정
+
+        Args:
+            input_file (str): 가입자 CSV 경로 (예: csv/ENTR_BY_INS.csv)
+            output_file (str): 출력 경로 (.parquet이면 Parquet, 그 외는 CSV)
+            code_column (str): 요금제코드 컬럼명 (기본: 헤더에서 자동 선택)
+            matched_only (bool): 요금제 정보와 매핑된 가입자만 출력 (노트북과 동일)
+            usecols (list): 출력에 포함할 가입자 컬럼 (기본: 전체)
+            cube_file (str): 월 × 요금제코드 × 유치대리점코드 × 개통유형 집계 큐브 Parquet 경로 (선택)
+            text_columns (list): 문자열로 읽고 쓸 코드/ID 컬럼 (기본: TEXT_COLUMNS + 요금제코드 컬럼)
+
+        Returns:
+            dict: 처리 요약 (행 수, 매핑 수, 월별 총 예상 금액, 집계 큐브, 소요 시간)
+        """
+        encoding = detect_encoding(input_file)
+        if encoding is None:
+            print(f"❌ {Path(input_file).name} 인코딩을 확인할 수 없습니다.")
+            return None
+
+        header = pd.read_csv(input_file, encoding=encoding, nrows=0).columns.tolist()
+        if code_column is None:
+            code_column = next((col for col in CODE_COLUMN_CANDIDATES if col in header), None)
+        if code_column not in header:
+            print(f"❌ 요금제코드 컬럼을 찾을 수 없습니다: {code_column}")
+            return None
+
+        if usecols is not None:
+            # 요금제코드와 가입일 계산에 필요한 컬럼은 항상 포함
+            required = [code_column] + [col for col in ['처리일자', '가입일자'] + DEFAULT_DIMENSIONS if col in header]
+            usecols = list(dict.fromkeys(list(usecols) + required))
+
+        if os.path.exists(output_file):
+            os.remove(output_file)
+
+        # 코드/ID 컬럼은 청크마다 숫자/문자열로 추론이 달라지지 않도록 문자열로 읽음
+        text_columns = list(dict.fromkeys((TEXT_COLUMNS if text_columns is None else list(text_columns)) + [code_column]))
+        dtype = {col: str for col in text_columns if col in header}
+
+        use_parquet = output_file.endswith('.parquet')
+        appender = _ParquetAppender(output_file, text_columns + ['요금제코드']) if use_parquet else None
+
+        file_size = os.path.getsize(input_file)
+        summary = {
+            'input_file': input_file,
+            'output_file': output_file,
+            'total_rows': 0,
+            'matched_rows': 0,
+            'written_rows': 0,
+            'monthly_totals': np.zeros(self.months_ahead),
+            'cube': None
+        }
+
+        print(f"🔄 {Path(input_file).name} 스트리밍 예상 금액 산정 시작 "
+              f"(인코딩: {encoding}, 청크: {self.chunksize:,}행, 요금제코드: {code_column})")
+        start_time = time.time()
+
+        try:
+            with open(input_file, 'r', encoding=encoding, newline='') as f:
+                for chunk in pd.read_csv(f, usecols=usecols, dtype=dtype, chunksize=self.chunksize):
+                    self._process_chunk(chunk, code_column, matched_only, summary, output_file, appender,
+                                        build_cube=cube_file is not None)
+
+                    elapsed = time.time() - start_time
+                    progress = min(100.0, f.buffer.tell() / file_size * 100) if file_size else 100.0
+                    print(f"  📈 {summary['total_rows']:,}행 처리 ({progress:.1f}%) - "
+                          f"{summary['total_rows'] / max(elapsed, 1e-9):,.0f}행/초")
+        finally:
+            if appender is not None:
+                appender.close()
+
+        if cube_file is not None and summary['cube'] is not None:
+            summary['cube'].save(cube_file)
+
+        summary['elapsed_seconds'] = time.time() - start_time
+
+        print(f"✅ 예상 금액 산정 완료: {summary['written_rows']:,}행 저장 → {output_file} "
+              f"({summary['elapsed_seconds']:.1f}초)")
+        if summary['total_rows']:
+            print(f"  - 매핑 성공: {summary['matched_rows']:,}건 ({summary['matched_rows'] / summary['total_rows'] * 100:.1f}%)")
+        for col, total in zip(self.forecast_columns, summary['monthly_totals']):
+            print(f"  - {col}: 총 {total:,.0f}원")
+
+        return summary
+
+    def _process_chunk(self, chunk, code_column, matched_only, summary, output_file, appender, build_cube=False):
+        """청크 하나를 요금제 정보와 결합하고 예상 금액을 계산하여 출력에 추가"""
+        chunk = chunk.reset_index(drop=True)
+        policy_rows = self.catalog.positions(chunk[code_column], get_join_dates(chunk))
+
+        # 가입자 요금제코드 컬럼은 그대로 두고(매핑 실패 행도 코드 유지), 나머지 겹치는 컬럼은 enrich가 요금제 값으로 교체
+        plan_columns = [col for col in PLAN_COLUMNS if col in self.plan_df.columns and col != code_column]
+        enriched = self.catalog.enrich(chunk, code_column, plan_columns, rows=policy_rows)
+
+        matched = policy_rows >= 0
+        summary['total_rows'] += len(chunk)
+        summary['matched_rows'] += int(matched.sum())
+
+        if matched_only:
+            enriched = enriched[matched]
+
+        forecast, _ = add_forecast_columns(enriched, self.months_ahead,
+                                           policy_index=self.policy_index, code_column=code_column)
+        summary['monthly_totals'] += np.nan_to_num(forecast[self.forecast_columns].to_numpy(dtype=np.float64)).sum(axis=0)
+        summary['written_rows'] += len(forecast)
+
+        if build_cube:
+            # 합계/건수 큐브는 청크별로 만들어 더해도 전체 데이터로 만든 큐브와 같음
+            chunk_cube = ForecastCube.from_forecast(forecast, self.forecast_columns, code_column=code_column)
+            summary['cube'] = ForecastCube.merge([summary['cube'], chunk_cube])
+
+        if appender is not None:
+            appender.write(forecast)
+        else:
+            forecast.to_csv(output_file, mode='a', header=not os.path.exists(output_file),
+                            index=False, encoding='utf-8')
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='스트리밍 월별 예상 금액 산정')
+    parser.add_argument('input_file', help='가입자 CSV 경로 (예: csv/ENTR_BY_INS.csv)')
+    parser.add_argument('output_file', help='출력 경로 (.csv 또는 .parquet)')
+    parser.add_argument('--plan-file', default='csv/MVNO_PRD_PLC.csv', help='요금제 정보 CSV 경로')
+    parser.add_argument('--code-column', default=None, help='요금제코드 컬럼명 (기본: 자동 선택)')
+    parser.add_argument('--months', type=int, default=12, help='예상할 개월 수')
+    parser.add_argument('--chunksize', type=int, default=50000, help='청크 행 수')
+    parser.add_argument('--all-rows', action='store_true', help='요금제 정보와 매핑되지 않은 가입자도 출력')
+    parser.add_argument('--cube-file', default=None, help='월 × 요금제 × 대리점 × 개통유형 집계 큐브 Parquet 경로')
+    args = parser.parse_args()
+
+    print("📊 스트리밍 월별 예상 금액 산정 프로그램")
+    print("=" * 60)
+
+    pipeline = ForecastPipeline(plan_file=args.plan_file, months_ahead=args.months, chunksize=args.chunksize)
+    pipeline.run(args.input_file, args.output_file, code_column=args.code_column,
+                 matched_only=not args.all_rows, cube_file=args.cube_file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+요금 정책 what-if 시나리오 예상 금액 산정
+기간할인/이벤트가 수준, 정책 기간 연장 등 파라미터 변경 조합(그리드)을
+시나리오 × 고객 × 월 배열 한 번으로 계산하고 시나리오별 월별 총액을 반환합니다.
+메모리 한도를 넘으면 고객을 블록으로 나누어 프로세스 풀에서 계산합니다.
+"""
+
+import pandas as pd
+import numpy as np
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from forecast_engine import (
+    FEE_COLUMNS, parse_dates, add_months, month_targets, fee_inputs,
+    prepare_forecast_inputs, prepare_policy_inputs, policy_period_mask, apply_pricing
+)
+
+# 금액 컬럼별 변경 방식: '기간할인'은 값 지정, '기간할인_scale'은 배율, '기간할인_add'는 가감
+FEE_OVERRIDE_KEYS = (list(FEE_COLUMNS)
+                     + [f'{column}_scale' for column in FEE_COLUMNS]
+                     + [f'{column}_add' for column in FEE_COLUMNS])
+
+# 정책 기간 변경: 시작일/종료일 지정, 종료일 n개월 연장
+POLICY_OVERRIDE_KEYS = ['policy_start', 'policy_end', 'policy_extend_months']
+
+# 변경을 적용할 요금제코드 목록 (없으면 전체 고객)
+SCOPE_OVERRIDE_KEYS = ['plan_codes']
+
+# 시나리오 × 고객 × 월 원소 하나를 계산할 때 동시에 잡히는 float64/bool 배열 수 (대략)
+_BYTES_PER_ELEMENT = 8 * 12
+
+def scenario_grid(param_grid, base=None):
+    """
+    파라미터별 후보 값의 모든 조합으로 시나리오 생성
+
+    Args:
+        param_grid (dict): 변경 키 → 후보 값 리스트 (예: {'기간할인_scale': [1.0, 0.5], 'policy_extend_months': [0, 3]})
+        base (dict): 모든 시나리오에 공통으로 적용할 변경 (예: {'plan_codes': [...]})
+
+    Returns:
+        dict: 시나리오 이름 → 변경 딕셔너리
+    """
+    keys = list(param_grid.keys())
+    scenarios = {}
+    for values in itertools.product(*(param_grid[key] for key in keys)):
+        overrides = dict(base or {})
+        overrides.update(zip(keys, values))
+        name = ', '.join(f'{key}={value}' for key, value in zip(keys, values)) or 'baseline'
+        scenarios[name] = overrides
+    return scenarios
+
+def _normalize_scenarios(scenarios):
+    """시나리오 리스트/딕셔너리를 (이름 리스트, 변경 리스트)로 정리하고 키 검증"""
+    if isinstance(scenarios, dict):
+        names, overrides_list = list(scenarios.keys()), list(scenarios.values())
+    else:
+        overrides_list = list(scenarios)
+        names = [f'S{i+1}' for i in range(len(overrides_list))]
+
+    valid_keys = set(FEE_OVERRIDE_KEYS + POLICY_OVERRIDE_KEYS + SCOPE_OVERRIDE_KEYS)
+    for name, overrides in zip(names, overrides_list):
+        unknown = set(overrides) - valid_keys
+        if unknown:
+            raise ValueError(f"시나리오 '{name}'에 알 수 없는 변경 키가 있습니다: {sorted(unknown)}")
+        if overrides.get('policy_extend_months', 0) < 0:
+            raise ValueError(f"시나리오 '{name}'의 policy_extend_months는 0 이상이어야 합니다.")
+    return names, overrides_list
+
+def _broadcast_selected(selected, values):
+    """고객별 선택 마스크 (N,)를 고객별 (N,) 또는 고객 × 월 (N, M) 배열에 맞춤"""
+    return selected if values.ndim == 1 else selected[:, np.newaxis]
+
+def _apply_overrides(inputs, overrides, codes):
+    """
+    한 시나리오의 변경을 적용한 금액/정책 기간 배열
+
+    Returns:
+        tuple: (금액 컬럼 → 배열, 정책반영시작일, 정책반영종료일)
+    """
+    plan_codes = overrides.get('plan_codes')
+    if plan_codes is None:
+        selected = np.ones(len(inputs['join_date']), dtype=bool)
+    else:
+        selected = pd.Index(list(plan_codes)).get_indexer(pd.Index(codes)) >= 0
+
+    # 값 지정 → 배율 → 가감 순서로 적용
+    fees = {}
+    for column in FEE_COLUMNS:
+        values = inputs['fees'][column]
+        mask = _broadcast_selected(selected, values)
+        if column in overrides:
+            values = np.where(mask, float(overrides[column]), values)
+        if f'{column}_scale' in overrides:
+            values = np.where(mask, values * overrides[f'{column}_scale'], values)
+        if f'{column}_add' in overrides:
+            values = np.where(mask, values + overrides[f'{column}_add'], values)
+        fees[column] = values
+
+    policy_start, policy_end = inputs['policy_start'], inputs['policy_end']
+    # 날짜 문자열은 원본 데이터와 같은 방식으로 파싱 (9999-12-31은 NaT → 정책 기간 없음)
+    if 'policy_start' in overrides:
+        start = parse_dates([overrides['policy_start']])[0]
+        policy_start = np.where(_broadcast_selected(selected, policy_start), start, policy_start)
+    if 'policy_end' in overrides:
+        end = parse_dates([overrides['policy_end']])[0]
+        policy_end = np.where(_broadcast_selected(selected, policy_end), end, policy_end)
+    extend = int(overrides.get('policy_extend_months', 0))
+    if extend > 0:
+        extended = add_months(policy_end.reshape(-1), extend + 1)[:, extend].reshape(policy_end.shape)
+        policy_end = np.where(_broadcast_selected(selected, policy_end), extended, policy_end)
+
+    return fees, policy_start, policy_end
+
+def _per_scenario_month(values):
+    """시나리오 × 고객 (S, N)은 (S, N, 1)로, 시나리오 × 고객 × 월 (S, N, M)은 그대로"""
+    return values[..., np.newaxis] if values.ndim == 2 else values
+
+def _evaluate_block(inputs, codes, overrides_list, months_ahead, return_customers=False):
+    """
+    고객 블록 하나의 시나리오 × 고객 × 월 예상 금액 계산 (프로세스 풀 작업 단위)
+
+    Returns:
+        tuple: ((시나리오 수, months_ahead) 월별 총액, 고객별 금액 배열 또는 None)
+    """
+    targets = inputs.get('targets')
+    if targets is None:
+        targets = month_targets(inputs['join_date'], months_ahead)
+
+    scenario_fees = {column: [] for column in FEE_COLUMNS}
+    starts, ends = [], []
+    for overrides in overrides_list:
+        fees, policy_start, policy_end = _apply_overrides(inputs, overrides, codes)
+        for column in FEE_COLUMNS:
+            scenario_fees[column].append(fees[column])
+        starts.append(policy_start)
+        ends.append(policy_end)
+
+    # (S, N) 또는 (S, N, M) 배열로 쌓아 forecast_matrix와 같은 계산을 한 번에 수행
+    stacked = fee_inputs({column: np.stack(values) for column, values in scenario_fees.items()})
+    is_policy_period = policy_period_mask(_per_scenario_month(np.stack(starts)),
+                                          _per_scenario_month(np.stack(ends)), targets)
+    amounts = apply_pricing(_per_scenario_month(stacked['base_fee']),
+                            _per_scenario_month(stacked['lifetime_discount']),
+                            _per_scenario_month(stacked['period_discount']),
+                            _per_scenario_month(stacked['event_fee']),
+                            is_policy_period)
+    amounts = np.array(np.broadcast_to(amounts, (len(overrides_list),) + targets.shape), dtype=np.float64)
+
+    # 가입일이 없는 고객은 0
+    amounts[:, np.isnat(inputs['join_date'])] = 0
+
+    totals = np.nansum(amounts, axis=1)
+    return totals, (amounts if return_customers else None)
+
+def _slice_inputs(inputs, start, stop):
+    """예상 금액 입력 딕셔너리에서 고객 구간 [start, stop) 잘라내기"""
+    block = {}
+    for key, value in inputs.items():
+        if key == 'fees':
+            block[key] = {column: values[start:stop] for column, values in value.items()}
+        elif isinstance(value, np.ndarray):
+            block[key] = value[start:stop]
+        else:
+            block[key] = value
+    return block
+
+def evaluate_scenarios(df, scenarios, months_ahead=12, policy_index=None, code_column=None,
+                       memory_limit_mb=512, max_workers=None, return_customers=False):
+    """
+    여러 시나리오의 월별 예상 총액을 한 번에 계산
+
+    변경 키:
+        - '기본료', '평생할인', '기간할인', '이벤트가', '정책금': 금액 지정
+        - '<금액 컬럼>_scale', '<금액 컬럼>_add': 기존 금액의 배율/가감
+        - 'policy_start', 'policy_end': 정책반영시작일/종료일 지정
+        - 'policy_extend_months': 정책반영종료일 n개월 연장
+        - 'plan_codes': 변경을 적용할 요금제코드 목록 (code_column 필요)
+
+    Args:
+        df (pd.DataFrame): 고객 데이터 (policy_index 없이 사용하면 요금제 정보가 병합된 데이터)
+        scenarios (dict | list): 시나리오 이름 → 변경 딕셔너리 (scenario_grid 결과) 또는 변경 딕셔너리 리스트
+        months_ahead (int): 예상할 개월 수
+        policy_index (PlanPolicyIndex): 월별 적용 정책 행을 찾을 요금제 정책 색인 (선택)
+        code_column (str): 고객 데이터의 요금제코드 컬럼명
+        memory_limit_mb (int): 한 번에 계산할 시나리오 × 고객 × 월 배열의 메모리 한도
+        max_workers (int): 블록이 여러 개일 때 사용할 프로세스 수 (1이면 순차 계산)
+        return_customers (bool): 고객별 금액 배열 (시나리오 수, 고객 수, months_ahead)도 반환
+
+    Returns:
+        pd.DataFrame | tuple: 시나리오 × 월(M1 ~ Mn) 총액 DataFrame
+            (return_customers=True면 (총액 DataFrame, 고객별 금액 배열))
+    """
+    names, overrides_list = _normalize_scenarios(scenarios)
+    forecast_columns = [f'M{month+1}' for month in range(months_ahead)]
+
+    if any('plan_codes' in overrides for overrides in overrides_list):
+        if code_column is None or code_column not in df.columns:
+            raise ValueError("plan_codes 변경을 사용하려면 고객 데이터의 요금제코드 컬럼(code_column)이 필요합니다.")
+
+    start_time = time.time()
+    if policy_index is not None:
+        inputs = prepare_policy_inputs(df, code_column, policy_index, months_ahead)
+    else:
+        inputs = prepare_forecast_inputs(df)
+    codes = df[code_column].to_numpy(dtype=object) if code_column in df.columns else np.full(len(df), None, dtype=object)
+
+    n_customers = len(df)
+    n_scenarios = len(overrides_list)
+    block_size = max(1, int(memory_limit_mb * 1024 * 1024 // (_BYTES_PER_ELEMENT * n_scenarios * months_ahead)))
+    blocks = [(start, min(start + block_size, n_customers)) for start in range(0, n_customers, block_size)]
+
+    print(f"🔄 시나리오 {n_scenarios}개 × 고객 {n_customers:,}명 × {months_ahead}개월 계산 "
+          f"(블록 {len(blocks)}개, 블록당 최대 {block_size:,}명)")
+
+    jobs = [(_slice_inputs(inputs, start, stop), codes[start:stop], overrides_list, months_ahead, return_customers)
+            for start, stop in blocks]
+
+    if len(jobs) > 1 and max_workers != 1:
+        workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_evaluate_block, *zip(*jobs)))
+    else:
+        results = [_evaluate_block(*job) for job in jobs]
+
+    totals = np.zeros((n_scenarios, months_ahead))
+    for block_totals, _ in results:
+        totals += block_totals
+
+    totals_df = pd.DataFrame(totals, index=pd.Index(names, name='scenario'), columns=forecast_columns)
+    totals_df['total'] = totals_df[forecast_columns].sum(axis=1)
+
+    print(f"✅ 시나리오 계산 완료 ({time.time() - start_time:.1f}초)")
+
+    if return_customers:
+        customers = np.concatenate([amounts for _, amounts in results], axis=1) if results else \
+            np.zeros((n_scenarios, 0, months_ahead))
+        return totals_df, customers
+    return totals_df
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+키워드 + 벡터 하이브리드 검색
+저장된 청크로 BM25 역색인(bm25_index.json)을 만들고, 벡터 검색 결과와 순위 융합(RRF)으로 합칩니다.
+한국어는 형태소 분석 대신 한글 연속 구간의 글자 2-gram으로, 영문/코드 식별자는 단어 단위로 색인하여
+조사가 붙은 질의("파일 업로드는")도 본문("파일 업로드")과 맞습니다.
+키워드/벡터/하이브리드 경로별 검색 지연 시간과 recall@k를 비교하는 평가 함수를 제공합니다.
+"""
+
+import re
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BM25_INDEX_FILE = 'bm25_index.json'
+BM25_K1 = 1.2  # 단어 빈도 포화 정도
+BM25_B = 0.75  # 청크 길이 정규화 정도
+
+RRF_K = 60  # 순위 융합 상수 (클수록 하위 순위도 반영)
+HYBRID_CANDIDATES = 20  # 경로별로 가져와 융합할 후보 수
+
+# 한글 연속 구간 / 영문·숫자 단어 (camelCase 식별자는 소문자로 통일)
+TOKEN_PATTERN = re.compile(r'[가-힣]+|[a-z0-9_]+')
+
+def tokenize(text: str) -> List[str]:
+    """
+    색인/질의 토큰 (한글: 글자 2-gram, 한 글자 단어는 그대로 / 영문·숫자: 단어)
+
+    Args:
+        text (str): 원문
+
+    Returns:
+        List[str]: 토큰 리스트 (중복 포함)
+    """
+    tokens = []
+    for word in TOKEN_PATTERN.findall(text.lower()):
+        if '가' <= word[0] <= '힣':
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+def chunks_signature(chunks: List[tuple]) -> str:
+    """청크 목록 (id, filename, chunk_index, chunk_text) 식별값 (바뀌면 색인을 다시 만듦)"""
+    digest = hashlib.sha256()
+    for chunk_id, filename, chunk_index, chunk_text in chunks:
+        digest.update(f"{chunk_id}\0{filename}\0{chunk_index}\0".encode('utf-8'))
+        digest.update(hashlib.md5(chunk_text.encode('utf-8')).digest())
+    return digest.hexdigest()
+
+class BM25Index:
+    """
+    청크 BM25 역색인 (토큰 → [(청크 위치, 빈도)])
+    """
+
+    def __init__(self, doc_ids: List[int], doc_lengths: List[int], postings: Dict[str, List[List[int]]],
+                 signature: str = '', k1: float = BM25_K1, b: float = BM25_B):
+        """
+        Args:
+            doc_ids (List[int]): 청크 위치 → 청크 id
+            doc_lengths (List[int]): 청크별 토큰 수
+            postings (Dict[str, List[List[int]]]): 토큰 → [[청크 위치, 빈도], ...]
+            signature (str): 색인한 청크 목록 식별값
+            k1 (float): BM25 k1
+            b (float): BM25 b
+        """
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        self.doc_lengths = np.asarray(doc_lengths, dtype=np.float32)
+        self.signature = signature
+        self.k1 = k1
+        self.b = b
+        self.postings = postings
+        self._arrays = {}
+
+        n_docs = len(doc_ids)
+        avg_length = float(self.doc_lengths.mean()) if n_docs else 0.0
+        # 청크별 길이 정규화 항 k1 * (1 - b + b * 길이 / 평균 길이)는 질의와 무관하므로 미리 계산
+        self._length_norm = k1 * (1 - b + b * self.doc_lengths / max(avg_length, 1e-9))
+        self._n_docs = n_docs
+
+    @classmethod
+    def build(cls, chunks: List[tuple], k1: float = BM25_K1, b: float = BM25_B) -> 'BM25Index':
+        """
+        청크 목록으로 색인 생성
+
+        Args:
+            chunks (List[tuple]): [(id, filename, chunk_index, chunk_text)]
+
+        Returns:
+            BM25Index: 색인
+        """
+        postings = {}
+        doc_ids, doc_lengths = [], []
+        for position, (chunk_id, _, _, chunk_text) in enumerate(chunks):
+            tokens = tokenize(chunk_text)
+            doc_ids.append(int(chunk_id))
+            doc_lengths.append(len(tokens))
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                postings.setdefault(token, []).append([position, count])
+        return cls(doc_ids, doc_lengths, postings, chunks_signature(chunks), k1, b)
+
+    def save(self, path: str = BM25_INDEX_FILE):
+        """JSON 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        data = {
+            'signature': self.signature,
+            'k1': self.k1,
+            'b': self.b,
+            'doc_ids': self.doc_ids.tolist(),
+            'doc_lengths': self.doc_lengths.astype(int).tolist(),
+            'postings': self.postings
+        }
+        temp_path = Path(f"{path}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        temp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str = BM25_INDEX_FILE) -> 'BM25Index':
+        """저장된 색인 불러오기"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['doc_ids'], data['doc_lengths'], data['postings'], data['signature'], data['k1'], data['b'])
+
+    def _posting_arrays(self, token: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """토큰의 (청크 위치 배열, 빈도 배열) (처음 조회할 때 변환 후 보관)"""
+        if token not in self._arrays:
+            entries = self.postings.get(token)
+            if entries is None:
+                self._arrays[token] = None
+            else:
+                entries = np.asarray(entries, dtype=np.int64)
+                self._arrays[token] = (entries[:, 0], entries[:, 1].astype(np.float32))
+        return self._arrays[token]
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """
+        BM25 점수 상위 청크
+
+        Args:
+            query (str): 질의
+            limit (int): 최대 결과 수
+
+        Returns:
+            List[Tuple[int, float]]: [(청크 id, 점수)] 점수 내림차순 (점수 0인 청크 제외)
+        """
+        scores = np.zeros(self._n_docs, dtype=np.float32)
+        for token in set(tokenize(query)):
+            arrays = self._posting_arrays(token)
+            if arrays is None:
+                continue
+            positions, frequencies = arrays
+            idf = np.log(1 + (self._n_docs - len(positions) + 0.5) / (len(positions) + 0.5))
+            scores[positions] += idf * frequencies * (self.k1 + 1) / (frequencies + self._length_norm[positions])
+
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+        matched = matched[np.argsort(-scores[matched], kind='stable')]
+        return [(int(self.doc_ids[position]), float(scores[position])) for position in matched]
+
+def reciprocal_rank_fusion(rankings: List[List[int]], rrf_k: int = RRF_K,
+                           weights: Optional[List[float]] = None) -> List[Tuple[int, float]]:
+    """
+    순위 융합 (RRF: 각 순위 목록에서 weight / (rrf_k + 순위)를 더함)
+
+    점수 척도가 다른 BM25 점수와 코사인 유사도를 정규화 없이 합칠 수 있습니다.
+
+    Args:
+        rankings (List[List[int]]): 경로별 청크 id 순위 목록
+        rrf_k (int): 융합 상수
+        weights (List[float]): 경로별 가중치 (기본: 모두 1)
+
+    Returns:
+        List[Tuple[int, float]]: [(청크 id, 융합 점수)] 점수 내림차순
+    """
+    weights = weights or [1.0] * len(rankings)
+    fused = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, chunk_id in enumerate(ranking, 1):
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + weight / (rrf_k + rank)
+    return sorted(fused.items(), key=lambda item: -item[1])
+
+class HybridRetriever:
+    """
+    BM25 키워드 검색 + 벡터 검색 융합 검색기 (VectorDatabase / LocalVectorStore 공통)
+    """
+
+    def __init__(self, vector_db, embed_query: Optional[Callable] = None, index_path: str = BM25_INDEX_FILE,
+                 rrf_k: int = RRF_K, keyword_weight: float = 1.0, vector_weight: float = 1.0):
+        """
+        Args:
+            vector_db (VectorDatabase | LocalVectorStore): 연결된 벡터 저장소
+            embed_query (Callable): 질의 → 임베딩 함수 (기본: document_embedder.generate_embedding)
+            index_path (str): BM25 색인 파일 경로
+            rrf_k (int): 순위 융합 상수
+            keyword_weight (float): 키워드 순위 가중치
+            vector_weight (float): 벡터 순위 가중치
+        """
+        if embed_query is None:
+            from document_embedder import generate_embedding
+            embed_query = generate_embedding
+
+        self.vector_db = vector_db
+        self.embed_query = embed_query
+        self.index_path = index_path
+        self.rrf_k = rrf_k
+        self.weights = [keyword_weight, vector_weight]
+        self.index = None
+        self.chunks = {}
+
+    def refresh(self, verbose: bool = True) -> BM25Index:
+        """
+        저장소 청크와 BM25 색인 맞추기 (색인 파일이 같은 청크 목록이면 불러오고, 아니면 다시 생성)
+
+        문서를 다시 적재한 뒤 호출합니다.
+        """
+        chunks = self.vector_db.chunks()
+        signature = chunks_signature(chunks)
+        self.chunks = {chunk_id: (filename, chunk_index, chunk_text)
+                       for chunk_id, filename, chunk_index, chunk_text in chunks}
+
+        if Path(self.index_path).exists():
+            index = BM25Index.load(self.index_path)
+            if index.signature == signature:
+                self.index = index
+                if verbose:
+                    print(f"📂 BM25 색인 불러오기: {self.index_path} ({len(index.doc_ids):,}개 청크, "
+                          f"{len(index.postings):,}개 토큰)")
+                return self.index
+
+        start_time = time.time()
+        self.index = BM25Index.build(chunks)
+        self.index.save(self.index_path)
+        if verbose:
+            print(f"✅ BM25 색인 생성: {len(chunks):,}개 청크, {len(self.index.postings):,}개 토큰 "
+                  f"({time.time() - start_time:.2f}초) → {self.index_path}")
+        return self.index
+
+    def _chunk(self, chunk_id: int) -> Dict:
+        filename, chunk_index, chunk_text = self.chunks[chunk_id]
+        return {'id': chunk_id, 'filename': filename, 'chunk_index': chunk_index, 'chunk_text': chunk_text}
+
+    def keyword_search(self, query: str, limit: int = 5) -> List[Dict]:
+        """BM25 키워드 검색 (결과에 bm25 점수 포함)"""
+        if self.index is None:
+            self.refresh()
+        return [dict(self._chunk(chunk_id), bm25=score) for chunk_id, score in self.index.search(query, limit)]
+
+    def vector_search(self, query: str, limit: int = 5, query_embedding=None) -> List[Dict]:
+        """벡터 검색 (임계값 없이 상위 limit개)"""
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
+            if query_embedding is None:
+                return []
+        return self.vector_db.search(query_embedding, limit=limit, similarity_threshold=-1.0)
+
+    def search(self, query: str, limit: int = 5, candidates: int = HYBRID_CANDIDATES,
+               query_embedding=None) -> List[Dict]:
+        """
+        하이브리드 검색 (키워드/벡터 각각 candidates개 → RRF 융합 → 상위 limit개)
+
+        Args:
+            query (str): 질의
+            limit (int): 반환할 최대 결과 수
+            candidates (int): 경로별 후보 수
+            query_embedding (List[float]): 미리 계산한 질의 임베딩 (없으면 embed_query로 생성)
+
+        Returns:
+            List[Dict]: 청크 리스트 (rrf 점수, 있으면 similarity / bm25와 경로별 순위 포함)
+        """
+        keyword_hits = self.keyword_search(query, candidates)
+        vector_hits = self.vector_search(query, candidates, query_embedding)
+
+        details = {}
+        for rank, hit in enumerate(keyword_hits, 1):
+            details.setdefault(hit['id'], dict(hit, similarity=None))['keyword_rank'] = rank
+        for rank, hit in enumerate(vector_hits, 1):
+            entry = details.setdefault(hit['id'], dict(hit, bm25=None))
+            entry['similarity'] = hit['similarity']
+            entry['vector_rank'] = rank
+
+        fused = reciprocal_rank_fusion([[hit['id'] for hit in keyword_hits], [hit['id'] for hit in vector_hits]],
+                                       self.rrf_k, self.weights)
+        return [dict(details[chunk_id], rrf=score) for chunk_id, score in fused[:limit]]
+
+def relevant_chunks_by_keywords(chunks: List[tuple], keywords: List[str]) -> set:
+    """
+    평가용 정답 청크: 키워드 중 하나라도 본문에 있는 청크 id (대소문자 무시)
+
+    Args:
+        chunks (List[tuple]): [(id, filename, chunk_index, chunk_text)]
+        keywords (List[str]): 정답 판정 키워드
+
+    Returns:
+        set: 정답 청크 id 집합
+    """
+    keywords = [keyword.lower() for keyword in keywords]
+    return {chunk_id for chunk_id, _, _, chunk_text in chunks
+            if any(keyword in chunk_text.lower() for keyword in keywords)}
+
+def evaluate_retrieval(retriever: HybridRetriever, labeled_queries: List[Tuple[str, set]],
+                       k: int = 5) -> pd.DataFrame:
+    """
+    키워드 / 벡터 / 하이브리드 경로별 검색 지연 시간과 recall@k
+
+    질의 임베딩은 미리 한 번만 생성하여, 지연 시간은 검색 자체만 측정합니다.
+
+    Args:
+        retriever (HybridRetriever): 검색기
+        labeled_queries (List[Tuple[str, set]]): [(질의, 정답 청크 id 집합)]
+        k (int): 평가할 결과 수
+
+    Returns:
+        pd.DataFrame: 경로별 평균/p50/p95 지연 시간(ms)과 평균 recall@k
+    """
+    if retriever.index is None:
+        retriever.refresh()
+    embeddings = [retriever.embed_query(query) for query, _ in labeled_queries]
+
+    paths = {
+        '키워드 (BM25)': lambda query, embedding: retriever.keyword_search(query, k),
+        '벡터': lambda query, embedding: retriever.vector_search(query, k, embedding),
+        '하이브리드 (RRF)': lambda query, embedding: retriever.search(query, k, query_embedding=embedding)
+    }
+
+    rows = []
+    for name, run in paths.items():
+        times, recalls = [], []
+        for (query, relevant), embedding in zip(labeled_queries, embeddings):
+            start = time.perf_counter()
+            hits = run(query, embedding)
+            times.append((time.perf_counter() - start) * 1000)
+            found = {hit['id'] for hit in hits[:k]}
+            # 정답이 k개보다 많으면 k개를 모두 맞혔을 때 1
+            recalls.append(len(found & relevant) / min(len(relevant), k) if relevant else 1.0)
+        rows.append({
+            '검색': name,
+            '평균(ms)': np.mean(times),
+            'p50(ms)': np.percentile(times, 50),
+            'p95(ms)': np.percentile(times, 95),
+            f'recall@{k}': np.mean(recalls)
+        })
+    return pd.DataFrame(rows)
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='로컬 벡터 저장소 청크의 BM25 키워드 검색')
+    parser.add_argument('query', help='검색 질의')
+    parser.add_argument('--root', default='vector_store', help='로컬 벡터 저장소 폴더')
+    parser.add_argument('--index', default=BM25_INDEX_FILE, help='BM25 색인 파일')
+    parser.add_argument('--k', type=int, default=5, help='검색 결과 수')
+    args = parser.parse_args()
+
+    from local_vector_store import LocalVectorStore
+    store = LocalVectorStore(args.root)
+    if not store.metadata_path.exists():
+        print(f"❌ {args.root} 저장소가 없습니다")
+        return
+    store.connect()
+
+    retriever = HybridRetriever(store, embed_query=lambda query: None, index_path=args.index)
+    retriever.refresh()
+    start = time.perf_counter()
+    hits = retriever.keyword_search(args.query, args.k)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"\n🔤 '{args.query}' BM25 검색 결과 ({elapsed:.2f}ms, 토큰: {' '.join(tokenize(args.query))})")
+    for i, hit in enumerate(hits, 1):
+        print(f"{i}. {hit['filename']} (청크 {hit['chunk_index']}, BM25: {hit['bm25']:.3f})")
+        print(f"   📝 {hit['chunk_text'][:100]}...")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+값 기반 조인 키 탐색 프로그램
+각 CSV 컬럼의 고유값 집합을 MinHash 서명으로 요약하고, LSH 색인으로
+값이 많이 겹치는 컬럼 쌍(조인 키 후보)을 파일 간에 찾습니다.
+컬럼명이 달라도(예: 개통요금제코드 ↔ MVNO상품코드 ↔ 요금제코드) 값이 같으면 찾을 수 있습니다.
+"""
+
+import pandas as pd
+import os
+import glob
+from pathlib import Path
+
+from csv_analyzer import get_encoding_candidates
+from minhash import MinHashSignature, MinHashLSH, LSH_PARTITIONS, MAX_BUCKET_SIZE, MAX_CANDIDATES
+
+def normalize_values(series):
+    """
+    컬럼 값을 비교 가능한 문자열로 정규화 (결측값 제거, 공백 제거, 정수형 실수의 '.0' 제거)
+
+    Args:
+        series (pd.Series): 문자열로 읽은 컬럼
+
+    Returns:
+        np.ndarray: 정규화된 고유 문자열 배열
+    """
+    values = series.dropna().astype(str).str.strip()
+    values = values[values != ''].str.replace(r'\.0+$', '', regex=True)
+    return values.unique()
+
+class JoinKeyFinder:
+    """
+    CSV 파일들의 컬럼별 MinHash 서명을 만들고 값 겹침이 큰 컬럼 쌍을 찾는 도구
+    """
+
+    def __init__(self, csv_folder='csv', num_perm=256, num_partitions=LSH_PARTITIONS, max_bucket_size=MAX_BUCKET_SIZE,
+                 max_candidates=MAX_CANDIDATES, min_distinct=10, chunksize=100000):
+        """
+        Args:
+            csv_folder (str): CSV 파일들이 있는 폴더 경로
+            num_perm (int): MinHash 순열 개수
+            num_partitions (int): LSH 고유값 개수 구간 수
+            max_bucket_size (int): 후보 생성에 쓸 LSH 버킷의 최대 컬럼 수
+            max_candidates (int): 컬럼 하나의 최대 후보 컬럼 수
+            min_distinct (int): 이보다 고유값이 적은 컬럼(Y/N 플래그 등)은 제외
+            chunksize (int): CSV를 읽을 청크 행 수
+        """
+        self.csv_folder = csv_folder
+        self.num_perm = num_perm
+        self.num_partitions = num_partitions
+        self.max_bucket_size = max_bucket_size
+        self.max_candidates = max_candidates
+        self.min_distinct = min_distinct
+        self.chunksize = chunksize
+        self.signatures = {}  # (파일명, 컬럼명) -> MinHashSignature
+        self.row_counts = {}  # 파일명 -> 행 수
+
+    def build_signatures(self, file_paths=None):
+        """
+        CSV 파일을 청크 단위로 한 번씩 읽어 컬럼별 MinHash 서명 생성
+
+        Args:
+            file_paths (list): 대상 CSV 경로 목록 (기본: csv_folder의 모든 CSV)
+        """
+        if file_paths is None:
+            file_paths = glob.glob(os.path.join(self.csv_folder, '*.csv'))
+
+        if not file_paths:
+            print(f"❌ {self.csv_folder} 폴더에 CSV 파일이 없습니다.")
+            return
+
+        for file_path in file_paths:
+            file_name = Path(file_path).name
+
+            for encoding in get_encoding_candidates(file_name):
+                try:
+                    signatures = {}
+                    row_count = 0
+                    for chunk in pd.read_csv(file_path, encoding=encoding, dtype=str, chunksize=self.chunksize):
+                        row_count += len(chunk)
+                        for col in chunk.columns:
+                            if col not in signatures:
+                                signatures[col] = MinHashSignature(self.num_perm)
+                            signatures[col].update(normalize_values(chunk[col]))
+                    break
+                except UnicodeDecodeError:
+                    continue
+            else:
+                print(f"❌ {file_name} 로드 실패 - 인코딩 문제")
+                continue
+
+            self.row_counts[file_name] = row_count
+            for col, signature in signatures.items():
+                if signature.updated and signature.estimate_cardinality() >= self.min_distinct:
+                    self.signatures[(file_name, col)] = signature
+
+            print(f"✅ {file_name}: {row_count:,}행, 서명 생성 컬럼 {sum(1 for key in self.signatures if key[0] == file_name)}개")
+
+    def find_join_keys(self, min_jaccard=0.03, min_containment=0.2):
+        """
+        LSH 후보 쌍 중 값 겹침이 큰 파일 간 컬럼 쌍 찾기
+
+        Args:
+            min_jaccard (float): 최소 Jaccard 유사도 (256개 순열 기준 추정 표준오차 약 0.02)
+            min_containment (float): 최소 포함도 (작은 쪽 집합이 큰 쪽에 포함되는 비율)
+
+        Returns:
+            list: 조인 키 후보 딕셔너리 리스트 (포함도 내림차순)
+        """
+        lsh = MinHashLSH(self.num_perm, self.num_partitions, self.max_bucket_size, self.max_candidates)
+        for key, signature in self.signatures.items():
+            lsh.insert(key, signature.signature, signature.estimate_cardinality())
+
+        # 컬럼마다 색인에 질의하여 후보 쌍 수집 (같은 파일 내 컬럼 쌍은 조인 키가 아님)
+        pairs = set()
+        for key, signature in self.signatures.items():
+            for other in lsh.query(signature.signature, signature.estimate_cardinality(), min_containment, min_jaccard):
+                if other[0] != key[0]:
+                    pairs.add((min(key, other), max(key, other)))
+        if lsh.skipped_buckets or lsh.truncated_queries:
+            print(f"⚠️ 여러 컬럼이 공유하는 값(코드/날짜 등): 큰 LSH 버킷 조회 {lsh.skipped_buckets:,}회 건너뜀, "
+                  f"후보가 {self.max_candidates}개를 넘은 컬럼 {lsh.truncated_queries:,}개는 상위 후보만 비교")
+
+        results = []
+        for key_a, key_b in sorted(pairs):
+
+            sig_a, sig_b = self.signatures[key_a], self.signatures[key_b]
+            jaccard = sig_a.jaccard(sig_b)
+            distinct_a = sig_a.estimate_cardinality()
+            distinct_b = sig_b.estimate_cardinality()
+
+            # |A∩B| = J / (1 + J) × (|A| + |B|)
+            common = jaccard / (1 + jaccard) * (distinct_a + distinct_b)
+            containment_a = min(1.0, common / distinct_a)
+            containment_b = min(1.0, common / distinct_b)
+
+            # 숫자 금액 컬럼처럼 값 범위만 우연히 겹치는 쌍은 Jaccard가 매우 낮으므로 둘 다 만족해야 함
+            if jaccard < min_jaccard or max(containment_a, containment_b) < min_containment:
+                continue
+
+            # 균등분포 가정의 조인 선택도: |R⋈S| / (|R|·|S|) ≈ |A∩B| / (|A|·|B|)
+            selectivity = common / (distinct_a * distinct_b)
+
+            if key_a > key_b:
+                key_a, key_b = key_b, key_a
+                distinct_a, distinct_b = distinct_b, distinct_a
+                containment_a, containment_b = containment_b, containment_a
+
+            results.append({
+                'file_a': key_a[0],
+                'column_a': key_a[1],
+                'file_b': key_b[0],
+                'column_b': key_b[1],
+                'jaccard': jaccard,
+                'containment_a': containment_a,
+                'containment_b': containment_b,
+                'distinct_a': distinct_a,
+                'distinct_b': distinct_b,
+                'common_values': common,
+                'join_selectivity': selectivity,
+                'estimated_join_rows': selectivity * self.row_counts.get(key_a[0], 0) * self.row_counts.get(key_b[0], 0)
+            })
+
+        results.sort(key=lambda x: (-max(x['containment_a'], x['containment_b']), -x['jaccard']))
+        return results
+
+def main():
+    """메인 실행 함수"""
+    print("🔗 값 기반 조인 키 탐색 프로그램 시작")
+    print("=" * 60)
+
+    finder = JoinKeyFinder()
+    finder.build_signatures()
+    results = finder.find_join_keys()
+
+    print(f"\n✅ 조인 키 후보: {len(results)}개")
+    for result in results:
+        print(f"  - {result['file_a']}.{result['column_a']} ↔ {result['file_b']}.{result['column_b']} "
+              f"(Jaccard {result['jaccard']:.2f}, 포함도 {result['containment_a']:.2f}/{result['containment_b']:.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 벡터 저장소
+PostgreSQL + pgvector 없이 같은 인터페이스(connect, setup_tables, insert, search, stats)로 쓰는 파일 기반 벡터 저장소입니다.
+임베딩은 L2 정규화한 float32 행렬 파일(vectors.f32)을 메모리 맵으로 열고, 청크 정보는 metadata.json 스냅샷과
+추가 전용 변경 로그(changes.jsonl)에 저장하며,
+검색은 행렬 블록 단위 내적(코사인 유사도)으로 정확한 상위 k개를 구합니다.
+quantization='sq8' | 'pq'이면 압축 코드(quantizer.npz)로 후보를 고르고 후보만 float32 벡터로 다시 점수를 매깁니다.
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from document_embedder import EMBEDDING_MODEL, EMBEDDING_DIMENSION
+from vector_quantization import (QUANTIZER_FILE, RERANK_CANDIDATES, PQ_SUBVECTORS, SEARCH_BLOCK_ROWS,
+                                 make_quantizer, save_quantizer, load_quantizer, top_k)
+
+VECTORS_FILE = 'vectors.f32'
+METADATA_FILE = 'metadata.json'
+CHANGES_FILE = 'changes.jsonl'
+# 변경 로그가 이 크기와 스냅샷 크기를 모두 넘으면 스냅샷으로 합침 (전체 재작성 비용을 추가한 양에 비례하게 분산)
+COMPACT_MIN_BYTES = 1 << 20
+
+def _vectors_file(generation: int) -> str:
+    """세대별 벡터 파일 이름 (0세대는 vectors.f32, 삭제/초기화할 때마다 다음 세대)"""
+    return VECTORS_FILE if generation == 0 else f'{Path(VECTORS_FILE).stem}.{generation}{Path(VECTORS_FILE).suffix}'
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """행별 L2 정규화 (영벡터는 그대로)"""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+class LocalVectorStore:
+    """
+    VectorDatabase와 같은 인터페이스의 파일 기반 벡터 저장소 (서버 불필요)
+    """
+
+    def __init__(self, root: str = 'vector_store', embedding_dim: int = EMBEDDING_DIMENSION,
+                 embedding_model: str = EMBEDDING_MODEL, quantization: Optional[str] = None,
+                 rerank_candidates: int = RERANK_CANDIDATES, pq_subvectors: int = PQ_SUBVECTORS):
+        """
+        Args:
+            root (str): 저장소 폴더
+            embedding_dim (int): 임베딩 차원수
+            embedding_model (str): 임베딩 모델 이름
+            quantization (str): 검색용 압축 코드 ('sq8' | 'pq', None이면 float32 정확 검색)
+            rerank_candidates (int): 압축 코드로 고른 뒤 float32로 다시 점수를 매길 후보 수
+            pq_subvectors (int): 곱 양자화 부분 공간 수 (임베딩 차원의 약수)
+        """
+        if quantization is not None:
+            make_quantizer(quantization, pq_subvectors)  # 지원하지 않는 방식이면 여기서 ValueError
+        self.root = Path(root)
+        self.embedding_dim = embedding_dim
+        self.embedding_model = embedding_model
+        self.quantization = quantization
+        self.rerank_candidates = rerank_candidates
+        self.pq_subvectors = pq_subvectors
+        self.index_type = quantization or 'exact'
+        # 노트북의 `if vector_db.conn:` 확인과 맞추기 위해 연결 후에는 저장소 폴더 경로를 보관
+        self.conn = None
+        self._meta = None
+        self._sequence = 0
+        self._log_bytes = 0
+        self._snapshot_bytes = 0
+        self._vectors = None
+        self._quantizer = None
+        self._codes = None
+        self._trained_rows = 0
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.root / (self._meta['vectors_file'] if self._meta else VECTORS_FILE)
+
+    @property
+    def metadata_path(self) -> Path:
+        return self.root / METADATA_FILE
+
+    @property
+    def changes_path(self) -> Path:
+        return self.root / CHANGES_FILE
+
+    @property
+    def quantizer_path(self) -> Path:
+        return self.root / QUANTIZER_FILE
+
+    def connect(self) -> bool:
+        """저장소 폴더 열기 (없으면 생성)"""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self.conn = self.root
+            if self.metadata_path.exists():
+                self._load()
+            print(f"✅ 로컬 벡터 저장소 연결 성공: {self.root}")
+            return True
+        except Exception as e:
+            print(f"❌ 로컬 벡터 저장소 연결 실패: {e}")
+            return False
+
+    def create_database_if_not_exists(self):
+        """PostgreSQL과 같은 호출 순서를 위한 자리 (저장소 폴더는 connect에서 생성)"""
+        print(f"ℹ️  로컬 벡터 저장소 사용: {self.root}")
+
+    def setup_tables(self) -> bool:
+        """빈 저장소 초기화 (이미 있으면 차원 확인)"""
+        if not self.conn:
+            print("❌ 저장소 연결이 필요합니다")
+            return False
+
+        if self._meta is None:
+            self._meta = {
+                'dimension': self.embedding_dim,
+                'model': self.embedding_model,
+                'next_id': 1,
+                'count': 0,
+                'rows': [],
+                'files': {},
+                'generation': 0,
+                'vectors_file': VECTORS_FILE,
+                'sequence': 0
+            }
+            self._sequence = 0
+            open(self.vectors_path, 'wb').close()
+            self._save()
+        elif self._meta['dimension'] != self.embedding_dim:
+            print(f"❌ 저장소 임베딩 차원({self._meta['dimension']})과 설정({self.embedding_dim})이 다릅니다. "
+                  f"clear() 후 다시 적재하세요")
+            return False
+
+        print(f"✅ 로컬 벡터 저장소 설정 완료 ({self._meta['count']:,}개 청크)")
+        return True
+
+    def _load(self):
+        with open(self.metadata_path, 'r', encoding='utf-8') as f:
+            self._meta = json.load(f)
+        self._snapshot_bytes = self.metadata_path.stat().st_size
+        self._replay_changes()
+        self._open_vectors()
+        if self.quantization and self.quantizer_path.exists():
+            quantizer, codes, trained_rows = load_quantizer(self.quantizer_path)
+            # 다른 방식/설정으로 만든 코드는 ensure_index()에서 다시 만듦
+            if quantizer.kind == self.quantization and quantizer.code_bytes(self.embedding_dim) == \
+                    make_quantizer(self.quantization, self.pq_subvectors).code_bytes(self.embedding_dim):
+                self._quantizer, self._codes, self._trained_rows = quantizer, codes, trained_rows
+
+    def _open_vectors(self):
+        """메모리 맵 다시 열기 (파일 끝의 기록 중단된 벡터는 count 밖이라 무시)"""
+        count = self._meta['count']
+        if count == 0:
+            self._vectors = np.zeros((0, self._meta['dimension']), dtype=np.float32)
+        else:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                      shape=(count, self._meta['dimension']))
+
+    def _replay_changes(self):
+        """스냅샷 이후의 변경 로그 항목 반영 (기록이 중단된 마지막 줄은 잘라냄)"""
+        self._sequence = self._meta['sequence']
+        self._log_bytes = 0
+        if not self.changes_path.exists():
+            return
+        with open(self.changes_path, 'rb') as f:
+            data = f.read()
+
+        valid_bytes = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                break
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            valid_bytes += len(line)
+            # 스냅샷을 저장한 뒤 로그를 비우기 전에 중단되었으면 이미 반영된 항목이 남아 있음
+            if entry['sequence'] > self._sequence:
+                self._apply(entry)
+
+        if valid_bytes < len(data):
+            with open(self.changes_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        self._log_bytes = valid_bytes
+
+    def _apply(self, entry: Dict):
+        """변경 로그 항목 하나를 메모리의 메타데이터에 반영"""
+        if entry['op'] == 'insert':
+            self._meta['rows'].extend(entry['rows'])
+            self._meta['next_id'] = entry['rows'][-1]['id'] + 1
+            self._meta['count'] += len(entry['rows'])
+        elif entry['op'] == 'update':
+            by_id = {row['id']: row for row in self._meta['rows']}
+            for row_id, chunk_index, metadata in entry['rows']:
+                by_id[row_id]['chunk_index'] = chunk_index
+                by_id[row_id]['metadata'] = metadata
+        self._meta['files'].update(entry['files'])
+        self._sequence = entry['sequence']
+
+    def _commit(self, entry: Dict):
+        """
+        변경 한 건을 로그 끝에 추가한 뒤 반영 (metadata.json 전체를 다시 쓰지 않음)
+
+        로그가 스냅샷보다 커지면 스냅샷으로 합치므로 전체 재작성 비용은 추가한 양에 비례합니다.
+        """
+        entry['sequence'] = self._sequence + 1
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        with open(self.changes_path, 'ab') as f:
+            f.write(line)
+        self._log_bytes += len(line)
+        self._apply(entry)
+
+        if self._log_bytes > max(self._snapshot_bytes, COMPACT_MIN_BYTES):
+            self._save()
+        else:
+            self._open_vectors()
+
+    def _save(self):
+        """metadata.json 스냅샷 원자적 저장 후 변경 로그 비우기 (벡터 파일을 먼저 쓰고 count를 나중에 기록)"""
+        self._meta['sequence'] = self._sequence
+        temp_path = self.metadata_path.with_suffix('.json.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._meta, f, ensure_ascii=False)
+        os.replace(temp_path, self.metadata_path)
+        self._snapshot_bytes = self.metadata_path.stat().st_size
+        open(self.changes_path, 'wb').close()
+        self._log_bytes = 0
+        self._open_vectors()
+
+    def _rewrite_vectors(self, vectors: np.ndarray):
+        """
+        벡터를 다음 세대 파일에 쓰고 metadata.json 교체로 새 파일과 count를 함께 전환
+
+        교체 전에 중단되면 이전 세대 파일과 메타데이터가 그대로 남습니다 (메모리의 rows는 호출 전에 갱신).
+        """
+        old_path = self.vectors_path
+        generation = self._meta['generation'] + 1
+        vectors_file = _vectors_file(generation)
+        vectors.tofile(self.root / vectors_file)
+        self._vectors = None
+        self._meta.update({'count': len(vectors), 'generation': generation, 'vectors_file': vectors_file})
+        self._save()
+        old_path.unlink(missing_ok=True)
+
+    def _require_setup(self):
+        if self._meta is None:
+            raise RuntimeError("setup_tables()를 먼저 호출하세요")
+
+    def insert(self, rows: List[Dict]) -> int:
+        """
+        청크 행 저장
+
+        Args:
+            rows (List[Dict]): filename, content, chunk_index, chunk_text, embedding, metadata, content_hash
+
+        Returns:
+            int: 저장한 행 수
+        """
+        self._require_setup()
+        if not rows:
+            return 0
+
+        vectors = np.asarray([row['embedding'] for row in rows], dtype=np.float32)
+        if vectors.shape[1] != self._meta['dimension']:
+            raise ValueError(f"임베딩 차원이 맞지 않습니다 ({vectors.shape[1]} != {self._meta['dimension']})")
+
+        # 기록 중단에 대비해 count 위치부터 덮어씀
+        self._vectors = None
+        with open(self.vectors_path, 'r+b') as f:
+            f.seek(self._meta['count'] * self._meta['dimension'] * 4)
+            f.write(_normalize(vectors).tobytes())
+            f.truncate()
+
+        self._commit({
+            'op': 'insert',
+            'rows': [{
+                'id': self._meta['next_id'] + i,
+                'filename': row['filename'],
+                'chunk_index': row['chunk_index'],
+                'chunk_text': row['chunk_text'],
+                'metadata': row.get('metadata') or {},
+                'content_hash': row.get('content_hash')
+            } for i, row in enumerate(rows)],
+            'files': {row['filename']: row['content'] for row in rows}
+        })
+        if self._quantized_ready(self._meta['count'] - len(rows)):
+            # 학습된 양자화기로 새 행만 인코딩해 코드 뒤에 붙임 (재학습은 ensure_index에서)
+            self._codes = np.concatenate([self._codes, self._quantizer.encode(_normalize(vectors))])
+            self._save_quantizer()
+        return len(rows)
+
+    def chunk_rows(self) -> List[tuple]:
+        """증분 색인용 기존 행 목록 [(id, filename, chunk_index, content_hash, 원문 md5)]"""
+        self._require_setup()
+        file_md5 = {filename: hashlib.md5(content.encode('utf-8')).hexdigest()
+                    for filename, content in self._meta['files'].items()}
+        return [(row['id'], row['filename'], row['chunk_index'], row['content_hash'], file_md5.get(row['filename']))
+                for row in self._meta['rows']]
+
+    def chunks(self) -> List[tuple]:
+        """저장된 청크 목록 [(id, filename, chunk_index, chunk_text)] (키워드 색인용)"""
+        self._require_setup()
+        return [(row['id'], row['filename'], row['chunk_index'], row['chunk_text']) for row in self._meta['rows']]
+
+    def embeddings_for(self, content_hashes: List[str]) -> Dict[str, np.ndarray]:
+        """청크 해시별 저장된 (정규화된) 임베딩 (없는 해시는 결과에 없음)"""
+        self._require_setup()
+        wanted = set(content_hashes)
+        found = {}
+        for position, row in enumerate(self._meta['rows']):
+            if row['content_hash'] in wanted and row['content_hash'] not in found:
+                found[row['content_hash']] = np.array(self._vectors[position])
+        return found
+
+    def update_chunks(self, updates: List[tuple]):
+        """청크 원문/번호/metadata 갱신 [(id, content, chunk_index, metadata)]"""
+        self._require_setup()
+        by_id = {row['id']: row for row in self._meta['rows']}
+        entry = {'op': 'update', 'rows': [], 'files': {}}
+        for row_id, content, chunk_index, metadata in updates:
+            row = by_id.get(row_id)
+            if row is None:
+                continue
+            entry['rows'].append([row_id, chunk_index, metadata])
+            entry['files'][row['filename']] = content
+        if entry['rows']:
+            self._commit(entry)
+
+    def delete(self, ids: List[int]):
+        """id 목록의 행 삭제 (남은 행의 벡터만 다음 세대 파일로 다시 씀)"""
+        self._require_setup()
+        ids = set(ids)
+        keep = [position for position, row in enumerate(self._meta['rows']) if row['id'] not in ids]
+        if len(keep) == len(self._meta['rows']):
+            return
+
+        kept_vectors = np.array(self._vectors[keep]) if keep else np.zeros((0, self._meta['dimension']), np.float32)
+        quantized = self._quantized_ready()
+
+        self._meta['rows'] = [self._meta['rows'][position] for position in keep]
+        remaining_files = {row['filename'] for row in self._meta['rows']}
+        self._meta['files'] = {filename: content for filename, content in self._meta['files'].items()
+                               if filename in remaining_files}
+        self._rewrite_vectors(kept_vectors)
+
+        # 코드 저장 전에 중단되면 코드 수가 count와 달라 ensure_index()에서 다시 만듦
+        if quantized:
+            self._codes = self._codes[keep]
+            self._save_quantizer()
+
+    def clear(self):
+        """모든 행 삭제"""
+        self._require_setup()
+        self._meta.update({'rows': [], 'files': {}})
+        self._rewrite_vectors(np.zeros((0, self._meta['dimension']), dtype=np.float32))
+        self._quantizer, self._codes, self._trained_rows = None, None, 0
+        self.quantizer_path.unlink(missing_ok=True)
+
+    def _quantized_ready(self, count: Optional[int] = None) -> bool:
+        """학습된 양자화 코드가 저장된 행 수(count)와 맞는지"""
+        count = self._meta['count'] if count is None else count
+        return self._quantizer is not None and self._codes is not None and len(self._codes) == count
+
+    def _save_quantizer(self):
+        save_quantizer(self.quantizer_path, self._quantizer, self._codes, self._trained_rows)
+
+    def ensure_index(self) -> bool:
+        """
+        양자화 코드 준비 (정확 검색이면 할 일 없음)
+
+        코드가 없거나 행 수와 맞지 않거나, 학습 이후 행 수가 2배를 넘게 늘면 전체 벡터로 다시 학습/인코딩합니다.
+
+        Returns:
+            bool: 성공 여부
+        """
+        self._require_setup()
+        if not self.quantization or self._meta['count'] == 0:
+            return True
+
+        count = self._meta['count']
+        if self._quantized_ready() and count <= 2 * max(self._trained_rows, 1):
+            return True
+
+        start_time = time.time()
+        vectors = np.asarray(self._vectors)
+        quantizer = make_quantizer(self.quantization, self.pq_subvectors).fit(vectors)
+        self._quantizer, self._codes, self._trained_rows = quantizer, quantizer.encode(vectors), count
+        self._save_quantizer()
+        print(f"✅ 양자화 코드 생성 완료: {self.index_definition()} ({time.time() - start_time:.1f}초)")
+        return True
+
+    def set_search_params(self, hnsw_ef_search: Optional[int] = None, ivfflat_probes: Optional[int] = None,
+                          rerank_candidates: Optional[int] = None):
+        """re-rank 후보 수 변경 (HNSW/IVFFlat 파라미터는 VectorDatabase와 같은 호출용으로 무시)"""
+        if rerank_candidates is not None:
+            self.rerank_candidates = rerank_candidates
+
+    def index_definition(self) -> str:
+        exact = f"float32 메모리 맵 {VECTORS_FILE}, 블록 내적 {SEARCH_BLOCK_ROWS:,}행"
+        if not self.quantization:
+            return f"exact ({exact})"
+        code_bytes = make_quantizer(self.quantization, self.pq_subvectors).code_bytes(self.embedding_dim)
+        state = "" if self._quantized_ready() else ", 코드 없음 - ensure_index() 전까지 정확 검색"
+        return (f"{self.quantization} (코드 {code_bytes}B/벡터, float32 대비 {self.embedding_dim * 4 / code_bytes:.0f}배 절감, "
+                f"후보 {self.rerank_candidates}개 float32 re-rank{state})")
+
+    def _rerank(self, queries: np.ndarray, candidates: np.ndarray, limit: int) -> tuple:
+        """양자화 코드로 고른 후보를 float32 벡터 내적으로 다시 정렬"""
+        positions, scores = [], []
+        for query, candidate_rows in zip(queries, candidates):
+            candidate_rows = np.sort(candidate_rows)  # 메모리 맵을 앞에서부터 읽도록
+            exact_scores = np.asarray(self._vectors[candidate_rows]) @ query
+            order = np.argsort(-exact_scores, kind='stable')[:limit]
+            positions.append(candidate_rows[order])
+            scores.append(exact_scores[order])
+        return positions, scores
+
+    def search_batch(self, query_embeddings, limit: int = 5, similarity_threshold: float = 0.0,
+                     exact: bool = False) -> List[List[Dict]]:
+        """
+        여러 질의를 행렬 곱 한 번으로 검색
+
+        Args:
+            query_embeddings (List[List[float]]): 질의 임베딩 리스트
+            limit (int): 질의별 최대 결과 수
+            similarity_threshold (float): 유사도 임계값 (0~1)
+            exact (bool): True면 양자화 코드 없이 float32 전체 스캔 (재현율 기준값)
+
+        Returns:
+            List[List[Dict]]: 질의별 유사도 내림차순 청크 리스트
+        """
+        self._require_setup()
+        queries = _normalize(np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)))
+        if not exact and self._quantized_ready():
+            candidates, _ = top_k(self._codes, queries, max(self.rerank_candidates, limit),
+                                  scorer=self._quantizer.scorer(queries))
+            positions, scores = self._rerank(queries, candidates, limit)
+        else:
+            positions, scores = top_k(self._vectors, queries, limit)
+
+        results = []
+        for query_positions, query_scores in zip(positions, scores):
+            hits = []
+            for position, score in zip(query_positions, query_scores):
+                if score <= similarity_threshold:
+                    break
+                row = self._meta['rows'][position]
+                hits.append({
+                    'id': row['id'],
+                    'filename': row['filename'],
+                    'chunk_index': row['chunk_index'],
+                    'chunk_text': row['chunk_text'],
+                    'metadata': row['metadata'],
+                    'similarity': float(score)
+                })
+            results.append(hits)
+        return results
+
+    def search(self, query_embedding, limit: int = 5, similarity_threshold: float = 0.0,
+               exact: bool = False) -> List[Dict]:
+        """
+        코사인 유사도 기준 최근접 청크 검색 (양자화 사용 시 후보 re-rank, 유사도는 항상 float32 기준)
+
+        Args:
+            query_embedding (List[float]): 질의 임베딩
+            limit (int): 반환할 최대 결과 수
+            similarity_threshold (float): 유사도 임계값 (0~1)
+            exact (bool): True면 양자화 코드 없이 float32 전체 스캔
+
+        Returns:
+            List[Dict]: 유사도 내림차순 청크 리스트
+        """
+        return self.search_batch([query_embedding], limit=limit, similarity_threshold=similarity_threshold,
+                                 exact=exact)[0]
+
+    def stats(self) -> Dict:
+        """
+        저장 현황 (파일 수, 청크 수, 파일별 청크 수/청크 길이, 검색 방식)
+
+        Returns:
+            Dict: 통계 정보 (file_stats: [(파일명, 청크 수, 평균/최대/최소 청크 길이)])
+        """
+        self._require_setup()
+        lengths = {}
+        for row in self._meta['rows']:
+            lengths.setdefault(row['filename'], []).append(len(row['chunk_text']))
+        file_stats = [(filename, len(values), float(np.mean(values)), max(values), min(values))
+                      for filename, values in sorted(lengths.items())]
+        return {
+            'total_files': len(file_stats),
+            'total_chunks': self._meta['count'],
+            'file_stats': file_stats,
+            'index': self.index_definition()
+        }
+
+    def sample_embeddings(self, n: int = 50, seed: int = 42) -> List[np.ndarray]:
+        """벤치마크 질의로 쓸 저장된 임베딩 표본 (같은 seed면 같은 표본)"""
+        self._require_setup()
+        count = self._meta['count']
+        positions = np.random.default_rng(seed).choice(count, size=min(n, count), replace=False)
+        return [np.array(self._vectors[position]) for position in positions]
+
+    def close(self):
+        """저장소 닫기"""
+        if self.conn:
+            self._vectors = None
+            self._codes = None
+            self.conn = None
+            print("🔒 로컬 벡터 저장소 닫기")
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='로컬 벡터 저장소 현황 및 검색 지연 시간 측정')
+    parser.add_argument('--root', default='vector_store', help='저장소 폴더')
+    parser.add_argument('--queries', type=int, default=100, help='측정 질의 수 (저장된 임베딩 표본)')
+    parser.add_argument('--k', type=int, default=5, help='검색 결과 수')
+    parser.add_argument('--quantization', choices=['sq8', 'pq'], default=None, help='검색용 압축 코드 (없으면 float32)')
+    parser.add_argument('--rerank', type=int, default=RERANK_CANDIDATES, help='float32로 다시 점수를 매길 후보 수')
+    args = parser.parse_args()
+
+    store = LocalVectorStore(args.root, quantization=args.quantization, rerank_candidates=args.rerank)
+    if not store.metadata_path.exists():
+        print(f"❌ {args.root} 저장소가 없습니다")
+        return
+    store.connect()
+    store.ensure_index()
+
+    stats = store.stats()
+    print(f"\n📊 {stats['total_files']}개 파일 / {stats['total_chunks']:,}개 청크 / {stats['index']}")
+    for filename, count, avg_length, _, _ in stats['file_stats']:
+        print(f"  - {filename}: {count}개 (평균 {avg_length:.0f}자)")
+
+    queries = store.sample_embeddings(args.queries)
+    if not queries:
+        return
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        store.search(query, limit=args.k)
+        times.append((time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    store.search_batch(queries, limit=args.k)
+    batch_ms = (time.perf_counter() - start) * 1000
+    print(f"\n⚡ 검색 지연 시간 (질의 {len(queries)}개, k={args.k}): "
+          f"p50 {np.percentile(times, 50):.3f}ms, p95 {np.percentile(times, 95):.3f}ms, "
+          f"배치 검색 질의당 {batch_ms / len(queries):.3f}ms")
+    if args.quantization:
+        recalls = []
+        for approx, expected in zip(store.search_batch(queries, limit=args.k),
+                                    store.search_batch(queries, limit=args.k, exact=True)):
+            expected_ids = {hit['id'] for hit in expected}
+            recalls.append(len(expected_ids & {hit['id'] for hit in approx}) / max(len(expected_ids), 1))
+        print(f"🎯 recall@{args.k} (float32 정확 검색 기준): {np.mean(recalls):.3f}")
+
+if __name__ == "__main__":
+    main()
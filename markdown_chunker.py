@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+마크다운 구조 기반 청킹
+문서를 한 번 앞으로 읽으면서 제목, 목록, 코드 블록, 문단 단위 블록으로 나누고,
+같은 절의 블록을 추정 토큰 수 한도까지 묶어 청크를 만듭니다.
+청크는 겹치지 않으며, 절 경계(## 제목)를 넘지 않고, 제목 경로를 메타데이터로 붙입니다.
+"""
+
+import re
+import math
+import argparse
+from dataclasses import dataclass, field
+from typing import List
+
+MAX_CHUNK_TOKENS = 400  # 청크 최대 추정 토큰 수
+MIN_CHUNK_TOKENS = 80  # 청크가 이보다 작으면 하위 절 제목에서 끊지 않고 이어 붙임
+SECTION_LEVEL = 2  # 이 수준 이하의 제목(#, ##)에서는 항상 청크를 나눔
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+LIST_PATTERN = re.compile(r'^\s*([-*+]|\d+[.)])\s+')
+
+def estimate_tokens(text: str) -> int:
+    """
+    추정 토큰 수 (ASCII는 4글자당 1토큰, 한글 등 비ASCII 글자는 글자당 1토큰)
+
+    Args:
+        text (str): 텍스트
+
+    Returns:
+        int: 추정 토큰 수
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+@dataclass
+class Block:
+    """구조 단위 블록 (제목 / 문단 / 목록 / 코드)"""
+    kind: str
+    text: str
+    heading_path: List[str]
+    level: int = 0  # 제목 블록의 수준 (#의 개수)
+    tokens: int = 0
+
+@dataclass
+class MarkdownChunk:
+    """청크 텍스트와 메타데이터"""
+    text: str
+    heading_path: List[str] = field(default_factory=list)
+    tokens: int = 0
+    start_line: int = 0  # 원문 시작 줄 (1부터)
+    end_line: int = 0
+
+def parse_blocks(text: str) -> List[tuple]:
+    """
+    한 번의 순방향 읽기로 블록 분할
+
+    Args:
+        text (str): 마크다운 원문
+
+    Returns:
+        List[tuple]: [(Block, 시작 줄, 끝 줄)]
+    """
+    blocks = []
+    headings = []  # [(수준, 제목)]
+    current, current_kind, start_line = [], None, 0
+    fence = None
+
+    def flush(end_line):
+        nonlocal current, current_kind
+        if current and any(line.strip() for line in current):
+            block_text = '\n'.join(current).strip('\n')
+            blocks.append((Block(current_kind, block_text, [title for _, title in headings],
+                                 tokens=estimate_tokens(block_text)), start_line, end_line))
+        current, current_kind = [], None
+
+    lines = text.split('\n')
+    for number, line in enumerate(lines, 1):
+        if fence:
+            current.append(line)
+            if FENCE_PATTERN.match(line) and line.strip().startswith(fence):
+                fence = None
+                flush(number)
+            continue
+
+        fence_match = FENCE_PATTERN.match(line)
+        if fence_match:
+            flush(number - 1)
+            fence = fence_match.group(1)
+            current, current_kind, start_line = [line], 'code', number
+            continue
+
+        heading_match = HEADING_PATTERN.match(line)
+        if heading_match:
+            flush(number - 1)
+            level, title = len(heading_match.group(1)), heading_match.group(2)
+            while headings and headings[-1][0] >= level:
+                headings.pop()
+            headings.append((level, title))
+            blocks.append((Block('heading', line, [title for _, title in headings], level=level,
+                                 tokens=estimate_tokens(line)), number, number))
+            continue
+
+        if not line.strip():
+            # 목록 안의 빈 줄은 목록 블록을 끊지 않음
+            if current_kind != 'list':
+                flush(number - 1)
+            continue
+
+        kind = 'list' if LIST_PATTERN.match(line) or (current_kind == 'list' and line.startswith((' ', '\t'))) else 'text'
+        if current_kind is not None and kind != current_kind:
+            flush(number - 1)
+        if not current:
+            start_line = number
+        current_kind = kind
+        current.append(line)
+
+    # 닫히지 않은 코드 블록도 마지막 블록으로 포함
+    flush(len(lines))
+    return blocks
+
+def _split_large_block(block: Block, start_line: int, max_tokens: int) -> List[tuple]:
+    """한도를 넘는 블록을 줄 경계에서 나눔 (한 줄이 한도를 넘으면 글자 단위로 나눔)"""
+    pieces = []
+    current, current_tokens, piece_start = [], 0, start_line
+    for offset, line in enumerate(block.text.split('\n')):
+        line_tokens = estimate_tokens(line) + 1
+        if current and current_tokens + line_tokens > max_tokens:
+            pieces.append(('\n'.join(current), piece_start, start_line + offset - 1))
+            current, current_tokens, piece_start = [], 0, start_line + offset
+        if line_tokens > max_tokens:
+            # 토큰 추정은 글자 수에 비례하므로 한도에 맞는 글자 수로 자름
+            step = max(1, len(line) * max_tokens // line_tokens)
+            for i in range(0, len(line), step):
+                pieces.append((line[i:i + step], start_line + offset, start_line + offset))
+            piece_start = start_line + offset + 1
+            continue
+        current.append(line)
+        current_tokens += line_tokens
+    if current:
+        pieces.append(('\n'.join(current), piece_start, start_line + len(block.text.split('\n')) - 1))
+    return [(Block(block.kind, text, block.heading_path, tokens=estimate_tokens(text)), first, last)
+            for text, first, last in pieces]
+
+def _subsection_tokens(blocks: List[tuple]) -> List[int]:
+    """제목 블록별 절 전체(다음 같은 수준 이상 제목 전까지)의 추정 토큰 수 (제목이 아닌 블록은 0)"""
+    sizes = [0] * len(blocks)
+    prefix = [0]
+    for block, _, _ in blocks:
+        prefix.append(prefix[-1] + block.tokens)
+
+    open_headings = []  # [(블록 위치, 수준)]
+    for position, (block, _, _) in enumerate(blocks):
+        if block.kind == 'heading':
+            while open_headings and open_headings[-1][1] >= block.level:
+                start, _ = open_headings.pop()
+                sizes[start] = prefix[position] - prefix[start]
+            open_headings.append((position, block.level))
+    for start, _ in open_headings:
+        sizes[start] = prefix[len(blocks)] - prefix[start]
+    return sizes
+
+def _common_path(paths: List[List[str]]) -> List[str]:
+    """제목 경로들의 공통 앞부분"""
+    common = list(paths[0])
+    for path in paths[1:]:
+        length = 0
+        while length < min(len(common), len(path)) and common[length] == path[length]:
+            length += 1
+        common = common[:length]
+    return common
+
+def chunk_markdown(text: str, max_tokens: int = MAX_CHUNK_TOKENS, min_tokens: int = MIN_CHUNK_TOKENS,
+                   section_level: int = SECTION_LEVEL) -> List[MarkdownChunk]:
+    """
+    마크다운을 구조 기반 청크로 분할
+
+    - section_level 이하 수준의 제목(기본: ##)에서는 항상 새 청크 시작 (다른 절을 섞지 않음)
+    - 절 안에서는 하위 절/블록을 순서대로 max_tokens까지 묶음 (청크 간 겹침 없음)
+    - 하위 절이 현재 청크에 다 들어가지 않고 현재 청크가 min_tokens 이상이면 하위 절 제목에서 끊음
+    - max_tokens를 넘는 블록(긴 코드 등)은 줄 경계에서 나눔
+    - 청크가 제목으로 끝나지 않도록 끝의 제목은 다음 청크로 넘김
+
+    Args:
+        text (str): 마크다운 원문
+        max_tokens (int): 청크 최대 추정 토큰 수
+        min_tokens (int): 하위 절 제목에서 끊을 수 있는 최소 청크 크기
+        section_level (int): 항상 청크를 나누는 제목 수준
+
+    Returns:
+        List[MarkdownChunk]: 청크 리스트 (문서 순서, heading_path는 청크 블록들의 공통 제목 경로)
+    """
+    blocks = parse_blocks(text)
+    subsection_tokens = _subsection_tokens(blocks)
+    chunks = []
+    current, current_tokens = [], 0
+
+    def flush(carry_heading: bool = False):
+        nonlocal current, current_tokens
+        carried = []
+        while carry_heading and current and current[-1][0].kind == 'heading':
+            carried.insert(0, current.pop())
+        if current:
+            chunks.append(MarkdownChunk(
+                text='\n\n'.join(block.text for block, _, _ in current),
+                heading_path=_common_path([block.heading_path for block, _, _ in current]),
+                tokens=sum(block.tokens for block, _, _ in current),
+                start_line=current[0][1],
+                end_line=current[-1][2]
+            ))
+        current = carried
+        current_tokens = sum(block.tokens for block, _, _ in current)
+
+    for position, (block, first, last) in enumerate(blocks):
+        if block.kind == 'heading' and current:
+            if block.level <= section_level:
+                flush()
+            elif current_tokens >= min_tokens and current_tokens + subsection_tokens[position] > max_tokens:
+                flush()
+
+        pieces = [(block, first, last)] if block.tokens <= max_tokens else _split_large_block(block, first, max_tokens)
+        for piece, piece_first, piece_last in pieces:
+            if current and current_tokens + piece.tokens > max_tokens:
+                flush(carry_heading=True)
+            current.append((piece, piece_first, piece_last))
+            current_tokens += piece.tokens
+
+    flush()
+    return chunks
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='마크다운 구조 기반 청킹 결과 확인')
+    parser.add_argument('markdown_file', help='마크다운 파일 경로')
+    parser.add_argument('--max-tokens', type=int, default=MAX_CHUNK_TOKENS, help='청크 최대 추정 토큰 수')
+    parser.add_argument('--min-tokens', type=int, default=MIN_CHUNK_TOKENS, help='하위 절 제목에서 끊을 수 있는 최소 청크 크기')
+    parser.add_argument('--section-level', type=int, default=SECTION_LEVEL, help='항상 청크를 나누는 제목 수준')
+    parser.add_argument('--compare', action='store_true', help='기존 글자 수 기반 chunk_text와 비교')
+    args = parser.parse_args()
+
+    with open(args.markdown_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    chunks = chunk_markdown(content, args.max_tokens, args.min_tokens, args.section_level)
+    tokens = [chunk.tokens for chunk in chunks]
+    print(f"📄 {args.markdown_file}: {len(chunks)}개 청크 "
+          f"(추정 토큰 평균 {sum(tokens) / max(len(tokens), 1):.0f}, 최소 {min(tokens, default=0)}, 최대 {max(tokens, default=0)})")
+    for i, chunk in enumerate(chunks):
+        print(f"  {i:3d}. 줄 {chunk.start_line}-{chunk.end_line}, {chunk.tokens} 토큰 | {' > '.join(chunk.heading_path)}")
+
+    if args.compare:
+        from document_embedder import chunk_text
+        old_chunks = chunk_text(content)
+        old_tokens = [estimate_tokens(chunk) for chunk in old_chunks]
+        print(f"\n📊 기존 chunk_text: {len(old_chunks)}개 청크, 추정 토큰 합계 {sum(old_tokens):,} "
+              f"→ 구조 기반: {len(chunks)}개 청크, 추정 토큰 합계 {sum(tokens):,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MinHash 서명과 LSH 색인
+값 집합을 고정 길이 MinHash 서명으로 요약하고, band 버킷으로 비슷한 집합 후보를 찾습니다.
+값 기반 조인 키 탐색(join_key_finder)과 임베딩 전 중복 청크 제거(chunk_dedup)가 함께 사용합니다.
+"""
+
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# splitmix64 상수 (uint64 곱셈은 numpy에서 2^64로 자연스럽게 wrap-around 됨)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_MAX_HASH = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# LSH band 하나의 행(최솟값 해시) 수 후보 (기준 Jaccard가 낮을수록 적은 행, 많은 band)
+LSH_ROW_OPTIONS = (1, 2, 4, 8, 16, 32)
+LSH_PARTITIONS = 8  # 고유값 개수 기준 구간 수 (구간의 최대 크기로 포함도 → Jaccard 기준 계산)
+MAX_BUCKET_SIZE = 64  # 이보다 많은 컬럼이 모인 버킷은 후보 생성에서 제외
+MAX_CANDIDATES = 32  # 컬럼 하나의 최대 후보 수 (일치한 band가 많은 순)
+
+# 서명 갱신 시 (num_perm × 블록) uint64 해시 행렬 하나의 최대 크기 (num_perm=256이면 블록당 4,096개 값)
+SIGNATURE_BLOCK_BYTES = 8 * 1024 * 1024
+
+def _mix64(values):
+    """splitmix64 해시 혼합 (벡터 연산)"""
+    z = values
+    z = (z ^ (z >> np.uint64(30))) * _MIX_1
+    z = (z ^ (z >> np.uint64(27))) * _MIX_2
+    return z ^ (z >> np.uint64(31))
+
+class MinHashSignature:
+    """
+    고유값 집합의 MinHash 서명 (청크 단위로 누적 갱신 가능)
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        """
+        Args:
+            num_perm (int): 해시 함수(순열) 개수
+            seed (int): 해시 함수 생성 시드
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.seeds = rng.integers(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.signature = np.full(num_perm, _MAX_HASH, dtype=np.uint64)
+        self.updated = False
+
+    def update(self, values, block_size=None):
+        """
+        고유값 배열을 서명에 반영
+
+        Args:
+            values (np.ndarray): 정규화된 문자열 값 배열
+            block_size (int): 한 번에 해시할 값의 수 (기본: 해시 행렬이 SIGNATURE_BLOCK_BYTES 이하가 되도록 num_perm으로 계산)
+        """
+        if len(values) == 0:
+            return
+        self.update_hashes(pd.util.hash_array(np.asarray(values, dtype=object)), block_size)
+
+    def update_hashes(self, base_hashes, block_size=None):
+        """
+        이미 64비트로 해시한 값 배열을 서명에 반영 (예: 청크 shingle 해시)
+
+        Args:
+            base_hashes (np.ndarray): uint64 해시 배열
+            block_size (int): 한 번에 해시할 값의 수 (기본: update와 같음)
+        """
+        if len(base_hashes) == 0:
+            return
+        if block_size is None:
+            block_size = max(1, SIGNATURE_BLOCK_BYTES // (np.dtype(np.uint64).itemsize * self.num_perm))
+        base_hashes = np.asarray(base_hashes, dtype=np.uint64)
+        for start in range(0, len(base_hashes), block_size):
+            block = base_hashes[start:start + block_size]
+            # (num_perm, block) 행렬에서 순열별 최솟값
+            hashed = _mix64(block[np.newaxis, :] ^ self.seeds[:, np.newaxis])
+            np.minimum(self.signature, hashed.min(axis=1), out=self.signature)
+        self.updated = True
+
+    def estimate_cardinality(self):
+        """최솟값 해시의 평균으로 고유값 개수 추정"""
+        if not self.updated:
+            return 0.0
+        normalized = self.signature.astype(np.float64) / float(_MAX_HASH)
+        total = normalized.sum()
+        if total == 0:
+            return float('inf')
+        return max(1.0, self.num_perm / total - 1)
+
+    def jaccard(self, other):
+        """두 서명의 Jaccard 유사도 추정"""
+        return float(np.mean(self.signature == other.signature))
+
+@lru_cache(maxsize=None)
+def lsh_params(num_perm, threshold, rows_options=LSH_ROW_OPTIONS, false_negative_weight=0.5):
+    """
+    Jaccard 기준값에 맞는 LSH band 구성 선택
+
+    band 하나(rows개 최솟값 해시)가 모두 같을 확률은 s^rows이므로 후보가 될 확률은 1 - (1 - s^rows)^bands입니다.
+    기준값 아래 쌍이 후보가 되는 면적(오탐)과 기준값 위 쌍이 빠지는 면적(미탐)의 가중합이 가장 작은 조합을 고릅니다.
+
+    Args:
+        num_perm (int): MinHash 순열 개수 (bands × rows 상한)
+        threshold (float): 후보로 삼을 최소 Jaccard 유사도
+        rows_options (tuple): band 하나의 행 수 후보
+        false_negative_weight (float): 미탐 가중치 (나머지는 오탐 가중치)
+
+    Returns:
+        tuple: (bands, rows)
+    """
+    similarity = np.linspace(0.0, 1.0, 201)
+    step = similarity[1]
+    below, above = similarity < threshold, similarity >= threshold
+    best, best_error = (num_perm, 1), np.inf
+    for rows in rows_options:
+        if rows > num_perm:
+            break
+        band_match = similarity ** rows
+        for bands in range(1, num_perm // rows + 1):
+            probability = 1.0 - (1.0 - band_match) ** bands
+            false_positive = probability[below].sum() * step
+            false_negative = (1.0 - probability[above]).sum() * step
+            error = (1 - false_negative_weight) * false_positive + false_negative_weight * false_negative
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+class BandedLSH:
+    """
+    MinHash 서명을 bands개 band(band당 rows개 값)로 나눈 버킷 색인
+
+    같은 band 값을 가진 키가 같은 버킷에 모입니다. 추가와 조회를 섞어 쓸 수 있어
+    순서대로 대표를 고르는 중복 제거(chunk_dedup)와 구간별 색인(MinHashLSH) 모두 이 구조를 사용합니다.
+    """
+
+    def __init__(self, bands, rows):
+        """
+        Args:
+            bands (int): band 개수
+            rows (int): band 하나의 행(최솟값 해시) 수
+        """
+        self.bands = bands
+        self.rows = rows
+        self.buckets = [{} for _ in range(bands)]
+
+    def band_key(self, signature, band):
+        """서명의 band 하나를 버킷 키로"""
+        return signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def insert(self, key, signature):
+        """서명을 band별 버킷에 추가"""
+        for band, table in enumerate(self.buckets):
+            table.setdefault(self.band_key(signature, band), []).append(key)
+
+    def bucket(self, signature, band):
+        """서명과 같은 band 값을 가진 키 목록"""
+        return self.buckets[band].get(self.band_key(signature, band), ())
+
+    def query(self, signature):
+        """서명과 band 하나 이상을 공유하는 키 집합"""
+        return {key for band in range(self.bands) for key in self.bucket(signature, band)}
+
+class MinHashLSH:
+    """
+    고유값 개수 구간별 MinHash LSH 색인 (LSH Ensemble 방식의 포함도 기준 후보 탐색)
+
+    작은 집합 Q가 큰 집합 X에 t 이상 포함되면 Jaccard는 t|Q| / (|Q| + |X| - t|Q|) 이상입니다.
+    컬럼을 고유값 개수 순으로 구간을 나누고, 질의마다 구간의 최대 크기로 이 하한을 계산해
+    구간별로 맞는 (bands, rows)의 버킷만 찾습니다. 그래서 가입번호처럼 크기가 크게 다른 포함 관계는 찾고,
+    최솟값 해시를 우연히 하나 공유한 쌍은 후보가 되지 않습니다.
+    코드/플래그/날짜처럼 값을 공유하는 컬럼이 max_bucket_size보다 많이 모인 버킷은 건너뛰고,
+    질의당 후보는 일치한 band가 많은 순으로 max_candidates개까지만 남기므로 전체 비용은 컬럼 수에 선형입니다.
+    """
+
+    def __init__(self, num_perm=256, num_partitions=LSH_PARTITIONS, max_bucket_size=MAX_BUCKET_SIZE,
+                 max_candidates=MAX_CANDIDATES, rows_options=LSH_ROW_OPTIONS):
+        """
+        Args:
+            num_perm (int): MinHash 순열 개수
+            num_partitions (int): 고유값 개수 구간 수 (구간마다 같은 수의 컬럼)
+            max_bucket_size (int): 후보 생성에 쓸 버킷의 최대 키 수
+            max_candidates (int): 질의 하나의 최대 후보 수
+            rows_options (tuple): band 하나의 행 수 후보
+        """
+        self.num_perm = num_perm
+        self.num_partitions = num_partitions
+        self.max_bucket_size = max_bucket_size
+        self.max_candidates = max_candidates
+        self.rows_options = tuple(rows for rows in rows_options if rows <= num_perm)
+        self.entries = []  # (키, 서명, 고유값 개수)
+        self.partitions = None
+        self.shared = None
+        self.skipped_buckets = 0
+        self.truncated_queries = 0
+
+    def insert(self, key, signature, size):
+        """서명과 고유값 개수(추정)를 색인에 추가"""
+        self.entries.append((key, np.asarray(signature), float(size)))
+        self.partitions = None
+
+    def _build(self):
+        """고유값 개수 순으로 구간을 나누고 구간별로 행 수 후보마다 band 버킷 생성"""
+        entries = sorted(self.entries, key=lambda entry: entry[2])
+        self.partitions = []
+        # 구간을 합친 버킷 (코드/날짜처럼 많은 컬럼이 공유하는 값은 구간이 달라도 함께 건너뜀)
+        self.shared = {rows: BandedLSH(self.num_perm // rows, rows) for rows in self.rows_options}
+        for positions in np.array_split(np.arange(len(entries)), max(1, min(self.num_partitions, len(entries)))):
+            if len(positions) == 0:
+                continue
+            members = [entries[i] for i in positions]
+            indexes = {rows: BandedLSH(self.num_perm // rows, rows) for rows in self.rows_options}
+            for key, signature, _ in members:
+                for rows, index in indexes.items():
+                    index.insert(key, signature)
+                    self.shared[rows].insert(key, signature)
+            self.partitions.append({'upper': members[-1][2], 'indexes': indexes})
+
+    def query(self, signature, size, min_containment, min_jaccard=0.0):
+        """
+        포함도 또는 Jaccard 기준을 넘을 가능성이 있는 키 찾기
+
+        질의보다 작은 컬럼은 그 컬럼의 질의에서 찾으므로 최대 크기가 질의 이상인 구간만 탐색합니다.
+
+        Args:
+            signature (np.ndarray): 질의 MinHash 서명
+            size (float): 질의 고유값 개수 (추정)
+            min_containment (float): 최소 포함도 (질의가 상대 컬럼에 포함되는 비율)
+            min_jaccard (float): 최소 Jaccard 유사도
+
+        Returns:
+            list: 후보 키 (일치한 band가 많은 순, 질의 자신 포함 가능)
+        """
+        if self.partitions is None:
+            self._build()
+        signature = np.asarray(signature)
+        candidates = Counter()
+        for partition in self.partitions:
+            upper = partition['upper']
+            if upper < size:
+                continue
+            containment_jaccard = min_containment * size / (size + upper - min_containment * size)
+            # 0.01 단위로 내림하여 기준을 약간 낮춤 (후보를 놓치지 않는 쪽, lsh_params 캐시 재사용)
+            threshold = max(0.01, np.floor(max(min_jaccard, containment_jaccard) * 100) / 100)
+            bands, rows = lsh_params(self.num_perm, threshold, self.rows_options)
+            index, shared = partition['indexes'][rows], self.shared[rows]
+            for band in range(bands):
+                band_key = index.band_key(signature, band)
+                keys = index.buckets[band].get(band_key)
+                if not keys:
+                    continue
+                if len(shared.buckets[band][band_key]) > self.max_bucket_size:
+                    self.skipped_buckets += 1
+                    continue
+                candidates.update(keys)
+        if len(candidates) > self.max_candidates:
+            self.truncated_queries += 1
+        return [key for key, _ in candidates.most_common(self.max_candidates)]
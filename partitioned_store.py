@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+월 단위 파티션 저장소
+가입자 CSV(ENTR_INT_INS: 처리일자, ENTR_BY_INS: 정산년월)를 청크 단위로 읽어
+store/<데이터셋>/month=YYYY-MM/part-NNNNN.parquet 형태의 월별 컬럼 저장 파일로 나누어 저장합니다.
+파티션별 행 수와 숫자형 컬럼의 최솟값/최댓값은 _manifest.json에 기록하여,
+읽을 때 월 범위와 값 범위 조건으로 필요 없는 파티션을 건너뛰고 필요한 컬럼만 읽습니다.
+새 월 파일은 append로 추가하며, 파티션별 키 색인(가입번호 + 월 기준 컬럼 해시)으로 이미 있는 행을 건너뜁니다.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import re
+import json
+import shutil
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from csv_analyzer import detect_encoding
+
+# 월 파티션 기준 컬럼 후보 (앞에 있을수록 우선)
+PARTITION_COLUMN_CANDIDATES = ['처리일자', '정산년월']
+
+# 월 컬럼이 없거나 날짜를 해석할 수 없는 행의 파티션
+UNKNOWN_PARTITION = 'unknown'
+
+MANIFEST_FILE = '_manifest.json'
+
+# 중복 판정 키 (가입번호 + 월 기준 컬럼 값, 예: 가입번호 + 처리일자)
+KEY_COLUMN = '가입번호'
+
+# 파티션별 키 색인 세그먼트가 이 개수를 넘으면 하나로 합침
+MAX_KEY_SEGMENTS = 8
+
+def _require_pyarrow():
+    """Parquet 입출력에 필요한 pyarrow 확인"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("파티션 저장소에는 pyarrow가 필요합니다. pip install pyarrow")
+    return pq
+
+def month_key(value):
+    """
+    월 값을 파티션 키(YYYY-MM)로 정규화
+
+    Args:
+        value: '2024-06', '202406', 202406, '2024-06-15', Timestamp 등
+
+    Returns:
+        str: 'YYYY-MM'
+    """
+    text = re.sub(r'\.0+$', '', str(value).strip())
+    if re.fullmatch(r'\d{6}', text):
+        return f'{text[:4]}-{text[4:]}'
+    return pd.Timestamp(text).strftime('%Y-%m')
+
+def partition_months(values):
+    """
+    월 컬럼 값 배열의 파티션 키 (정산년월 YYYYMM 정수와 처리일자 날짜 문자열 모두 지원)
+
+    Returns:
+        tuple: (파티션 키 Series, 파싱된 날짜 Series)
+    """
+    text = pd.Series(values).astype(str).str.strip().str.replace(r'\.0+$', '', regex=True)
+    yyyymm = text.str.fullmatch(r'\d{6}')
+    dates = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+    if yyyymm.any():
+        dates[yyyymm] = pd.to_datetime(text[yyyymm], format='%Y%m', errors='coerce')
+    if (~yyyymm).any():
+        dates[~yyyymm] = pd.to_datetime(text[~yyyymm], errors='coerce', format='mixed')
+    keys = dates.dt.strftime('%Y-%m').fillna(UNKNOWN_PARTITION)
+    return keys, dates
+
+def _json_value(value):
+    """통계 값을 JSON에 저장할 수 있는 값으로 변환"""
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    if isinstance(value, (np.integer, int)):
+        return int(value)
+    return float(value)
+
+def column_stats(df, partition_column=None, partition_dates=None):
+    """
+    청크의 컬럼별 최솟값/최댓값 (숫자형 컬럼 + 월 컬럼의 날짜)
+
+    Returns:
+        dict: 컬럼 → [최솟값, 최댓값]
+    """
+    stats = {}
+    for column in df.select_dtypes(include='number').columns:
+        values = df[column]
+        stats[column] = [_json_value(values.min()), _json_value(values.max())]
+    if partition_column is not None and partition_dates is not None:
+        stats[partition_column] = [_json_value(partition_dates.min()), _json_value(partition_dates.max())]
+    return stats
+
+def key_hashes(df, key_columns):
+    """
+    중복 판정 키 컬럼 값을 정규화하여 64비트 해시 배열로 변환
+
+    정수/실수 혼용('123' vs '123.0')과 앞뒤 공백은 같은 키로 봅니다.
+    해시 충돌 확률은 키 수가 수십억 개여도 무시할 수 있는 수준입니다.
+    """
+    normalized = pd.DataFrame({
+        column: df[column].astype(str).str.strip().str.replace(r'\.0+$', '', regex=True).where(df[column].notna(), '')
+        for column in key_columns
+    })
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy(dtype=np.uint64)
+
+def merge_stats(left, right):
+    """두 통계 딕셔너리 합치기 (최솟값의 최솟값, 최댓값의 최댓값)"""
+    merged = dict(left)
+    for column, (low, high) in right.items():
+        if column not in merged:
+            merged[column] = [low, high]
+            continue
+        old_low, old_high = merged[column]
+        lows = [v for v in [old_low, low] if v is not None]
+        highs = [v for v in [old_high, high] if v is not None]
+        merged[column] = [min(lows) if lows else None, max(highs) if highs else None]
+    return merged
+
+def _overlaps(stats, low, high):
+    """파티션 통계 [최솟값, 최댓값]이 조건 범위 [low, high]와 겹칠 수 있는지"""
+    if stats is None or stats[0] is None:
+        # 통계가 없으면 건너뛸 수 없음
+        return True
+    if low is not None and stats[1] < low:
+        return False
+    if high is not None and stats[0] > high:
+        return False
+    return True
+
+class PartitionedStore:
+    """
+    월 파티션 Parquet 저장소
+    """
+
+    def __init__(self, root='store'):
+        """
+        Args:
+            root (str): 저장소 루트 폴더 (데이터셋별 하위 폴더)
+        """
+        self.root = root
+
+    def dataset_dir(self, dataset):
+        return os.path.join(self.root, dataset)
+
+    def datasets(self):
+        """저장된 데이터셋 목록"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, MANIFEST_FILE)))
+
+    def manifest(self, dataset):
+        """데이터셋 매니페스트 (파티션별 파일/행 수/통계) 로드"""
+        manifest_path = os.path.join(self.dataset_dir(dataset), MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise ValueError(f"저장소에 데이터셋이 없습니다: {dataset} ({self.root})")
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, dataset_dir, manifest):
+        manifest['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        manifest_path = os.path.join(dataset_dir, MANIFEST_FILE)
+        # 쓰는 도중 중단되어도 이전 매니페스트가 남도록 임시 파일에 쓴 뒤 교체
+        with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(manifest_path + '.tmp', manifest_path)
+
+    def _write_partition_chunk(self, dataset_dir, manifest, month, part, stats):
+        """월 파티션에 청크 하나를 새 part 파일로 쓰고 매니페스트 갱신"""
+        partition = manifest['partitions'].setdefault(
+            month, {'files': [], 'rows': 0, 'stats': {}, 'key_files': [], 'key_sequence': 0})
+        partition_dir = os.path.join(dataset_dir, f'month={month}')
+        os.makedirs(partition_dir, exist_ok=True)
+
+        file_name = f'month={month}/part-{len(partition["files"]):05d}.parquet'
+        part.to_parquet(os.path.join(dataset_dir, file_name), index=False)
+
+        partition['files'].append(file_name)
+        partition['rows'] += len(part)
+        partition['stats'] = merge_stats(partition['stats'], stats)
+
+    def _write_key_segment(self, dataset_dir, partition, month, hashes):
+        """
+        파티션에 정렬된 키 해시 세그먼트 추가 (세그먼트가 많아지면 하나로 합침)
+
+        Returns:
+            list: 매니페스트 저장 후 지울 이전 세그먼트 경로
+        """
+        def save_segment(values):
+            file_name = f'month={month}/_keys-{partition["key_sequence"]:05d}.npy'
+            partition['key_sequence'] += 1
+            np.save(os.path.join(dataset_dir, file_name), np.sort(values))
+            return file_name
+
+        partition['key_files'].append(save_segment(hashes))
+        if len(partition['key_files']) <= MAX_KEY_SEGMENTS:
+            return []
+
+        old_files = partition['key_files']
+        merged = np.concatenate([np.load(os.path.join(dataset_dir, file_name)) for file_name in old_files])
+        partition['key_files'] = [save_segment(merged)]
+        return [os.path.join(dataset_dir, file_name) for file_name in old_files]
+
+    def _contains_keys(self, dataset_dir, partition, hashes):
+        """키 해시가 파티션 키 색인에 이미 있는지 (세그먼트별 이진 탐색, 세그먼트는 메모리 매핑으로 읽음)"""
+        found = np.zeros(len(hashes), dtype=bool)
+        for file_name in partition['key_files']:
+            keys = np.load(os.path.join(dataset_dir, file_name), mmap_mode='r')
+            if len(keys) == 0:
+                continue
+            positions = np.minimum(np.searchsorted(keys, hashes), len(keys) - 1)
+            found |= keys[positions] == hashes
+        return found
+
+    def _prepare_source(self, csv_file, partition_column=None):
+        """
+        입력 CSV의 인코딩/헤더/월 기준 컬럼 확인
+
+        Returns:
+            tuple: (인코딩, 헤더 컬럼 리스트, 월 기준 컬럼 또는 None)
+        """
+        encoding = detect_encoding(csv_file)
+        if encoding is None:
+            raise ValueError(f"{csv_file} 로드 실패 - 인코딩 문제")
+
+        header = pd.read_csv(csv_file, encoding=encoding, nrows=0).columns.tolist()
+        if partition_column is None:
+            partition_column = next((col for col in PARTITION_COLUMN_CANDIDATES if col in header), None)
+        elif partition_column not in header:
+            raise ValueError(f"{Path(csv_file).name}에 월 기준 컬럼 {partition_column}이 없습니다.")
+        if partition_column is None:
+            print(f"⚠️ {Path(csv_file).name}에 월 기준 컬럼({', '.join(PARTITION_COLUMN_CANDIDATES)})이 없어 "
+                  f"전체를 '{UNKNOWN_PARTITION}' 파티션 하나로 저장합니다.")
+        return encoding, header, partition_column
+
+    def _new_manifest(self, dataset, header, partition_column):
+        """새 데이터셋 매니페스트 (중복 판정 키: 가입번호 + 월 기준 컬럼)"""
+        key_columns = None
+        if KEY_COLUMN in header:
+            key_columns = [KEY_COLUMN] + ([partition_column] if partition_column else [])
+        else:
+            print(f"⚠️ {KEY_COLUMN} 컬럼이 없어 키 색인과 중복 제거를 사용하지 않습니다.")
+        return {
+            'dataset': dataset,
+            'partition_column': partition_column,
+            'key_columns': key_columns,
+            'columns': header,
+            'sources': [],
+            'batches': [],
+            'partitions': {}
+        }
+
+    def _write_batch(self, dataset_dir, manifest, csv_file, encoding, chunksize, deduplicate):
+        """
+        CSV 파일 하나를 배치로 월 파티션에 추가
+
+        중복 판정은 배치가 닿는 파티션의 키 색인만 조회하므로 기존 이력 크기와 무관하게
+        배치 행 수에 비례하는 시간이 걸립니다.
+
+        Returns:
+            tuple: (배치 기록, 매니페스트 저장 후 지울 파일 경로 리스트)
+        """
+        partition_column = manifest['partition_column']
+        key_columns = manifest['key_columns']
+        batch = {
+            'batch': len(manifest['batches']) + 1,
+            'source': os.path.abspath(csv_file),
+            'ingested_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'rows_read': 0,
+            'rows_written': 0,
+            'duplicate_rows': 0,
+            'partitions': {}
+        }
+        obsolete_files = []
+        # 이번 배치에서 쓴 키 (배치 끝에 파티션별 세그먼트 하나로 저장)
+        batch_keys = {}
+
+        for chunk in pd.read_csv(csv_file, encoding=encoding, chunksize=chunksize, low_memory=False):
+            chunk = chunk[manifest['columns']]
+            batch['rows_read'] += len(chunk)
+            if partition_column is None:
+                months, dates = pd.Series(UNKNOWN_PARTITION, index=chunk.index), None
+            else:
+                months, dates = partition_months(chunk[partition_column].to_numpy())
+                months.index = chunk.index
+                dates.index = chunk.index
+
+            for month, positions in chunk.groupby(months, sort=True).indices.items():
+                part = chunk.iloc[positions]
+                if key_columns:
+                    hashes = key_hashes(part, key_columns)
+                    if deduplicate:
+                        # 청크 안 중복 → 이번 배치 앞 청크와 중복 → 기존 파티션과 중복
+                        duplicate = pd.Series(hashes).duplicated().to_numpy()
+                        if month in batch_keys:
+                            duplicate |= np.isin(hashes, np.concatenate(batch_keys[month]))
+                        if month in manifest['partitions']:
+                            duplicate |= self._contains_keys(dataset_dir, manifest['partitions'][month], hashes)
+                        if duplicate.any():
+                            batch['duplicate_rows'] += int(duplicate.sum())
+                            part, hashes, positions = part[~duplicate], hashes[~duplicate], positions[~duplicate]
+                        if len(part) == 0:
+                            continue
+                    batch_keys.setdefault(month, []).append(hashes)
+
+                stats = column_stats(part, partition_column, dates.iloc[positions] if dates is not None else None)
+                self._write_partition_chunk(dataset_dir, manifest, month, part, stats)
+                batch['rows_written'] += len(part)
+                batch['partitions'][month] = batch['partitions'].get(month, 0) + len(part)
+
+        for month, hashes in batch_keys.items():
+            obsolete_files += self._write_key_segment(dataset_dir, manifest['partitions'][month], month,
+                                                      np.concatenate(hashes))
+
+        manifest['partitions'] = dict(sorted(manifest['partitions'].items()))
+        manifest['sources'].append(batch['source'])
+        manifest['batches'].append(batch)
+        return batch, obsolete_files
+
+    def ingest(self, csv_file, dataset=None, partition_column=None, chunksize=200000):
+        """
+        CSV 파일을 월 파티션 데이터셋으로 저장 (같은 이름의 데이터셋은 교체, 중복 제거 없음)
+
+        Args:
+            csv_file (str): 가입자 CSV 경로
+            dataset (str): 데이터셋 이름 (기본: 파일명, 예: ENTR_INT_INS)
+            partition_column (str): 월 기준 컬럼 (기본: 처리일자 → 정산년월 순으로 있는 컬럼)
+            chunksize (int): 한 번에 읽을 행 수
+
+        Returns:
+            dict: 데이터셋 매니페스트
+        """
+        _require_pyarrow()
+        dataset = dataset or Path(csv_file).stem
+        encoding, header, partition_column = self._prepare_source(csv_file, partition_column)
+
+        start_time = time.time()
+        print(f"🔄 {Path(csv_file).name} → {self.dataset_dir(dataset)} (월 기준: {partition_column or '없음'})")
+
+        # 임시 폴더에 모두 쓴 뒤 교체하여 중간에 실패해도 기존 데이터셋이 남도록 함
+        dataset_dir = self.dataset_dir(dataset)
+        temp_dir = dataset_dir + '.tmp'
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+        os.makedirs(temp_dir)
+
+        manifest = self._new_manifest(dataset, header, partition_column)
+        batch, _ = self._write_batch(temp_dir, manifest, csv_file, encoding, chunksize, deduplicate=False)
+        self._save_manifest(temp_dir, manifest)
+
+        if os.path.exists(dataset_dir):
+            shutil.rmtree(dataset_dir)
+        os.replace(temp_dir, dataset_dir)
+
+        print(f"✅ {dataset}: {batch['rows_read']:,}행 → 파티션 {len(manifest['partitions'])}개 "
+              f"({time.time() - start_time:.1f}초)")
+        return manifest
+
+    def append(self, csv_file, dataset=None, partition_column=None, chunksize=200000):
+        """
+        새 월 파일을 기존 데이터셋에 추가 (가입번호 + 월 기준 컬럼이 이미 있는 행은 건너뜀)
+
+        기존 part 파일은 수정하지 않고 새 part 파일과 키 세그먼트만 추가하며,
+        배치별 행 수는 매니페스트의 적재 이력(batches)에 기록합니다.
+
+        Args:
+            csv_file (str): 새 M-1 / M-2 CSV 경로
+            dataset (str): 데이터셋 이름 (기본: 파일명에서 _YYYYMM 등 뒤쪽 숫자를 뺀 이름, 예: ENTR_BY_INS)
+            partition_column (str): 월 기준 컬럼 (새 데이터셋일 때만 사용)
+            chunksize (int): 한 번에 읽을 행 수
+
+        Returns:
+            dict: 배치 기록 (rows_read, rows_written, duplicate_rows, partitions)
+        """
+        _require_pyarrow()
+        dataset = dataset or re.sub(r'_\d+$', '', Path(csv_file).stem)
+        dataset_dir = self.dataset_dir(dataset)
+
+        if dataset in self.datasets():
+            manifest = self.manifest(dataset)
+            encoding, header, _ = self._prepare_source(csv_file, manifest['partition_column'])
+            if set(header) != set(manifest['columns']):
+                missing = [col for col in manifest['columns'] if col not in header]
+                extra = [col for col in header if col not in manifest['columns']]
+                raise ValueError(f"{Path(csv_file).name}의 컬럼 구성이 {dataset}와 다릅니다 (없음: {missing}, 추가: {extra})")
+        else:
+            encoding, header, partition_column = self._prepare_source(csv_file, partition_column)
+            manifest = self._new_manifest(dataset, header, partition_column)
+            os.makedirs(dataset_dir, exist_ok=True)
+            print(f"ℹ️ 새 데이터셋 생성: {dataset}")
+
+        start_time = time.time()
+        print(f"🔄 {Path(csv_file).name} → {dataset} 추가 (중복 판정 키: {manifest['key_columns'] or '없음'})")
+
+        batch, obsolete_files = self._write_batch(dataset_dir, manifest, csv_file, encoding, chunksize, deduplicate=True)
+        # 매니페스트를 저장해야 새 파일이 보이므로, 중간에 실패하면 기존 데이터셋은 그대로 남음
+        self._save_manifest(dataset_dir, manifest)
+        for path in obsolete_files:
+            os.remove(path)
+
+        print(f"✅ 배치 {batch['batch']}: 읽은 행 {batch['rows_read']:,}, 추가 {batch['rows_written']:,}, "
+              f"중복 제외 {batch['duplicate_rows']:,} (파티션 {len(batch['partitions'])}개, "
+              f"{time.time() - start_time:.1f}초)")
+        return batch
+
+    def ingestion_log(self, dataset):
+        """
+        데이터셋 적재 이력
+
+        Returns:
+            pd.DataFrame: 배치별 source, ingested_at, rows_read, rows_written, duplicate_rows, partitions(파티션 수)
+        """
+        batches = self.manifest(dataset)['batches']
+        log = pd.DataFrame([{**batch, 'partitions': len(batch['partitions'])} for batch in batches],
+                           columns=['batch', 'source', 'ingested_at', 'rows_read', 'rows_written',
+                                    'duplicate_rows', 'partitions'])
+        return log
+
+    def partitions(self, dataset, start=None, end=None, where=None):
+        """
+        조건에 맞을 수 있는 파티션 목록 (월 범위와 파티션 통계로 가지치기)
+
+        Args:
+            dataset (str): 데이터셋 이름
+            start (str): 시작 월 (포함, 예: '2024-06', 202406)
+            end (str): 종료 월 (포함)
+            where (dict): 컬럼 → (최솟값, 최댓값) 범위 조건 (None은 열린 범위)
+
+        Returns:
+            list: 월 파티션 키 리스트
+        """
+        manifest = self.manifest(dataset)
+        start = month_key(start) if start is not None else None
+        end = month_key(end) if end is not None else None
+
+        selected = []
+        for month, partition in manifest['partitions'].items():
+            if start is not None or end is not None:
+                # 월 조건이 있으면 월을 알 수 없는 행은 제외
+                if month == UNKNOWN_PARTITION:
+                    continue
+                if (start is not None and month < start) or (end is not None and month > end):
+                    continue
+            if where and not all(_overlaps(partition['stats'].get(column), low, high)
+                                 for column, (low, high) in where.items()):
+                continue
+            selected.append(month)
+        return selected
+
+    def read(self, dataset, columns=None, start=None, end=None, where=None, verbose=True):
+        """
+        필요한 파티션의 필요한 컬럼만 읽기
+
+        Args:
+            dataset (str): 데이터셋 이름
+            columns (list): 읽을 컬럼 (기본: 전체)
+            start (str): 시작 월 (포함)
+            end (str): 종료 월 (포함)
+            where (dict): 컬럼 → (최솟값, 최댓값) 범위 조건 (숫자형 컬럼, 행 단위로도 적용)
+            verbose (bool): 가지치기 결과 출력
+
+        Returns:
+            pd.DataFrame: 원본 CSV 컬럼 순서의 데이터 (RangeIndex)
+        """
+        pq = _require_pyarrow()
+        manifest = self.manifest(dataset)
+        dataset_dir = self.dataset_dir(dataset)
+        where = where or {}
+
+        if columns is None:
+            columns = manifest['columns']
+        unknown = [col for col in list(columns) + list(where) if col not in manifest['columns']]
+        if unknown:
+            raise ValueError(f"{dataset}에 없는 컬럼입니다: {unknown}")
+        read_columns = list(columns) + [col for col in where if col not in columns]
+
+        months = self.partitions(dataset, start, end, where)
+        frames = []
+        for month in months:
+            for file_name in manifest['partitions'][month]['files']:
+                frame = pq.read_table(os.path.join(dataset_dir, file_name), columns=read_columns).to_pandas()
+                for column, (low, high) in where.items():
+                    if low is not None:
+                        frame = frame[frame[column] >= low]
+                    if high is not None:
+                        frame = frame[frame[column] <= high]
+                frames.append(frame)
+
+        if frames:
+            df = pd.concat(frames, ignore_index=True)[list(columns)]
+        else:
+            df = pd.DataFrame(columns=list(columns))
+
+        if verbose:
+            print(f"📂 {dataset}: 파티션 {len(months)}/{len(manifest['partitions'])}개, "
+                  f"컬럼 {len(columns)}/{len(manifest['columns'])}개 → {len(df):,}행")
+        return df
+
+    def summary(self, dataset):
+        """데이터셋 파티션 요약 출력"""
+        manifest = self.manifest(dataset)
+        partition_column = manifest['partition_column'] or '없음'
+        total_rows = sum(partition['rows'] for partition in manifest['partitions'].values())
+        print(f"✅ {dataset}: {total_rows:,}행, 파티션 {len(manifest['partitions'])}개 (월 기준: {partition_column})")
+        for month, partition in manifest['partitions'].items():
+            print(f"  - {month}: {partition['rows']:,}행 (파일 {len(partition['files'])}개)")
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='월 단위 파티션 저장소')
+    parser.add_argument('--root', default='store', help='저장소 루트 폴더')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help='CSV를 월 파티션 데이터셋으로 저장')
+    ingest_parser.add_argument('csv_files', nargs='+', help='가입자 CSV 경로')
+    ingest_parser.add_argument('--partition-column', default=None, help='월 기준 컬럼 (기본: 처리일자 또는 정산년월)')
+    ingest_parser.add_argument('--chunksize', type=int, default=200000, help='한 번에 읽을 행 수')
+
+    append_parser = subparsers.add_parser('append', help='새 월 파일을 데이터셋에 추가 (가입번호 + 월 기준 컬럼 중복 제외)')
+    append_parser.add_argument('csv_files', nargs='+', help='새 M-1 / M-2 CSV 경로 (지정한 순서대로 배치 적재)')
+    append_parser.add_argument('--dataset', default=None, help='데이터셋 이름 (기본: 파일명에서 _YYYYMM을 뺀 이름)')
+    append_parser.add_argument('--partition-column', default=None, help='월 기준 컬럼 (새 데이터셋일 때만 사용)')
+    append_parser.add_argument('--chunksize', type=int, default=200000, help='한 번에 읽을 행 수')
+
+    subparsers.add_parser('list', help='데이터셋과 파티션 목록')
+
+    log_parser = subparsers.add_parser('log', help='데이터셋 적재 이력')
+    log_parser.add_argument('dataset', help='데이터셋 이름 (예: ENTR_BY_INS)')
+
+    read_parser = subparsers.add_parser('read', help='월 범위/컬럼을 지정하여 읽기')
+    read_parser.add_argument('dataset', help='데이터셋 이름 (예: ENTR_INT_INS)')
+    read_parser.add_argument('--start', default=None, help='시작 월 (예: 2024-06)')
+    read_parser.add_argument('--end', default=None, help='종료 월 (예: 2024-08)')
+    read_parser.add_argument('--columns', nargs='*', default=None, help='읽을 컬럼')
+    read_parser.add_argument('--output', default=None, help='결과 CSV 경로 (없으면 상위 10행 출력)')
+    args = parser.parse_args()
+
+    store = PartitionedStore(args.root)
+
+    if args.command == 'ingest':
+        for csv_file in args.csv_files:
+            if not os.path.exists(csv_file):
+                print(f"❌ {csv_file} 파일을 찾을 수 없습니다.")
+                continue
+            store.ingest(csv_file, partition_column=args.partition_column, chunksize=args.chunksize)
+    elif args.command == 'append':
+        for csv_file in args.csv_files:
+            if not os.path.exists(csv_file):
+                print(f"❌ {csv_file} 파일을 찾을 수 없습니다.")
+                continue
+            try:
+                store.append(csv_file, dataset=args.dataset, partition_column=args.partition_column,
+                             chunksize=args.chunksize)
+            except ValueError as e:
+                print(f"❌ {str(e)}")
+    elif args.command == 'log':
+        print(store.ingestion_log(args.dataset).to_string(index=False))
+    elif args.command == 'list':
+        datasets = store.datasets()
+        if not datasets:
+            print(f"❌ {args.root}에 데이터셋이 없습니다.")
+        for dataset in datasets:
+            store.summary(dataset)
+    else:
+        df = store.read(args.dataset, columns=args.columns, start=args.start, end=args.end)
+        if args.output:
+            df.to_csv(args.output, index=False, encoding='utf-8')
+            print(f"✅ 저장 완료: {args.output}")
+        else:
+            print(df.head(10).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
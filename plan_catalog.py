@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+요금제 카탈로그
+MVNO_PRD_PLC.csv를 한 번만 읽어 요금제코드 → 행 위치 해시 색인(PlanPolicyIndex)을 만들고,
+가입자 데이터에 요금제 정보를 붙이는 작업을 배열 gather(take) 한 번으로 처리합니다.
+같은 파일은 프로세스 안에서 캐시되므로 노트북/모듈마다 다시 읽거나 다시 해시하지 않습니다.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+from pathlib import Path
+
+from csv_analyzer import get_encoding_candidates
+from plan_policy_index import PlanPolicyIndex, code_keys
+
+# 가입자 데이터에 붙일 기본 요금제 정보 컬럼
+DEFAULT_PLAN_COLUMNS = ['요금제코드', '요금제명', '기본료', '평생할인', '기간할인', '이벤트가', '정책금', '정책반영시작일', '정책반영종료일']
+
+# (절대 경로, 수정 시각, 크기) → PlanCatalog
+_CATALOG_CACHE = {}
+
+class PlanCatalog:
+    """
+    요금제 정보 테이블 + 요금제코드 해시 색인
+    """
+
+    def __init__(self, plan_df, code_column='요금제코드', source=None):
+        """
+        Args:
+            plan_df (pd.DataFrame): 요금제 정보 (MVNO_PRD_PLC.csv)
+            code_column (str): 요금제코드 컬럼명
+            source (str): 요금제 파일 경로 (출력용)
+        """
+        self.plan_df = plan_df.reset_index(drop=True)
+        self.code_column = code_column
+        self.source = source
+        # 요금제코드 해시 색인과 정책반영기간 파싱은 여기서 한 번만 수행
+        self.policy_index = PlanPolicyIndex(self.plan_df, code_column=code_column)
+
+    @classmethod
+    def from_csv(cls, plan_file='csv/MVNO_PRD_PLC.csv', code_column='요금제코드'):
+        """요금제 CSV 파일에서 카탈로그 생성 (인코딩은 파일명 기준 후보를 차례로 시도, 요금제코드는 문자열로 읽음)"""
+        for encoding in get_encoding_candidates(Path(plan_file).name):
+            try:
+                # 숫자로만 된 요금제코드도 앞자리 0을 보존하고 가입자 코드(dtype=str)와 같은 타입으로 비교
+                plan_df = pd.read_csv(plan_file, encoding=encoding, dtype={code_column: str})
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            raise ValueError(f"{plan_file} 로드 실패 - 인코딩 문제")
+        return cls(plan_df, code_column=code_column, source=plan_file)
+
+    def positions(self, codes, dates=None):
+        """
+        요금제코드 배열의 요금제 행 위치 (없는 요금제는 -1)
+
+        Args:
+            codes (array-like): 요금제코드 배열
+            dates (array-like): 기준 날짜 배열 (주어지면 해당 날짜에 적용되는 정책 행)
+
+        Returns:
+            np.ndarray: 행 위치 배열
+        """
+        rows, _ = self.policy_index.lookup(codes, dates)
+        return rows
+
+    def enrich(self, df, code_column, columns=None, dates=None, rows=None):
+        """
+        가입자 데이터에 요금제 정보 붙이기 (요금제코드 기준 left merge와 같은 결과)
+
+        Args:
+            df (pd.DataFrame): 가입자 데이터
+            code_column (str): 가입자 데이터의 요금제코드 컬럼명 (예: 'MVNO상품코드', '개통요금제코드')
+            columns (list): 붙일 요금제 컬럼 (기본: DEFAULT_PLAN_COLUMNS 중 있는 컬럼)
+            dates (array-like): 기준 날짜 배열 (예: get_join_dates(df), 없으면 요금제별 기본 행)
+            rows (np.ndarray): 미리 구한 요금제 행 위치 (positions 결과, 주어지면 다시 찾지 않음)
+
+        Returns:
+            pd.DataFrame: 요금제 정보가 추가된 데이터 (RangeIndex)
+        """
+        if columns is None:
+            columns = [col for col in DEFAULT_PLAN_COLUMNS if col in self.plan_df.columns]
+        if rows is None:
+            rows = self.positions(df[code_column], dates)
+
+        # 가입자 데이터와 이름이 겹치는 컬럼(요금제코드 기준 조인 시)은 요금제 쪽 값으로 교체
+        overlap = [col for col in columns if col in df.columns]
+        subscribers = df.drop(columns=overlap) if overlap else df
+        if not subscribers.index.equals(pd.RangeIndex(len(subscribers))):
+            subscribers = subscribers.reset_index(drop=True)
+
+        # 가입자 데이터는 복사하지 않고 요금제 컬럼만 gather하여 옆에 붙임
+        return pd.concat([subscribers, self.policy_index.take(rows, columns)], axis=1, copy=False)
+
+    def match_stats(self, codes):
+        """
+        요금제코드 매핑 성공/실패 통계
+
+        Args:
+            codes (array-like): 가입자 데이터의 요금제코드 배열
+
+        Returns:
+            dict: total, matched, unmatched, match_rate, unmatched_codes (빈도 내림차순 Series)
+        """
+        codes = pd.Series(np.asarray(codes, dtype=object))
+        matched = self.policy_index.code_index.get_indexer(pd.Index(code_keys(codes))) >= 0
+        total = len(codes)
+        unmatched_codes = codes[~matched].value_counts(dropna=False)
+        return {
+            'total': total,
+            'matched': int(matched.sum()),
+            'unmatched': int(total - matched.sum()),
+            'match_rate': float(matched.mean()) if total else 0.0,
+            'unmatched_codes': unmatched_codes
+        }
+
+    def print_match_stats(self, codes, label='', max_codes=10):
+        """매핑 통계 출력 후 반환"""
+        stats = self.match_stats(codes)
+        total = max(stats['total'], 1)
+        print(f"\n📋 {label} 매핑 결과:" if label else "\n📋 매핑 결과:")
+        print(f"  - 매핑 성공: {stats['matched']:,}건 ({stats['matched'] / total * 100:.1f}%)")
+        print(f"  - 매핑 실패: {stats['unmatched']:,}건 ({stats['unmatched'] / total * 100:.1f}%)")
+
+        unmatched_codes = stats['unmatched_codes']
+        if len(unmatched_codes) > 0:
+            print(f"\n⚠️ 매핑되지 않은 상품코드 ({len(unmatched_codes)}개):")
+            for i, (code, count) in enumerate(unmatched_codes.head(max_codes).items(), 1):
+                print(f"  {i}. {code} ({count:,}건)")
+            if len(unmatched_codes) > max_codes:
+                print(f"  ... 외 {len(unmatched_codes) - max_codes}개")
+        return stats
+
+    def summary(self):
+        """카탈로그 요약 출력"""
+        source = f" ({self.source})" if self.source else ""
+        print(f"✅ 요금제 카탈로그{source}: {len(self.plan_df):,}행 × {self.plan_df.shape[1]}열")
+        self.policy_index.summary()
+
+def load_plan_catalog(plan_file='csv/MVNO_PRD_PLC.csv', code_column='요금제코드'):
+    """
+    요금제 카탈로그를 한 번만 로드하여 재사용 (파일이 바뀌면 다시 로드)
+
+    Args:
+        plan_file (str): 요금제 정보 CSV 경로
+        code_column (str): 요금제코드 컬럼명
+
+    Returns:
+        PlanCatalog: 캐시된 요금제 카탈로그
+    """
+    stat = os.stat(plan_file)
+    key = (os.path.abspath(plan_file), stat.st_mtime_ns, stat.st_size, code_column)
+    if key not in _CATALOG_CACHE:
+        # 같은 파일의 이전 버전은 제거
+        for cached_key in [k for k in _CATALOG_CACHE if k[0] == key[0] and k[3] == code_column]:
+            del _CATALOG_CACHE[cached_key]
+        _CATALOG_CACHE[key] = PlanCatalog.from_csv(plan_file, code_column=code_column)
+    return _CATALOG_CACHE[key]
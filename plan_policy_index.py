@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+요금제 정책 기간 색인
+MVNO_PRD_PLC.csv의 정책반영시작일/종료일을 한 번만 파싱해 두고,
+(요금제코드, 날짜) 배열에 대해 "어떤 정책 행이 적용되는가"를 벡터 연산으로 찾습니다.
+한 요금제에 여러 개의 연속된 정책 기간이 있어도 날짜별로 올바른 행을 고릅니다.
+"""
+
+import pandas as pd
+import numpy as np
+
+from forecast_engine import parse_dates
+
+_MIN_NS = np.iinfo(np.int64).min
+_MAX_NS = np.iinfo(np.int64).max
+
+def _code_key(value):
+    """요금제코드 값 하나를 비교용 문자열로 (100.0 → '100')"""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def code_keys(codes):
+    """
+    요금제코드 배열을 비교용 문자열 배열로 변환
+
+    요금제 파일은 문자열로 읽지만 가입자 데이터는 dtype 추론으로 숫자(100, 100.0)가 될 수 있으므로
+    모든 소비자가 같은 방식으로 비교하도록 고유값만 문자열로 바꿔 다시 펼칩니다.
+
+    Args:
+        codes (array-like): 요금제코드 배열
+
+    Returns:
+        np.ndarray: object 배열 (결측값은 None)
+    """
+    ids, uniques = pd.factorize(pd.Series(codes, copy=False).to_numpy())
+    keys = np.array([_code_key(value) for value in uniques] + [None], dtype=object)
+    return keys[ids]
+
+class PlanPolicyIndex:
+    """
+    요금제코드 + 날짜 → 정책 행 위치 as-of/구간 색인
+
+    - 시작일이 없거나 파싱할 수 없으면 무한 과거, 종료일이 없거나 파싱할 수 없으면
+      (예: 9999-12-31은 pandas 범위를 벗어나 NaT) 무한 미래로 봅니다.
+    - 같은 요금제의 정책 기간은 서로 겹치지 않는 연속 구간이라고 가정하고,
+      날짜 이전에 시작한 가장 최근 정책 행(as-of)의 종료일을 확인합니다.
+    - 어떤 정책 기간에도 속하지 않으면 해당 요금제의 첫 번째 행(기본 행)을 사용합니다.
+    """
+
+    def __init__(self, plan_df, code_column='요금제코드', start_column='정책반영시작일', end_column='정책반영종료일'):
+        """
+        Args:
+            plan_df (pd.DataFrame): 요금제 정보 (MVNO_PRD_PLC.csv)
+            code_column (str): 요금제코드 컬럼명
+            start_column (str): 정책반영시작일 컬럼명
+            end_column (str): 정책반영종료일 컬럼명
+        """
+        self.plan_df = plan_df.reset_index(drop=True)
+        self.code_column = code_column
+        self.start_column = start_column
+        self.end_column = end_column
+
+        codes = pd.Index(code_keys(self.plan_df[code_column]))
+        self.code_index = pd.Index(codes.dropna().unique())
+        self.row_codes = self.code_index.get_indexer(codes)
+
+        n_rows = len(self.plan_df)
+        nat = np.full(n_rows, np.datetime64('NaT'), dtype='datetime64[ns]')
+        self.starts = parse_dates(self.plan_df[start_column]) if start_column in self.plan_df.columns else nat
+        self.ends = parse_dates(self.plan_df[end_column]) if end_column in self.plan_df.columns else nat
+
+        # NaT(int64 최솟값)는 시작일로는 그대로 무한 과거, 종료일은 무한 미래로 변환
+        self.start_ns = self.starts.view(np.int64)
+        self.end_ns = np.where(np.isnat(self.ends), _MAX_NS, self.ends.view(np.int64))
+
+        # 시작일 순위 변환 후 (요금제, 시작일 순위)를 하나의 정수 키로 결합
+        valid_rows = np.nonzero(self.row_codes >= 0)[0]
+        self.unique_starts = np.unique(self.start_ns[valid_rows])
+        self.key_base = len(self.unique_starts) + 1
+        row_ranks = np.searchsorted(self.unique_starts, self.start_ns[valid_rows]) + 1
+
+        # 같은 요금제·시작일이면 파일에서 뒤에 있는 행이 우선 (searchsorted right - 1)
+        order = np.lexsort((valid_rows, row_ranks, self.row_codes[valid_rows]))
+        self.sorted_rows = valid_rows[order]
+        self.sorted_keys = self.row_codes[valid_rows][order].astype(np.int64) * self.key_base + row_ranks[order]
+
+        # 요금제별 기본 행 (파일에서 처음 나오는 행)
+        self.default_rows = np.full(len(self.code_index), -1, dtype=np.int64)
+        first_rows = pd.Series(self.row_codes[valid_rows]).drop_duplicates()
+        self.default_rows[first_rows.to_numpy()] = valid_rows[first_rows.index.to_numpy()]
+
+    def lookup(self, codes, dates=None):
+        """
+        요금제코드와 날짜 배열에 적용되는 정책 행 위치 찾기
+
+        Args:
+            codes (array-like): 요금제코드 배열 (숫자로 읽은 코드도 문자열로 비교)
+            dates (array-like): 기준 날짜 배열 (datetime64 또는 파싱 가능한 값, None이면 기본 행)
+
+        Returns:
+            tuple: (정책 행 위치 배열 (없는 요금제는 -1), 정책 기간 내 여부 배열)
+        """
+        code_ids = self.code_index.get_indexer(pd.Index(code_keys(codes)))
+        known = code_ids >= 0
+        rows = np.where(known, self.default_rows[np.maximum(code_ids, 0)], -1)
+
+        if dates is None:
+            return rows, np.zeros(len(rows), dtype=bool)
+
+        dates = np.asarray(dates)
+        if not np.issubdtype(dates.dtype, np.datetime64):
+            dates = parse_dates(dates)
+        date_ns = dates.astype('datetime64[ns]').view(np.int64)
+        has_date = known & (date_ns != _MIN_NS)
+
+        # as-of: 날짜 이전(포함)에 시작한 같은 요금제의 가장 최근 정책 행
+        query_ranks = np.searchsorted(self.unique_starts, date_ns, side='right')
+        query_keys = code_ids.astype(np.int64) * self.key_base + query_ranks
+        positions = np.searchsorted(self.sorted_keys, query_keys, side='right') - 1
+
+        candidates = self.sorted_rows[np.maximum(positions, 0)]
+        in_window = (has_date & (positions >= 0)
+                     & (self.row_codes[candidates] == code_ids)
+                     & (self.end_ns[candidates] >= date_ns))
+
+        return np.where(in_window, candidates, rows), in_window
+
+    def take(self, rows, columns=None):
+        """
+        정책 행 위치 배열로 요금제 정보 가져오기 (위치가 -1이면 결측값, left merge와 동일)
+
+        Args:
+            rows (np.ndarray): lookup 결과 행 위치 배열
+            columns (list): 가져올 요금제 컬럼 (기본: 전체)
+
+        Returns:
+            pd.DataFrame: 행 위치 순서의 요금제 정보 (RangeIndex)
+        """
+        if columns is None:
+            columns = list(self.plan_df.columns)
+
+        # RangeIndex에 없는 -1은 결측 행이 되며 dtype은 merge와 같이 바뀜 (정수 → 실수)
+        result = self.plan_df[columns].reindex(np.asarray(rows))
+        return result.reset_index(drop=True)
+
+    def values(self, column, rows):
+        """요금제 숫자 컬럼 값 배열 (위치가 -1이면 NaN)"""
+        values = pd.to_numeric(self.plan_df[column], errors='coerce').to_numpy()
+        rows = np.asarray(rows)
+        gathered = values[np.maximum(rows, 0)]
+        if (rows < 0).any():
+            gathered = np.where(rows < 0, np.nan, gathered)
+        return gathered
+
+    def policy_dates(self, rows):
+        """정책 행 위치 배열의 정책반영시작일/종료일 (datetime64, 위치가 -1이면 NaT)"""
+        rows = np.asarray(rows)
+        missing = rows < 0
+        starts = np.where(missing, np.datetime64('NaT'), self.starts[np.maximum(rows, 0)])
+        ends = np.where(missing, np.datetime64('NaT'), self.ends[np.maximum(rows, 0)])
+        return starts, ends
+
+    def summary(self):
+        """색인 요약 출력"""
+        windows_per_code = pd.Series(self.row_codes[self.row_codes >= 0]).value_counts()
+        print(f"✅ 요금제 정책 색인: {len(self.code_index):,}개 요금제, {len(self.plan_df):,}개 정책 행")
+        print(f"  - 여러 정책 기간을 가진 요금제: {(windows_per_code > 1).sum():,}개")
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+상품코드별 통계 엔진
+상품코드별 금액 컬럼의 건수/합계/제곱편차합(M2)/최솟값/최댓값을 합칠 수 있는 누적값으로 보관합니다.
+새 월 파일은 새 행만 읽어 누적값에 더하고, product_stats(합계/평균/표준편차)와
+detailed_stats(비율) 테이블은 원본 행이 아니라 누적값에서 계산합니다.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import json
+import hashlib
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from csv_analyzer import get_encoding_candidates
+
+# 원본 금액 컬럼 → 통계 컬럼명 접두어 (product_statistics.ipynb와 동일한 순서)
+AMOUNT_COLUMNS = {
+    '수납금액': '수납금액',
+    '도매대가합계(1~24+82)': '도매대가',
+    '38.기본료': '기본료',
+    '74.데이타_총사용금액': '데이터사용금액',
+    '41.음성통화_총사용금액': '음성통화금액',
+    '51.SMS_총사용금액': 'SMS금액'
+}
+
+MEASURES = ['n', 'sum', 'm2', 'min', 'max']
+
+def _code_strings(codes):
+    """상품코드를 문자열로 통일 (숫자로 추론된 코드도 같은 키가 되도록, 123.0 → '123')"""
+    if pd.api.types.is_float_dtype(codes) and (codes % 1 == 0).all():
+        codes = codes.astype('Int64')
+    return codes.astype(str)
+
+class ProductStatsEngine:
+    """
+    상품코드별 통계 누적값 (청크/파일 단위로 더할 수 있음)
+
+    - n, sum, min, max는 그대로 더하거나 비교하고,
+    - 분산은 평균 차이를 보정하는 병렬 합산식(Chan et al.)으로 M2를 합쳐
+      합계의 제곱을 빼는 방식보다 큰 금액에서도 수치 오차가 작습니다.
+    """
+
+    def __init__(self, product_column='MVNO상품코드', count_column='가입번호', amount_columns=None):
+        """
+        Args:
+            product_column (str): 상품코드 컬럼명
+            count_column (str): 가입자 수를 셀 컬럼명 (결측이 아닌 값의 수)
+            amount_columns (dict): 원본 금액 컬럼 → 통계 컬럼명 접두어 (기본: AMOUNT_COLUMNS)
+        """
+        self.product_column = product_column
+        self.count_column = count_column
+        self.amount_columns = dict(AMOUNT_COLUMNS if amount_columns is None else amount_columns)
+        columns = list(self.amount_columns)
+
+        self.counts = pd.Series(dtype=np.int64, name=count_column)
+        self.measures = {measure: pd.DataFrame(columns=columns, dtype=np.float64) for measure in MEASURES}
+        self.sources = {}  # 처리한 파일 내용 SHA-256 → 경로, 행 수, 크기, 처리 시각
+
+    def _partial(self, df):
+        """데이터프레임 하나의 상품코드별 누적값 계산"""
+        df = df[df[self.product_column].notna()]
+        groups = _code_strings(df[self.product_column])
+
+        if self.count_column in df.columns:
+            counts = df[self.count_column].notna().groupby(groups).sum().astype(np.int64)
+        else:
+            counts = groups.groupby(groups).size().astype(np.int64)
+
+        amounts = pd.DataFrame(index=df.index)
+        for column in self.amount_columns:
+            amounts[column] = pd.to_numeric(df[column], errors='coerce') if column in df.columns else np.nan
+        grouped = amounts.groupby(groups)
+
+        n = grouped.count().astype(np.float64)
+        measures = {
+            'n': n,
+            'sum': grouped.sum(),
+            'm2': grouped.var(ddof=0) * n,
+            'min': grouped.min(),
+            'max': grouped.max()
+        }
+        measures['m2'] = measures['m2'].fillna(0.0)
+        return counts, measures
+
+    def _fold(self, counts, measures):
+        """상품코드별 누적값을 현재 상태에 합치기"""
+        products = self.counts.index.union(counts.index)
+        self.counts = self.counts.reindex(products, fill_value=0).add(
+            counts.reindex(products, fill_value=0)).astype(np.int64)
+        self.counts.name = self.count_column
+
+        a = {m: self.measures[m].reindex(products).to_numpy(dtype=np.float64) for m in MEASURES}
+        b = {m: measures[m].reindex(index=products, columns=self.measures[m].columns).to_numpy(dtype=np.float64)
+             for m in MEASURES}
+        for m in ['n', 'sum', 'm2']:
+            a[m] = np.nan_to_num(a[m])
+            b[m] = np.nan_to_num(b[m])
+
+        n = a['n'] + b['n']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.where((a['n'] > 0) & (b['n'] > 0), b['sum'] / b['n'] - a['sum'] / a['n'], 0.0)
+            m2 = a['m2'] + b['m2'] + np.where(n > 0, delta ** 2 * a['n'] * b['n'] / n, 0.0)
+
+        merged = {
+            'n': n,
+            'sum': a['sum'] + b['sum'],
+            'm2': m2,
+            'min': np.fmin(a['min'], b['min']),
+            'max': np.fmax(a['max'], b['max'])
+        }
+        columns = self.measures['n'].columns
+        self.measures = {m: pd.DataFrame(values, index=products, columns=columns) for m, values in merged.items()}
+        for frame in self.measures.values():
+            frame.index.name = self.product_column
+        self.counts.index.name = self.product_column
+
+    def update(self, df, source=None):
+        """
+        데이터프레임의 행을 누적값에 더하기
+
+        Args:
+            df (pd.DataFrame): 정산내역 데이터 (예: ENTR_BY_INS.csv의 한 달치, 상품코드는 dtype=str로 읽어야 앞자리 0 보존)
+            source (str): 처리 이력에 기록할 파일 경로 (선택)
+        """
+        if self.product_column not in df.columns:
+            print(f"❌ {self.product_column} 컬럼을 찾을 수 없습니다.")
+            return
+        self._fold(*self._partial(df))
+        if source is not None:
+            self._record_source(source, len(df))
+
+    @staticmethod
+    def source_key(file_path, block_size=1024 * 1024):
+        """
+        처리 이력 키 (파일 내용의 SHA-256)
+
+        경로/수정 시각은 touch, 복사, 같은 내보내기 파일의 재다운로드로 바뀌어 같은 행을 두 번 더하게 되므로
+        내용으로 파일을 식별합니다. 다른 폴더의 같은 이름 파일이나 같은 경로에 다시 내려받은 다음 달 파일은
+        내용이 다르므로 새로 처리됩니다.
+
+        Args:
+            file_path (str): 파일 경로
+            block_size (int): 한 번에 읽을 바이트 수
+
+        Returns:
+            str: 처리 이력 키 (파일이 없으면 절대 경로)
+        """
+        path = Path(file_path)
+        if not path.exists():
+            return path.resolve().as_posix()
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _record_source(self, file_path, rows, key=None):
+        """처리한 파일 기록"""
+        size = os.path.getsize(file_path) if os.path.exists(file_path) else None
+        self.sources[key or self.source_key(file_path)] = {
+            'path': Path(file_path).resolve().as_posix(),
+            'rows': int(rows),
+            'size': size,
+            'processed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def add_file(self, file_path, chunksize=100000):
+        """
+        CSV 파일을 청크 단위로 읽어 누적값에 더하기 (내용이 같은 파일은 이미 처리했으면 건너뜀)
+
+        Args:
+            file_path (str): 정산내역 CSV 경로
+            chunksize (int): 청크 행 수
+
+        Returns:
+            bool: 새로 처리했으면 True
+        """
+        file_name = Path(file_path).name
+        key = self.source_key(file_path)
+        if key in self.sources:
+            recorded = self.sources[key]
+            print(f"ℹ️ {file_name}은 이미 처리된 파일과 내용이 같습니다 ({recorded['path']}, {recorded['rows']:,}행). 건너뜁니다.")
+            return False
+
+        header = None
+        for encoding in get_encoding_candidates(file_name):
+            try:
+                header = pd.read_csv(file_path, encoding=encoding, nrows=0).columns
+                break
+            except UnicodeDecodeError:
+                continue
+        if header is None:
+            print(f"❌ {file_name} 로드 실패 - 인코딩 문제")
+            return False
+
+        usecols = [col for col in [self.product_column, self.count_column] + list(self.amount_columns) if col in header]
+        if self.product_column not in usecols:
+            print(f"❌ {file_name}에 {self.product_column} 컬럼이 없습니다.")
+            return False
+
+        # 청크별 누적값을 모두 더한 뒤 상태에 반영 (중간에 실패하면 상태는 그대로)
+        staged = ProductStatsEngine(self.product_column, self.count_column, self.amount_columns)
+        rows = 0
+        try:
+            # 상품코드는 문자열로 읽음 (월마다 숫자/문자 추론이 달라 같은 상품이 두 키로 갈리거나 00123 → 123이 되지 않도록)
+            for chunk in pd.read_csv(file_path, encoding=encoding, usecols=usecols, chunksize=chunksize,
+                                     dtype={self.product_column: str}):
+                staged._fold(*staged._partial(chunk))
+                rows += len(chunk)
+        except Exception as e:
+            print(f"❌ {file_name} 처리 실패: {str(e)}")
+            return False
+
+        self.merge(staged)
+        self._record_source(file_path, rows, key)
+        print(f"✅ {file_name}: {rows:,}행 추가 (누적 상품 {len(self.counts):,}개)")
+        return True
+
+    def merge(self, other):
+        """다른 엔진의 누적값을 합치기 (예: 월별로 따로 만든 상태)"""
+        self._fold(other.counts, other.measures)
+        self.sources.update(other.sources)
+
+    def product_stats(self, include_min_max=False):
+        """
+        상품코드별 통계 테이블 (groupby(...).agg(count/sum/mean/std).round(2)와 같은 형식)
+
+        Args:
+            include_min_max (bool): 금액 컬럼별 최솟값/최댓값 컬럼 추가
+
+        Returns:
+            pd.DataFrame: 상품코드 인덱스의 가입자수, 금액별 합계/평균/표준편차
+        """
+        stats = pd.DataFrame(index=self.counts.index)
+        stats['가입자수'] = self.counts
+
+        n = self.measures['n']
+        for column, label in self.amount_columns.items():
+            count = n[column]
+            stats[f'{label}_합계'] = self.measures['sum'][column]
+            stats[f'{label}_평균'] = self.measures['sum'][column] / count.where(count > 0)
+            # 표본 표준편차 (ddof=1, 건수가 1 이하면 NaN)
+            stats[f'{label}_표준편차'] = np.sqrt((self.measures['m2'][column] / (count - 1).where(count > 1)).clip(lower=0))
+            if include_min_max:
+                stats[f'{label}_최솟값'] = self.measures['min'][column]
+                stats[f'{label}_최댓값'] = self.measures['max'][column]
+
+        return stats.sort_index().round(2)
+
+    def detailed_stats(self):
+        """
+        비율 컬럼을 추가한 상세 통계 테이블 (가입자 수 내림차순)
+
+        Returns:
+            pd.DataFrame: product_stats + 수납금액/가입자수 비율, 상품당 평균수납금액
+        """
+        detailed = self.product_stats().reset_index()
+        detailed['수납금액_총합_비율(%)'] = (detailed['수납금액_합계'] / detailed['수납금액_합계'].sum() * 100).round(2)
+        detailed['가입자수_비율(%)'] = (detailed['가입자수'] / detailed['가입자수'].sum() * 100).round(2)
+        detailed['상품당_평균수납금액'] = (detailed['수납금액_합계'] / detailed['가입자수']).round(2)
+        return detailed.sort_values('가입자수', ascending=False)
+
+    def save(self, state_file='product_stats_state.json'):
+        """누적값과 처리 이력을 JSON 파일로 저장"""
+        def to_list(frame):
+            values = frame.to_numpy(dtype=np.float64)
+            return [[None if np.isnan(v) else float(v) for v in row] for row in values]
+
+        state = {
+            'product_column': self.product_column,
+            'count_column': self.count_column,
+            'amount_columns': self.amount_columns,
+            'products': self.counts.index.tolist(),
+            'counts': self.counts.astype(int).tolist(),
+            'measures': {m: to_list(frame) for m, frame in self.measures.items()},
+            'sources': self.sources
+        }
+        with open(state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        print(f"✅ 상품 통계 상태 저장: {state_file} ({len(self.counts):,}개 상품, 파일 {len(self.sources)}개)")
+
+    @classmethod
+    def load(cls, state_file='product_stats_state.json'):
+        """JSON 상태 파일에서 엔진 복원"""
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        engine = cls(state['product_column'], state['count_column'], state['amount_columns'])
+        index = pd.Index([str(code) for code in state['products']], dtype=object, name=engine.product_column)
+        engine.counts = pd.Series(state['counts'], index=index, dtype=np.int64, name=engine.count_column)
+        engine.measures = {
+            m: pd.DataFrame(np.array(values, dtype=np.float64).reshape(len(index), len(engine.amount_columns)),
+                            index=index, columns=list(engine.amount_columns))
+            for m, values in state['measures'].items()
+        }
+        engine.sources = state.get('sources', {})
+        return engine
+
+    def summary(self):
+        """누적 상태 요약 출력"""
+        print(f"📊 상품 통계 누적 상태: {len(self.counts):,}개 상품, 가입자 {self.counts.sum():,}명")
+        for info in self.sources.values():
+            print(f"  - {info['path']}: {info['rows']:,}행 ({info['processed_at']})")
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='상품코드별 통계 누적 갱신')
+    parser.add_argument('files', nargs='+', help='정산내역 CSV 경로 (예: csv/ENTR_BY_INS.csv)')
+    parser.add_argument('--state-file', default='product_stats_state.json', help='누적 상태 JSON 경로')
+    parser.add_argument('--output', default='product_statistics.csv', help='상품코드별 통계 CSV 경로')
+    parser.add_argument('--detailed-output', default='detailed_product_statistics.csv', help='상세 통계 CSV 경로')
+    args = parser.parse_args()
+
+    print("📈 상품코드별 통계 누적 갱신 프로그램")
+    print("=" * 60)
+
+    if os.path.exists(args.state_file):
+        engine = ProductStatsEngine.load(args.state_file)
+        print(f"🔄 기존 상태 로드: {args.state_file}")
+    else:
+        engine = ProductStatsEngine()
+
+    for file_path in args.files:
+        engine.add_file(file_path)
+
+    engine.save(args.state_file)
+    engine.summary()
+
+    engine.product_stats().to_csv(args.output, encoding='utf-8')
+    engine.detailed_stats().to_csv(args.detailed_output, encoding='utf-8')
+    print(f"✅ 통계 저장: {args.output}, {args.detailed_output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+검색 품질/성능 벤치마크
+Ollama와 PostgreSQL 없이 doc/ 문서를 결정적 해싱 임베딩으로 로컬 벡터 저장소에 색인하고,
+정답 청크가 정해진 질문 세트로 검색 설정(벡터 / 양자화 벡터 / BM25 / 하이브리드)별
+색인 처리량, 검색 지연 시간 백분위수(p50/p95/p99), recall@k, MRR을 측정해 실행마다 JSON 보고서로 남깁니다.
+같은 문서와 설정이면 실행마다 같은 청크/임베딩/순위가 나오므로 보고서끼리 비교할 수 있습니다.
+"""
+
+import io
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from contextlib import nullcontext, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from document_embedder import EMBEDDING_DIMENSION, load_and_embed_documents
+from markdown_chunker import MAX_CHUNK_TOKENS
+from local_vector_store import LocalVectorStore
+from hybrid_search import HybridRetriever, relevant_chunks_by_keywords, tokenize
+
+BENCHMARK_REPORT_DIR = 'benchmark_reports'
+BENCHMARK_K = 5  # 평가할 결과 수
+BENCHMARK_REPEAT = 20  # 지연 시간 측정 시 질문 세트를 반복할 횟수
+
+# 질문 → 정답 판정 키워드 (키워드가 본문에 있는 청크가 정답, doc/guide.md의 API 이름 기준)
+BENCHMARK_QUERIES = [
+    ("파일 업로드는 어떻게 하나요?", ["File.upload"]),
+    ("JWT 토큰을 갱신하는 방법", ["BzToken.renewToken"]),
+    ("푸시 알림 키를 가져오려면?", ["Push.getPushKey"]),
+    ("데이터베이스에서 SQL 쿼리를 실행하는 방법", ["Database.executeSql"]),
+    ("이미지 크기를 줄이는 방법", ["File.resizeImage"]),
+    ("압축 파일을 푸는 방법", ["File.unzip"]),
+    ("카메라로 사진을 찍으려면 어떻게 하나요?", ["System.callCamera"]),
+    ("현재 위치 GPS 정보 조회", ["System.getGPS"]),
+    ("앱 언어를 바꾸는 방법", ["BzLocale.changeLocale"]),
+    ("암호화 통신 초기화 방법", ["BzCrypto.init"]),
+    ("영구 저장소에 값을 저장하는 방법", ["Properties.set("]),
+    ("로그인 요청은 어떻게 보내나요?", ["Network.requestLogin"]),
+    ("외부 API 서버와 HTTP 통신하는 방법", ["Network.requestHttp"]),
+    ("태블릿 기기인지 확인하는 방법", ["Device.isTablet"]),
+    ("QR 코드나 바코드를 읽는 방법", ["Window.openCodeReader"]),
+    ("서명 패드 화면 열기", ["Window.openSignPad"]),
+    ("읽지 않은 푸시 메시지 수 조회", ["Push.getUnreadCount"]),
+    ("트랜잭션 시작과 커밋, 롤백", ["Database.beginTransaction"]),
+    ("로그를 남기는 방법", ["Logger.info"]),
+    ("이벤트 리스너를 등록하는 방법", ["Event.setEvent"])
+]
+
+# 측정할 검색 설정 (이름 → 벡터 저장소 양자화 방식, 검색 경로)
+BENCHMARK_CONFIGS = {
+    'vector': (None, 'vector'),
+    'vector_sq8': ('sq8', 'vector'),
+    'vector_pq': ('pq', 'vector'),
+    'bm25': (None, 'keyword'),
+    'hybrid': (None, 'hybrid')
+}
+
+def hashing_embedding(text: str, dim: int = EMBEDDING_DIMENSION) -> List[float]:
+    """
+    결정적 오프라인 임베딩 (Ollama 대체)
+
+    hybrid_search.tokenize 토큰(한글 2-gram, 영문 단어)을 부호 있는 특징 해싱으로 dim 차원에 모으고
+    (1 + log 빈도) 가중치 후 L2 정규화합니다. 프로세스/실행마다 같은 벡터가 나옵니다.
+
+    Args:
+        text (str): 텍스트
+        dim (int): 임베딩 차원수
+
+    Returns:
+        List[float]: 정규화된 임베딩
+    """
+    counts = {}
+    for token in tokenize(text):
+        counts[token] = counts.get(token, 0) + 1
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for token, count in counts.items():
+        digest = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+        sign = 1.0 if digest >> 63 else -1.0
+        vector[digest % dim] += sign * (1.0 + np.log(count))
+
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).tolist()
+
+def hashing_embed_batch(texts: List[str], dim: int = EMBEDDING_DIMENSION) -> List[List[float]]:
+    """load_and_embed_documents(embed_batch=...)용 배치 함수"""
+    return [hashing_embedding(text, dim) for text in texts]
+
+def _percentiles(times: List[float]) -> Dict[str, float]:
+    return {
+        'latency_mean_ms': float(np.mean(times)),
+        'latency_p50_ms': float(np.percentile(times, 50)),
+        'latency_p95_ms': float(np.percentile(times, 95)),
+        'latency_p99_ms': float(np.percentile(times, 99))
+    }
+
+def score_rankings(rankings: List[List[int]], relevant_sets: List[set], k: int) -> Dict[str, float]:
+    """
+    질의별 검색 결과 id 순위로 recall@k, MRR@k, hit@k 계산
+
+    Args:
+        rankings (List[List[int]]): 질의별 결과 청크 id (순위 순)
+        relevant_sets (List[set]): 질의별 정답 청크 id 집합
+        k (int): 평가할 결과 수
+
+    Returns:
+        Dict[str, float]: recall@k (정답이 k개보다 많으면 k개를 모두 맞혔을 때 1), mrr@k, hit@k
+    """
+    recalls, reciprocal_ranks, hits = [], [], []
+    for ranking, relevant in zip(rankings, relevant_sets):
+        top = ranking[:k]
+        found = relevant.intersection(top)
+        recalls.append(len(found) / min(len(relevant), k) if relevant else 1.0)
+        first = next((rank for rank, chunk_id in enumerate(top, 1) if chunk_id in relevant), None)
+        reciprocal_ranks.append(1.0 / first if first else 0.0)
+        hits.append(1.0 if found else 0.0)
+    return {f'recall@{k}': float(np.mean(recalls)), f'mrr@{k}': float(np.mean(reciprocal_ranks)),
+            f'hit@{k}': float(np.mean(hits))}
+
+def _build_store(root: Path, doc_folder: str, quantization: Optional[str], max_tokens: int,
+                 embed_batch: Callable, verbose: bool = False) -> Tuple[LocalVectorStore, Dict]:
+    """벤치마크용 로컬 저장소에 문서를 처음부터 색인하고 처리량 측정 (verbose가 아니면 색인 로그 숨김)"""
+    log = io.StringIO()
+    with nullcontext() if verbose else redirect_stdout(log):
+        store = LocalVectorStore(root, embedding_dim=EMBEDDING_DIMENSION, embedding_model='hashing',
+                                 quantization=quantization)
+        store.connect()
+        store.setup_tables()
+
+        start = time.perf_counter()
+        indexed = load_and_embed_documents(store, doc_folder, model='hashing', embed_batch=embed_batch,
+                                           cache_path=None, max_tokens=max_tokens, dedup_report_path=None)
+        embed_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        if indexed:
+            store.ensure_index()
+        index_seconds = time.perf_counter() - start
+    if not indexed:
+        print(log.getvalue())
+        raise RuntimeError(f"'{doc_folder}' 문서 색인에 실패했습니다")
+
+    chunks = store.stats()['total_chunks']
+    total_seconds = embed_seconds + index_seconds
+    return store, {
+        'chunks': chunks,
+        'index_seconds': total_seconds,
+        'quantizer_seconds': index_seconds,
+        'chunks_per_second': chunks / max(total_seconds, 1e-9)
+    }
+
+def run_benchmark(doc_folder: str = 'doc', k: int = BENCHMARK_K, repeat: int = BENCHMARK_REPEAT,
+                  configs: Optional[List[str]] = None, max_tokens: int = MAX_CHUNK_TOKENS,
+                  queries: List[Tuple[str, List[str]]] = BENCHMARK_QUERIES,
+                  embed_query: Callable = hashing_embedding, embed_batch: Callable = hashing_embed_batch,
+                  verbose: bool = False) -> Dict:
+    """
+    검색 설정별 색인 처리량 / 지연 시간 백분위수 / recall@k / MRR 측정
+
+    설정마다 임시 폴더에 저장소를 새로 만들어 색인하고(청킹 → 중복 제거 → 임베딩 → 저장 → 양자화 코드),
+    질의 임베딩은 미리 만들어 검색 자체의 지연 시간만 잽니다.
+
+    Args:
+        doc_folder (str): 문서 폴더
+        k (int): 평가할 결과 수
+        repeat (int): 지연 시간 측정 반복 횟수
+        configs (List[str]): 측정할 설정 이름 (None이면 BENCHMARK_CONFIGS 전체)
+        max_tokens (int): 청크 최대 추정 토큰 수
+        queries (List[Tuple[str, List[str]]]): [(질문, 정답 판정 키워드)]
+        embed_query (Callable): 질의 → 임베딩 (기본: 해싱 임베딩)
+        embed_batch (Callable): 텍스트 리스트 → 임베딩 리스트 (기본: 해싱 임베딩)
+        verbose (bool): 색인 과정 로그 출력 여부
+
+    Returns:
+        Dict: 보고서 (settings, corpus, results: 설정별 지표, per_query: 설정별 질의의 첫 정답 순위)
+    """
+    configs = configs or list(BENCHMARK_CONFIGS)
+    unknown = [name for name in configs if name not in BENCHMARK_CONFIGS]
+    if unknown:
+        raise ValueError(f"알 수 없는 설정: {', '.join(unknown)} (사용 가능: {', '.join(BENCHMARK_CONFIGS)})")
+
+    workdir = Path(tempfile.mkdtemp(prefix='retrieval_benchmark_'))
+    results, per_query, corpus = [], {}, {}
+    try:
+        query_embeddings = [embed_query(question) for question, _ in queries]
+        stores = {}  # 양자화 방식 → (저장소, 색인 지표)
+        for name in configs:
+            quantization, path = BENCHMARK_CONFIGS[name]
+            if quantization not in stores:
+                stores[quantization] = _build_store(workdir / (quantization or 'float32'), doc_folder,
+                                                    quantization, max_tokens, embed_batch, verbose)
+            store, indexing = stores[quantization]
+
+            chunks = store.chunks()
+            relevant_sets = [relevant_chunks_by_keywords(chunks, keywords) for _, keywords in queries]
+            if not corpus:
+                corpus = {
+                    'chunks': len(chunks),
+                    'files': store.stats()['total_files'],
+                    'queries': len(queries),
+                    'queries_without_answer': sum(1 for relevant in relevant_sets if not relevant),
+                    'chunk_signature': hashlib.sha256('\n'.join(text for _, _, _, text in chunks).encode('utf-8')).hexdigest()
+                }
+
+            retriever = HybridRetriever(store, embed_query=embed_query, index_path=str(workdir / f'bm25_{name}.json'))
+            indexing = dict(indexing)
+            if path != 'vector':
+                start = time.perf_counter()
+                retriever.refresh(verbose=False)
+                bm25_seconds = time.perf_counter() - start
+                indexing['bm25_seconds'] = bm25_seconds
+                indexing['index_seconds'] += bm25_seconds
+                indexing['chunks_per_second'] = indexing['chunks'] / max(indexing['index_seconds'], 1e-9)
+
+            run = {
+                'vector': lambda question, embedding: store.search(embedding, limit=k, similarity_threshold=-1.0),
+                'keyword': lambda question, embedding: retriever.keyword_search(question, k),
+                'hybrid': lambda question, embedding: retriever.search(question, k, query_embedding=embedding)
+            }[path]
+
+            rankings = [[hit['id'] for hit in run(question, embedding)]
+                        for (question, _), embedding in zip(queries, query_embeddings)]
+            times = []
+            for _ in range(repeat):
+                for (question, _), embedding in zip(queries, query_embeddings):
+                    start = time.perf_counter()
+                    run(question, embedding)
+                    times.append((time.perf_counter() - start) * 1000)
+
+            results.append(dict({'config': name, 'index': store.index_definition() if path != 'keyword' else 'BM25'},
+                                **indexing, **_percentiles(times), **score_rankings(rankings, relevant_sets, k)))
+            per_query[name] = [
+                next((rank for rank, chunk_id in enumerate(ranking, 1) if chunk_id in relevant), None)
+                for ranking, relevant in zip(rankings, relevant_sets)
+            ]
+            print(f"  ✅ {name}: recall@{k} {results[-1][f'recall@{k}']:.3f}, MRR {results[-1][f'mrr@{k}']:.3f}, "
+                  f"p95 {results[-1]['latency_p95_ms']:.3f}ms")
+
+        with redirect_stdout(io.StringIO()):
+            for store, _ in stores.values():
+                store.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'settings': {'doc_folder': doc_folder, 'k': k, 'repeat': repeat, 'max_tokens': max_tokens,
+                     'embedding': 'hashing', 'embedding_dim': EMBEDDING_DIMENSION},
+        'corpus': corpus,
+        'results': results,
+        'per_query': {'questions': [question for question, _ in queries], 'first_relevant_rank': per_query}
+    }
+
+def _git_commit() -> Optional[str]:
+    """현재 git 커밋 (git 저장소가 아니면 None)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save_report(report: Dict, report_dir: str = BENCHMARK_REPORT_DIR) -> Path:
+    """보고서를 report_dir/retrieval_<시각>.json으로 저장 (저장한 경로 반환)"""
+    path = Path(report_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    stem = f"retrieval_{report['created_at'].replace(':', '').replace('-', '')}"
+    path, suffix = path / f"{stem}.json", 1
+    while path.exists():  # 같은 초에 실행한 보고서는 번호를 붙여 따로 저장
+        suffix += 1
+        path = path.with_name(f"{stem}_{suffix}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+def report_table(report: Dict) -> pd.DataFrame:
+    """보고서 설정별 지표 표"""
+    k = report['settings']['k']
+    columns = ['config', 'chunks_per_second', 'latency_p50_ms', 'latency_p95_ms', 'latency_p99_ms',
+               f'recall@{k}', f'mrr@{k}', f'hit@{k}']
+    return pd.DataFrame(report['results'])[columns].set_index('config')
+
+def compare_reports(previous: Dict, current: Dict) -> pd.DataFrame:
+    """
+    두 보고서의 설정별 지표 차이 (현재 - 이전)
+
+    Args:
+        previous (Dict): 이전 실행 보고서
+        current (Dict): 현재 실행 보고서
+
+    Returns:
+        pd.DataFrame: 두 보고서에 모두 있는 설정의 지표 차이
+    """
+    if previous['settings']['k'] != current['settings']['k']:
+        raise ValueError(f"k가 달라 비교할 수 없습니다 ({previous['settings']['k']} != {current['settings']['k']})")
+    if previous.get('corpus', {}).get('chunk_signature') != current.get('corpus', {}).get('chunk_signature'):
+        print("⚠️  두 실행의 청크 구성이 다릅니다 (청킹/중복 제거/문서 변경) - 지표 차이에 청크 변화가 포함됩니다")
+    before, after = report_table(previous), report_table(current)
+    common = [name for name in after.index if name in before.index]
+    return after.loc[common] - before.loc[common]
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='검색 설정별 색인 처리량/지연 시간/recall@k/MRR 벤치마크 (오프라인)')
+    parser.add_argument('--doc-folder', default='doc', help='문서 폴더')
+    parser.add_argument('--k', type=int, default=BENCHMARK_K, help='평가할 결과 수')
+    parser.add_argument('--repeat', type=int, default=BENCHMARK_REPEAT, help='지연 시간 측정 반복 횟수')
+    parser.add_argument('--configs', nargs='+', default=None, choices=list(BENCHMARK_CONFIGS), help='측정할 설정')
+    parser.add_argument('--max-tokens', type=int, default=MAX_CHUNK_TOKENS, help='청크 최대 추정 토큰 수')
+    parser.add_argument('--report-dir', default=BENCHMARK_REPORT_DIR, help='보고서 저장 폴더')
+    parser.add_argument('--compare', default=None, help='비교할 이전 보고서 JSON')
+    parser.add_argument('--verbose', action='store_true', help='색인 과정 로그 출력')
+    args = parser.parse_args()
+
+    print(f"🏁 검색 벤치마크: {args.doc_folder}, 질문 {len(BENCHMARK_QUERIES)}개, k={args.k}")
+    report = run_benchmark(args.doc_folder, k=args.k, repeat=args.repeat, configs=args.configs,
+                           max_tokens=args.max_tokens, verbose=args.verbose)
+
+    corpus = report['corpus']
+    print(f"\n📊 {corpus['files']}개 파일 / {corpus['chunks']}개 청크 / 질문 {corpus['queries']}개 "
+          f"(정답 없는 질문 {corpus['queries_without_answer']}개)")
+    print(report_table(report).to_string(float_format=lambda value: f"{value:.3f}"))
+
+    path = save_report(report, args.report_dir)
+    print(f"\n💾 보고서 저장: {path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        print(f"\n🔍 {args.compare} 대비 변화 (현재 - 이전)")
+        print(compare_reports(previous, report).to_string(float_format=lambda value: f"{value:+.3f}"))
+
+if __name__ == "__main__":
+    main()
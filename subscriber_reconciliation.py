@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+가입자 대사(reconciliation) 프로그램
+ENTR_BY_INS.csv(M-2 정산내역)와 ENTR_INT_INS.csv(M-1 신규 가입자)에서 키 컬럼만 청크 단위로 읽어
+정렬된 정수 배열로 만들고, 정렬 병합으로 공통/한쪽에만 있는 가입자와 속성 불일치를 찾아 보고서를 생성합니다.
+메모리는 행 수 × 키 폭(컬럼당 8바이트)에 비례하며, 원본 행 전체는 메모리에 올리지 않습니다.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from csv_analyzer import get_encoding_candidates
+
+KEY_COLUMN = '가입번호'
+ATTRIBUTE_COLUMNS = ['고객번호', '청구계정번호', '고객명']
+
+# 결측 속성값의 해시 (실제 값의 해시가 0일 확률은 무시할 수 있음)
+_MISSING_HASH = np.uint64(0)
+
+def _normalize(series):
+    """값을 비교 가능한 문자열로 정규화 (공백 제거, 정수형 실수의 '.0' 제거, 빈 문자열은 결측)"""
+    values = series.astype(str).str.strip().str.replace(r'\.0+$', '', regex=True)
+    return values.where(series.notna() & (values != ''))
+
+def _hash_values(series):
+    """속성값을 고정 폭 64비트 해시로 변환 (결측은 _MISSING_HASH)"""
+    values = _normalize(series)
+    hashed = pd.util.hash_array(values.fillna('').to_numpy(dtype=object))
+    return np.where(values.isna().to_numpy(), _MISSING_HASH, hashed)
+
+def _read_header(file_path):
+    """파일 헤더와 인코딩 확인"""
+    for encoding in get_encoding_candidates(Path(file_path).name):
+        try:
+            return pd.read_csv(file_path, encoding=encoding, nrows=0).columns.tolist(), encoding
+        except UnicodeDecodeError:
+            continue
+    return None, None
+
+def extract_keys(file_path, key_column=KEY_COLUMN, attribute_columns=None, chunksize=200000):
+    """
+    파일에서 키 컬럼과 속성 컬럼만 읽어 키 기준으로 정렬된 배열 생성
+
+    Args:
+        file_path (str): CSV 파일 경로
+        key_column (str): 가입자 키 컬럼 (정수형, 예: 가입번호)
+        attribute_columns (list): 비교할 속성 컬럼 (없는 컬럼은 무시, 기본: ATTRIBUTE_COLUMNS)
+        chunksize (int): 청크 행 수
+
+    Returns:
+        dict: keys (정렬된 고유 키 int64), attributes (컬럼 → 키별 첫 행의 해시 uint64),
+              rows, invalid_keys, duplicate_rows, internal_conflicts (컬럼 → 한 키에 값이 여러 개인 키 수)
+    """
+    header, encoding = _read_header(file_path)
+    if header is None:
+        raise ValueError(f"{Path(file_path).name} 로드 실패 - 인코딩 문제")
+    if key_column not in header:
+        raise ValueError(f"{Path(file_path).name}에 키 컬럼 {key_column}이 없습니다.")
+
+    attribute_columns = [col for col in (ATTRIBUTE_COLUMNS if attribute_columns is None else attribute_columns)
+                         if col in header and col != key_column]
+
+    key_parts = []
+    attribute_parts = {col: [] for col in attribute_columns}
+    rows = 0
+    invalid_keys = 0
+
+    # 모든 값을 문자열로 읽어 정수/실수 혼용('123' vs '123.0')에도 같은 키가 되도록 정규화
+    for chunk in pd.read_csv(file_path, encoding=encoding, usecols=[key_column] + attribute_columns,
+                             dtype=str, chunksize=chunksize):
+        rows += len(chunk)
+        keys = pd.to_numeric(_normalize(chunk[key_column]), errors='coerce')
+        valid = (keys.notna() & (keys == np.floor(keys))).to_numpy()
+        invalid_keys += int((~valid).sum())
+
+        key_parts.append(keys.to_numpy()[valid].astype(np.int64))
+        for col in attribute_columns:
+            attribute_parts[col].append(_hash_values(chunk[col])[valid])
+
+    keys = np.concatenate(key_parts) if key_parts else np.array([], dtype=np.int64)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    # 키별 첫 행 (정렬이 안정적이므로 파일에서 처음 나온 행)
+    unique_keys, first_positions = np.unique(sorted_keys, return_index=True)
+    group_ids = np.repeat(np.arange(len(unique_keys)), np.diff(np.append(first_positions, len(sorted_keys))))
+
+    attributes = {}
+    internal_conflicts = {}
+    for col in attribute_columns:
+        values = np.concatenate(attribute_parts[col])[order]
+        first_values = values[first_positions]
+        attributes[col] = first_values
+        # 같은 키에서 첫 행과 다른 값이 있는 키 수 (월별 정산 행 간 속성 변경 등)
+        differs = values != first_values[group_ids]
+        internal_conflicts[col] = int(len(np.unique(group_ids[differs])))
+
+    return {
+        'file': Path(file_path).name,
+        'key_column': key_column,
+        'keys': unique_keys,
+        'attributes': attributes,
+        'rows': rows,
+        'invalid_keys': invalid_keys,
+        'duplicate_rows': int(len(sorted_keys) - len(unique_keys)),
+        'internal_conflicts': internal_conflicts,
+        'memory_bytes': int(unique_keys.nbytes + sum(values.nbytes for values in attributes.values()))
+    }
+
+def reconcile(left, right):
+    """
+    두 키 배열의 정렬 병합 대사
+
+    Args:
+        left (dict): extract_keys 결과 (예: ENTR_BY_INS)
+        right (dict): extract_keys 결과 (예: ENTR_INT_INS)
+
+    Returns:
+        dict: common_keys, only_left_keys, only_right_keys, mismatches (컬럼 → 불일치 키 배열),
+              missing (컬럼 → 한쪽이라도 값이 없는 공통 키 수)
+    """
+    # 두 배열 모두 정렬된 고유 키이므로 병합 한 번으로 교집합과 양쪽 위치를 구함
+    common_keys, left_positions, right_positions = np.intersect1d(
+        left['keys'], right['keys'], assume_unique=True, return_indices=True)
+
+    left_only = np.ones(len(left['keys']), dtype=bool)
+    left_only[left_positions] = False
+    right_only = np.ones(len(right['keys']), dtype=bool)
+    right_only[right_positions] = False
+
+    mismatches = {}
+    missing = {}
+    for col in left['attributes']:
+        if col not in right['attributes']:
+            continue
+        left_values = left['attributes'][col][left_positions]
+        right_values = right['attributes'][col][right_positions]
+        has_both = (left_values != _MISSING_HASH) & (right_values != _MISSING_HASH)
+        mismatches[col] = common_keys[has_both & (left_values != right_values)]
+        missing[col] = int((~has_both).sum())
+
+    return {
+        'left': left,
+        'right': right,
+        'common_keys': common_keys,
+        'only_left_keys': left['keys'][left_only],
+        'only_right_keys': right['keys'][right_only],
+        'mismatches': mismatches,
+        'missing': missing
+    }
+
+def reconcile_files(left_file='csv/ENTR_BY_INS.csv', right_file='csv/ENTR_INT_INS.csv',
+                    key_column=KEY_COLUMN, attribute_columns=None, chunksize=200000):
+    """
+    두 파일의 키를 추출하여 대사
+
+    Args:
+        left_file (str): 왼쪽 파일 (기본: M-2 정산내역)
+        right_file (str): 오른쪽 파일 (기본: M-1 신규 가입자)
+        key_column (str): 가입자 키 컬럼
+        attribute_columns (list): 비교할 속성 컬럼 (양쪽 모두에 있는 컬럼만 비교)
+        chunksize (int): 청크 행 수
+
+    Returns:
+        dict: reconcile 결과 (+ elapsed_seconds)
+    """
+    start_time = time.time()
+    print(f"🔄 키 추출: {Path(left_file).name}")
+    left = extract_keys(left_file, key_column, attribute_columns, chunksize)
+    print(f"🔄 키 추출: {Path(right_file).name}")
+    right = extract_keys(right_file, key_column, attribute_columns, chunksize)
+
+    result = reconcile(left, right)
+    result['elapsed_seconds'] = time.time() - start_time
+
+    print(f"✅ 대사 완료 ({result['elapsed_seconds']:.1f}초)")
+    print(f"  - {left['file']} 고유 {key_column}: {len(left['keys']):,}개")
+    print(f"  - {right['file']} 고유 {key_column}: {len(right['keys']):,}개")
+    print(f"  - 공통: {len(result['common_keys']):,}개")
+    for col, keys in result['mismatches'].items():
+        print(f"  - {col} 불일치: {len(keys):,}개")
+    return result
+
+def _rate(part, whole):
+    return part / whole * 100 if whole else 0.0
+
+def generate_reconciliation_report(result, output_file='subscriber_reconciliation.md', sample_size=10):
+    """
+    대사 결과 마크다운 보고서 생성
+
+    Args:
+        result (dict): reconcile_files 결과
+        output_file (str): 출력 마크다운 파일 경로
+        sample_size (int): 구분별로 표시할 키 샘플 수
+    """
+    left, right = result['left'], result['right']
+    key_column = left['key_column']
+    n_common = len(result['common_keys'])
+
+    md_content = []
+    md_content.append("# 가입자 대사 보고서")
+    md_content.append(f"\n생성일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    md_content.append(f"\n- **대사 키**: `{key_column}`")
+    md_content.append(f"- **대상 파일**: {left['file']} ↔ {right['file']}")
+    if 'elapsed_seconds' in result:
+        md_content.append(f"- **소요 시간**: {result['elapsed_seconds']:.1f}초")
+
+    md_content.append("\n## 📊 파일별 키 현황")
+    md_content.append("\n| 파일 | 전체 행 수 | 고유 키 수 | 중복 행 수 | 잘못된 키 | 키 배열 메모리 |")
+    md_content.append("|------|------------|------------|------------|-----------|----------------|")
+    for side in [left, right]:
+        md_content.append(f"| {side['file']} | {side['rows']:,} | {len(side['keys']):,} | {side['duplicate_rows']:,} | "
+                          f"{side['invalid_keys']:,} | {side['memory_bytes'] / 1024**2:.2f} MB |")
+
+    md_content.append("\n## 🔗 대사 결과")
+    md_content.append("\n| 구분 | 키 수 | 비율 |")
+    md_content.append("|------|-------|------|")
+    md_content.append(f"| 공통 | {n_common:,} | {_rate(n_common, len(left['keys'])):.2f}% ({left['file']} 기준), "
+                      f"{_rate(n_common, len(right['keys'])):.2f}% ({right['file']} 기준) |")
+    md_content.append(f"| {left['file']}에만 있음 | {len(result['only_left_keys']):,} | "
+                      f"{_rate(len(result['only_left_keys']), len(left['keys'])):.2f}% |")
+    md_content.append(f"| {right['file']}에만 있음 | {len(result['only_right_keys']):,} | "
+                      f"{_rate(len(result['only_right_keys']), len(right['keys'])):.2f}% |")
+
+    if result['mismatches']:
+        md_content.append("\n## ⚠️ 공통 가입자 속성 불일치")
+        md_content.append("\n| 속성 | 불일치 키 수 | 불일치율 | 한쪽 결측 | 파일 내 값 변경 키 (왼쪽/오른쪽) |")
+        md_content.append("|------|--------------|----------|-----------|-------------------------------|")
+        for col, keys in result['mismatches'].items():
+            md_content.append(f"| `{col}` | {len(keys):,} | {_rate(len(keys), n_common):.2f}% | {result['missing'][col]:,} | "
+                              f"{left['internal_conflicts'][col]:,} / {right['internal_conflicts'][col]:,} |")
+    else:
+        md_content.append("\n비교할 공통 속성 컬럼이 없습니다.")
+
+    md_content.append(f"\n## 📋 {key_column} 샘플")
+    samples = [(f"{left['file']}에만 있음", result['only_left_keys']),
+               (f"{right['file']}에만 있음", result['only_right_keys'])]
+    samples += [(f"`{col}` 불일치", keys) for col, keys in result['mismatches'].items()]
+    for title, keys in samples:
+        md_content.append(f"\n### {title} ({len(keys):,}개)")
+        if len(keys) == 0:
+            md_content.append("- 없음")
+        for key in keys[:sample_size]:
+            md_content.append(f"- {key}")
+        if len(keys) > sample_size:
+            md_content.append(f"- ... 외 {len(keys) - sample_size:,}개")
+
+    try:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(md_content))
+        print(f"✅ 대사 보고서가 '{output_file}' 파일로 저장되었습니다.")
+    except Exception as e:
+        print(f"❌ 보고서 저장 중 오류 발생: {str(e)}")
+
+def export_keys(result, output_file='subscriber_reconciliation_keys.csv'):
+    """한쪽에만 있는 키와 속성 불일치 키를 CSV로 저장 (키와 구분만 저장)"""
+    key_column = result['left']['key_column']
+    frames = [
+        pd.DataFrame({key_column: result['only_left_keys'], '구분': f"{result['left']['file']}에만 있음"}),
+        pd.DataFrame({key_column: result['only_right_keys'], '구분': f"{result['right']['file']}에만 있음"})
+    ]
+    frames += [pd.DataFrame({key_column: keys, '구분': f'{col} 불일치'}) for col, keys in result['mismatches'].items()]
+    pd.concat(frames, ignore_index=True).to_csv(output_file, index=False, encoding='utf-8')
+    print(f"✅ 대사 키 목록 저장: {output_file}")
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='ENTR_BY_INS ↔ ENTR_INT_INS 가입자 대사')
+    parser.add_argument('--left', default='csv/ENTR_BY_INS.csv', help='왼쪽 파일 (기본: M-2 정산내역)')
+    parser.add_argument('--right', default='csv/ENTR_INT_INS.csv', help='오른쪽 파일 (기본: M-1 신규 가입자)')
+    parser.add_argument('--key', default=KEY_COLUMN, help='가입자 키 컬럼')
+    parser.add_argument('--attributes', nargs='*', default=None, help='비교할 속성 컬럼 (기본: 고객번호 청구계정번호 고객명)')
+    parser.add_argument('--output', default='subscriber_reconciliation.md', help='보고서 경로')
+    parser.add_argument('--export-keys', default=None, help='불일치 키 목록 CSV 경로 (선택)')
+    parser.add_argument('--chunksize', type=int, default=200000, help='청크 행 수')
+    args = parser.parse_args()
+
+    print("👥 가입자 대사 프로그램 시작")
+    print("=" * 60)
+
+    for file_path in [args.left, args.right]:
+        if not os.path.exists(file_path):
+            print(f"❌ {file_path} 파일을 찾을 수 없습니다.")
+            return
+
+    try:
+        result = reconcile_files(args.left, args.right, args.key, args.attributes, args.chunksize)
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        return
+
+    generate_reconciliation_report(result, args.output)
+    if args.export_keys:
+        export_keys(result, args.export_keys)
+
+if __name__ == "__main__":
+    main()
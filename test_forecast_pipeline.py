@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+forecast_pipeline.py 테스트 (작은 요금제/가입자 CSV로 실행)
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from forecast_pipeline import ForecastPipeline, CODE_COLUMN_CANDIDATES
+from plan_catalog import PlanCatalog
+
+def write_plan_file(folder, codes=('P100', 'P200')):
+    plan_file = os.path.join(folder, 'MVNO_PRD_PLC.csv')
+    pd.DataFrame({
+        '요금제코드': list(codes),
+        '요금제명': ['기본 요금제', '데이터 요금제'],
+        '기본료': [10000, 30000],
+        '평생할인': [1000, 5000],
+        '기간할인': [0, 0],
+        '이벤트가': [0, 0],
+        '정책금': [0, 0],
+        '정책반영시작일': ['2024-01-01', '2024-01-01'],
+        '정책반영종료일': ['2099-12-31', '2099-12-31']
+    }).to_csv(plan_file, index=False, encoding='utf-8')
+    return plan_file
+
+def test_code_column_candidates():
+    print("🧪 요금제코드 후보 컬럼마다 파이프라인 실행 (요금제코드 컬럼이 겹쳐도 동작)")
+    root = tempfile.mkdtemp()
+    try:
+        pipeline = ForecastPipeline(write_plan_file(root), months_ahead=3, chunksize=2)
+        for code_column in CODE_COLUMN_CANDIDATES:
+            input_file = os.path.join(root, f'subscribers_{code_column}.csv')
+            pd.DataFrame({
+                '가입번호': [1, 2, 3],
+                code_column: ['P100', 'P200', 'P999'],
+                '가입일자': ['2024-03-01', '2024-05-15', '2024-06-01']
+            }).to_csv(input_file, index=False, encoding='utf-8')
+
+            for matched_only in (True, False):
+                output_file = os.path.join(root, f'forecast_{code_column}_{matched_only}.csv')
+                summary = pipeline.run(input_file, output_file, matched_only=matched_only)
+                assert summary['total_rows'] == 3 and summary['matched_rows'] == 2
+                assert summary['written_rows'] == (2 if matched_only else 3)
+
+                output = pd.read_csv(output_file)
+                assert list(output.columns).count('요금제코드') == 1
+                assert output[code_column].tolist()[:2] == ['P100', 'P200']
+                assert output['요금제명'].tolist()[:2] == ['기본 요금제', '데이터 요금제']
+                if not matched_only:
+                    assert output[code_column].iloc[2] == 'P999'
+            print(f"   ✅ {code_column}")
+    finally:
+        shutil.rmtree(root)
+
+def test_numeric_plan_codes():
+    print("🧪 숫자로만 된 요금제코드도 문자열/숫자 가입자 코드와 매핑")
+    root = tempfile.mkdtemp()
+    try:
+        catalog = PlanCatalog.from_csv(write_plan_file(root, codes=('0100', '200')))
+        assert catalog.plan_df['요금제코드'].tolist() == ['0100', '200']
+        # column_mapper처럼 dtype=str로 읽은 코드와 dtype 추론으로 숫자가 된 코드 모두 같은 방식으로 비교
+        assert catalog.match_stats(['0100', '200', '300'])['matched'] == 2
+        assert catalog.match_stats([200, 200.0, float('nan')])['matched'] == 2
+        enriched = catalog.enrich(pd.DataFrame({'MVNO상품코드': ['0100', '100', '200']}), 'MVNO상품코드')
+        assert enriched['요금제명'].isna().tolist() == [False, True, False]
+        print("   ✅ 통과")
+    finally:
+        shutil.rmtree(root)
+
+def test_parquet_schema():
+    print("🧪 Parquet 출력: 큰 가입번호 보존, 청크마다 다른 코드/결측 정수 컬럼도 한 스키마로 기록")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    root = tempfile.mkdtemp()
+    try:
+        pipeline = ForecastPipeline(write_plan_file(root, codes=('100', 'P200')), months_ahead=3, chunksize=2)
+        input_file = os.path.join(root, 'subscribers.csv')
+        large_ids = [2**53 + 1, 2**53 + 3, 9007199254740995, 9223372036854775807]
+        pd.DataFrame({
+            '가입번호': large_ids,
+            # 첫 청크는 숫자로만, 두 번째 청크는 문자열로 추론되는 코드
+            'MVNO상품코드': ['100', '100', 'P200', 'P200'],
+            '약정개월': ['24', '12', '', '36'],
+            '가입일자': ['2024-03-01', '2024-05-15', '2024-06-01', '2024-07-01']
+        }).to_csv(input_file, index=False, encoding='utf-8')
+
+        output_file = os.path.join(root, 'forecast.parquet')
+        summary = pipeline.run(input_file, output_file)
+        assert summary['written_rows'] == 4
+
+        table = pq.read_table(output_file)
+        assert table.schema.field('가입번호').type == pa.string()
+        assert table.schema.field('MVNO상품코드').type == pa.string()
+        assert table.schema.field('요금제코드').type == pa.string()
+        assert table.schema.field('약정개월').type == pa.int64()
+        assert table.column('가입번호').to_pylist() == [str(value) for value in large_ids]
+        assert table.column('MVNO상품코드').to_pylist() == ['100', '100', 'P200', 'P200']
+        assert table.column('약정개월').to_pylist() == [24, 12, None, 36]
+        print("   ✅ 통과")
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == "__main__":
+    test_code_column_candidates()
+    test_numeric_plan_codes()
+    test_parquet_schema()
+    print("\n🎉 모든 테스트 통과!")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+local_vector_store.py 테스트 (PostgreSQL/Ollama 없이 실행)
+"""
+
+import sys
+import json
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from local_vector_store import LocalVectorStore, top_k, METADATA_FILE, CHANGES_FILE
+from document_embedder import load_and_embed_documents
+
+DIM = 64
+
+def fake_embed_batch(texts):
+    """글자 빈도 기반 결정적 임베딩 (Ollama 대신 사용)"""
+    vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for ch in text:
+            vectors[i, ord(ch) % DIM] += 1
+    return vectors.tolist()
+
+def make_rows(vectors, filename='a.md'):
+    return [{
+        'filename': filename,
+        'content': 'content',
+        'chunk_index': i,
+        'chunk_text': f'chunk {i}',
+        'embedding': vector,
+        'metadata': {'chunk_size': 7},
+        'content_hash': f'{filename}-{i}'
+    } for i, vector in enumerate(vectors)]
+
+def test_exact_top_k():
+    print("🧪 블록 단위 상위 k개 = 전체 정렬 결과")
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(1000, DIM)).astype(np.float32)
+    queries = rng.normal(size=(20, DIM)).astype(np.float32)
+    positions, scores = top_k(matrix, queries, k=10, block_rows=128)
+    expected = np.argsort(-(queries @ matrix.T), axis=1)[:, :10]
+    assert (positions == expected).all()
+    assert (np.diff(scores, axis=1) <= 0).all()
+    print("   ✅ 통과")
+
+def test_insert_search_persist():
+    print("🧪 저장 → 검색 → 다시 열기 → 삭제 → 초기화")
+    root = tempfile.mkdtemp()
+    try:
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(300, DIM)).astype(np.float32)
+        store = LocalVectorStore(root, embedding_dim=DIM)
+        assert store.connect() and store.setup_tables()
+        assert store.insert(make_rows(vectors[:200])) == 200
+        assert store.insert(make_rows(vectors[200:], 'b.md')) == 100
+
+        query = vectors[42] + rng.normal(scale=0.01, size=DIM)
+        results = store.search(query, limit=5)
+        cosine = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)) @ (query / np.linalg.norm(query))
+        assert [r['chunk_index'] for r in results][0] == 42
+        assert np.isclose(results[0]['similarity'], cosine.max(), atol=1e-5)
+        assert all(r['similarity'] > 0.5 for r in store.search(query, limit=5, similarity_threshold=0.5))
+
+        # 다시 열어도 같은 결과
+        reopened = LocalVectorStore(root, embedding_dim=DIM)
+        assert reopened.connect() and reopened.setup_tables()
+        assert [r['id'] for r in reopened.search(query, limit=5)] == [r['id'] for r in results]
+
+        # 삭제 후 남은 행의 벡터가 그대로인지
+        reopened.delete([row[0] for row in reopened.chunk_rows() if row[1] == 'a.md'])
+        stats = reopened.stats()
+        assert stats['total_files'] == 1 and stats['total_chunks'] == 100
+        assert reopened.search(vectors[250], limit=1)[0]['chunk_index'] == 50
+
+        reopened.clear()
+        assert reopened.stats()['total_chunks'] == 0 and reopened.search(query) == []
+        print("   ✅ 통과")
+    finally:
+        shutil.rmtree(root)
+
+def test_crash_recovery():
+    print("🧪 변경 로그 추가 저장과 중단 복구 (잘린 로그 줄, 전환 전 삭제 중단, 로그 비우기 전 중단)")
+    root = tempfile.mkdtemp()
+    try:
+        rng = np.random.default_rng(3)
+        vectors = rng.normal(size=(60, DIM)).astype(np.float32)
+        store = LocalVectorStore(root, embedding_dim=DIM)
+        store.connect()
+        store.setup_tables()
+        metadata_path = os.path.join(root, METADATA_FILE)
+        changes_path = os.path.join(root, CHANGES_FILE)
+
+        # 삽입/갱신은 metadata.json을 다시 쓰지 않고 변경 로그에만 추가
+        snapshot = open(metadata_path, 'rb').read()
+        store.insert(make_rows(vectors[:20]))
+        store.insert(make_rows(vectors[20:40], 'b.md'))
+        store.update_chunks([(1, 'new content', 5, {'chunk_size': 9})])
+        assert open(metadata_path, 'rb').read() == snapshot
+        assert len(open(changes_path, 'rb').read().splitlines()) == 3
+
+        # 마지막 로그 줄 기록 중 중단 → 해당 변경만 빠지고 잘린 줄은 제거
+        with open(changes_path, 'ab') as f:
+            f.write(b'{"op": "insert", "rows": [{"id": 41')
+        reopened = LocalVectorStore(root, embedding_dim=DIM)
+        reopened.connect()
+        assert reopened.stats()['total_chunks'] == 40
+        assert reopened.chunk_rows()[0][2] == 5 and reopened._meta['files']['a.md'] == 'new content'
+        reopened.insert(make_rows(vectors[40:], 'c.md'))
+        assert reopened.search(vectors[45], limit=1)[0]['filename'] == 'c.md'
+
+        # 삭제가 다음 세대 벡터 파일만 쓰고 metadata.json 교체 전에 중단 → 이전 세대 그대로
+        next_file = os.path.join(root, 'vectors.1.f32')
+        np.zeros((3, DIM), dtype=np.float32).tofile(next_file)
+        reopened = LocalVectorStore(root, embedding_dim=DIM)
+        reopened.connect()
+        assert reopened.stats()['total_chunks'] == 60
+        assert reopened.search(vectors[10], limit=1)[0]['chunk_index'] == 10
+
+        reopened.delete([row[0] for row in reopened.chunk_rows() if row[1] == 'a.md'])
+        assert sorted(os.listdir(root)) == sorted([METADATA_FILE, CHANGES_FILE, 'vectors.1.f32'])
+        assert reopened.search(vectors[30], limit=1)[0]['filename'] == 'b.md'
+
+        # 스냅샷 저장 후 로그를 비우기 전에 중단 → 남은 로그 항목은 sequence로 건너뜀
+        reopened.insert(make_rows(vectors[:5], 'd.md'))
+        pending_log = open(changes_path, 'rb').read()
+        reopened._save()
+        with open(changes_path, 'wb') as f:
+            f.write(pending_log)
+        reopened = LocalVectorStore(root, embedding_dim=DIM)
+        reopened.connect()
+        assert reopened.stats()['total_chunks'] == 45
+        assert len({row[0] for row in reopened.chunk_rows()}) == 45
+        print("   ✅ 통과")
+    finally:
+        shutil.rmtree(root)
+
+def test_incremental_documents():
+    print("🧪 load_and_embed_documents 증분 색인 (로컬 저장소)")
+    root = tempfile.mkdtemp()
+    try:
+        doc_folder = os.path.join(root, 'doc')
+        os.makedirs(doc_folder)
+        paragraphs = [f"섹션 {i}: " + "문서 내용 예시 문장입니다. " * 30 for i in range(6)]
+        with open(os.path.join(doc_folder, 'guide.md'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(paragraphs))
+
+        calls = []
+        def embed(texts):
+            calls.extend(texts)
+            return fake_embed_batch(texts)
+
+        store = LocalVectorStore(os.path.join(root, 'store'), embedding_dim=DIM)
+        store.connect()
+        store.setup_tables()
+        cache_path = os.path.join(root, 'cache.sqlite')
+        assert load_and_embed_documents(store, doc_folder, embed_batch=embed, cache_path=cache_path,
+                                        dedup_report_path=None)
+        first_total = store.stats()['total_chunks']
+        assert first_total > 0 and calls
+
+        calls.clear()
+        assert load_and_embed_documents(store, doc_folder, embed_batch=embed, cache_path=cache_path,
+                                        dedup_report_path=None)
+        assert calls == [] and store.stats()['total_chunks'] == first_total
+
+        # 마지막 섹션만 수정 → 바뀐 청크만 임베딩
+        paragraphs[-1] = "섹션 5: 수정된 내용입니다. " * 30
+        with open(os.path.join(doc_folder, 'guide.md'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(paragraphs))
+        calls.clear()
+        assert load_and_embed_documents(store, doc_folder, embed_batch=embed, cache_path=cache_path,
+                                        dedup_report_path=None)
+        assert 0 < len(calls) < first_total
+        assert any('수정된' in r['chunk_text'] for r in store.search(fake_embed_batch(['수정된 내용입니다.'])[0], limit=3))
+        print(f"   ✅ 통과 (전체 {first_total}개 청크 중 {len(calls)}개만 다시 임베딩)")
+    finally:
+        shutil.rmtree(root)
+
+def test_duplicate_documents():
+    print("🧪 중복 문서 청크는 한 번만 임베딩")
+    root = tempfile.mkdtemp()
+    try:
+        doc_folder = os.path.join(root, 'doc')
+        os.makedirs(os.path.join(doc_folder, 'archive'))
+        os.makedirs(os.path.join(doc_folder, '.ipynb_checkpoints'))
+        content = '\n\n'.join(f"## 섹션 {i}\n\n" + f"섹션 {i}의 문서 내용 예시 문장입니다. " * 20 for i in range(4))
+        for path in ['guide.md', os.path.join('archive', 'guide-copy.md')]:
+            with open(os.path.join(doc_folder, path), 'w', encoding='utf-8') as f:
+                f.write(content)
+        # 체크포인트 사본(옛 내용)은 읽지 않음
+        with open(os.path.join(doc_folder, '.ipynb_checkpoints', 'guide-checkpoint.md'), 'w', encoding='utf-8') as f:
+            f.write("## 옛 섹션\n\n" + "더 이상 없는 옛 문서 내용입니다. " * 20)
+
+        calls = []
+        def embed(texts):
+            calls.extend(texts)
+            return fake_embed_batch(texts)
+
+        store = LocalVectorStore(os.path.join(root, 'store'), embedding_dim=DIM)
+        store.connect()
+        store.setup_tables()
+        report_path = os.path.join(root, 'dedup_report.json')
+        assert load_and_embed_documents(store, doc_folder, embed_batch=embed, cache_path=None,
+                                        dedup_report_path=report_path)
+        stats = store.stats()
+        assert stats['total_files'] == 1 and stats['total_chunks'] == len(calls) == 4
+        result = store.search(fake_embed_batch([content.split('\n\n')[1]])[0], limit=1)[0]
+        assert result['filename'] == 'guide.md'
+        assert result['metadata']['duplicates'][0]['filename'] == 'archive/guide-copy.md'
+        assert not any('옛' in text for text in calls)
+        with open(report_path, encoding='utf-8') as f:
+            assert json.load(f)['removed_chunks'] == 4
+        print(f"   ✅ 통과 (8개 청크 중 {len(calls)}개만 임베딩)")
+    finally:
+        shutil.rmtree(root)
+
+def test_quantized_search():
+    print("🧪 양자화 코드 후보 → float32 re-rank (sq8 / pq)")
+    rng = np.random.default_rng(3)
+    topics = rng.normal(size=(16, 768))
+    vectors = (topics[rng.integers(0, 16, 3000)] + 0.8 * rng.normal(size=(3000, 768))).astype(np.float32)
+    queries = vectors[:30] + 0.05 * rng.normal(size=(30, 768)).astype(np.float32)
+    for kind in ('sq8', 'pq'):
+        root = tempfile.mkdtemp()
+        try:
+            store = LocalVectorStore(root, embedding_dim=768, quantization=kind)
+            store.connect()
+            store.setup_tables()
+            store.insert(make_rows(vectors[:2500]))
+            store.ensure_index()
+            store.insert(make_rows(vectors[2500:], filename='b.md'))  # 학습 후 추가 행도 인코딩
+            store.delete([1, 2])
+
+            reopened = LocalVectorStore(root, embedding_dim=768, quantization=kind)
+            reopened.connect()
+            assert reopened.index_type == kind and len(reopened._codes) == 2998
+            recalls = []
+            for query in queries:
+                expected = {hit['id'] for hit in reopened.search(query, limit=10, exact=True)}
+                hits = reopened.search(query, limit=10)
+                recalls.append(len(expected & {hit['id'] for hit in hits}) / 10)
+                assert all(a['similarity'] >= b['similarity'] for a, b in zip(hits, hits[1:]))
+            assert np.mean(recalls) >= 0.9, (kind, np.mean(recalls))
+            definition = reopened.index_definition()
+
+            reopened.clear()
+            assert not reopened.quantizer_path.exists()
+            print(f"   ✅ {kind} 통과 (recall@10 {np.mean(recalls):.3f}, {definition})")
+        finally:
+            shutil.rmtree(root)
+
+def test_search_latency():
+    print("🧪 검색 지연 시간 (5,000개 청크 × 768차원)")
+    root = tempfile.mkdtemp()
+    try:
+        rng = np.random.default_rng(2)
+        vectors = rng.normal(size=(5000, 768)).astype(np.float32)
+        store = LocalVectorStore(root, embedding_dim=768)
+        store.connect()
+        store.setup_tables()
+        store.insert(make_rows(vectors))
+        times = []
+        for query in vectors[:200]:
+            start = time.perf_counter()
+            store.search(query, limit=5)
+            times.append((time.perf_counter() - start) * 1000)
+        p50, p95 = np.percentile(times, [50, 95])
+        print(f"   ⚡ p50 {p50:.3f}ms, p95 {p95:.3f}ms")
+        # 블록 내적 한 번 + argpartition이면 1ms 안팎 (느린 환경을 고려한 느슨한 상한)
+        assert p50 < 5, f"검색 p50 {p50:.3f}ms"
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == "__main__":
+    test_exact_top_k()
+    test_insert_search_persist()
+    test_crash_recovery()
+    test_incremental_documents()
+    test_duplicate_documents()
+    test_quantized_search()
+    test_search_latency()
+    print("\n🎉 모든 테스트 통과!")
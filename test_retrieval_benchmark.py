@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+retrieval_benchmark.py 테스트 (PostgreSQL/Ollama 없이 실행)
+"""
+
+import sys
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from retrieval_benchmark import (hashing_embedding, score_rankings, run_benchmark, save_report,
+                                 compare_reports)
+
+def test_hashing_embedding():
+    print("🧪 해싱 임베딩은 결정적이고 정규화됨")
+    first = hashing_embedding("파일 업로드는 File.upload로 합니다")
+    second = hashing_embedding("파일 업로드는 File.upload로 합니다")
+    assert first == second
+    assert abs(np.linalg.norm(first) - 1.0) < 1e-5
+    similar = np.dot(first, hashing_embedding("파일 업로드 방법"))
+    unrelated = np.dot(first, hashing_embedding("푸시 알림 배지 개수"))
+    assert similar > unrelated
+    assert not any(hashing_embedding(""))
+    print("   ✅ 통과")
+
+def test_score_rankings():
+    print("🧪 recall@k / MRR / hit@k 계산")
+    scores = score_rankings([[3, 1, 2], [5, 6, 7], [9, 8]], [{1, 2}, {4}, {8}], k=2)
+    # 질의 1: 정답 2개 중 1개 (2위), 질의 2: 없음, 질의 3: 2위
+    assert abs(scores['recall@2'] - (0.5 + 0 + 1) / 3) < 1e-9
+    assert abs(scores['mrr@2'] - (0.5 + 0 + 0.5) / 3) < 1e-9
+    assert abs(scores['hit@2'] - 2 / 3) < 1e-9
+    print("   ✅ 통과")
+
+def test_run_benchmark():
+    print("🧪 벤치마크 실행 → JSON 보고서 → 같은 입력이면 같은 품질 지표")
+    root = tempfile.mkdtemp()
+    try:
+        doc_folder = os.path.join(root, 'doc')
+        os.makedirs(doc_folder)
+        sections = {
+            '파일': "파일 업로드는 File.upload를 사용합니다. 업로드 진행률을 받을 수 있습니다. ",
+            '푸시': "푸시 알림 키는 Push.getPushKey로 조회합니다. 푸시 서버에 등록합니다. ",
+            '토큰': "JWT 토큰 갱신은 BzToken.renewToken을 호출합니다. 만료 전에 갱신합니다. "
+        }
+        with open(os.path.join(doc_folder, 'guide.md'), 'w', encoding='utf-8') as f:
+            f.write('# 가이드\n\n' + '\n\n'.join(f"## {title}\n\n{text * 5}" for title, text in sections.items()))
+        queries = [("파일 업로드 방법", ["File.upload"]), ("푸시 알림 키 조회", ["Push.getPushKey"]),
+                   ("토큰 갱신", ["BzToken.renewToken"])]
+
+        reports = [run_benchmark(doc_folder, k=2, repeat=2, configs=['vector', 'vector_sq8', 'bm25', 'hybrid'],
+                                 queries=queries) for _ in range(2)]
+        report = reports[0]
+        assert [result['config'] for result in report['results']] == ['vector', 'vector_sq8', 'bm25', 'hybrid']
+        assert report['corpus']['chunks'] == 3 and report['corpus']['queries_without_answer'] == 0
+        for result in report['results']:
+            assert result['chunks_per_second'] > 0
+            assert result['latency_p50_ms'] <= result['latency_p95_ms'] <= result['latency_p99_ms']
+            assert result['recall@2'] == 1.0, result
+        assert reports[0]['per_query'] == reports[1]['per_query']
+
+        path = save_report(report, os.path.join(root, 'reports'))
+        with open(path, encoding='utf-8') as f:
+            loaded = json.load(f)
+        delta = compare_reports(loaded, reports[1])
+        assert (delta['recall@2'] == 0).all() and (delta['mrr@2'] == 0).all()
+        print(f"   ✅ 통과 ({path.name})")
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == "__main__":
+    test_hashing_embedding()
+    test_score_rankings()
+    test_run_benchmark()
+    print("\n🎉 모든 테스트 통과!")
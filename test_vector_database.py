@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+vector_database.py COPY 바이너리 인코딩 테스트 (PostgreSQL 없이 실행)
+"""
+
+import sys
+import json
+import os
+import struct
+import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from vector_database import (copy_binary_rows, encode_vector, COPY_BINARY_HEADER, COPY_BINARY_TRAILER,
+                             DOCUMENT_COLUMNS)
+
+def parse_copy_rows(data):
+    """COPY 바이너리 입력을 행별 필드(bytes, NULL은 None) 목록으로 다시 읽기"""
+    assert data[:11] == b'PGCOPY\n\xff\r\n\x00'
+    flags, extension = struct.unpack('>ii', data[11:19])
+    assert flags == 0 and extension == 0
+    offset, rows = 19, []
+    while True:
+        (field_count,) = struct.unpack('>h', data[offset:offset + 2])
+        offset += 2
+        if field_count == -1:
+            break
+        fields = []
+        for _ in range(field_count):
+            (length,) = struct.unpack('>i', data[offset:offset + 4])
+            offset += 4
+            if length == -1:
+                fields.append(None)
+            else:
+                fields.append(data[offset:offset + length])
+                offset += length
+        rows.append(fields)
+    assert offset == len(data), "종료 표시 뒤에 남는 바이트가 없어야 함"
+    return rows
+
+def test_encode_vector():
+    print("🧪 pgvector 바이너리: 차원 int16 + 예약 int16 + float32 big-endian")
+    embedding = [0.5, -1.25, 3.0e-8, 1234.5]
+    encoded = encode_vector(embedding)
+    assert len(encoded) == 4 + 4 * len(embedding)
+    assert struct.unpack('>hh', encoded[:4]) == (len(embedding), 0)
+    values = np.frombuffer(encoded[4:], dtype='>f4')
+    assert np.array_equal(values, np.asarray(embedding, dtype=np.float32))
+    print("   ✅ 통과")
+
+def test_copy_binary_rows():
+    print("🧪 COPY 바이너리: 헤더/종료 표시, 필드 길이, NULL content_hash")
+    rows = [
+        {'filename': 'guide.md', 'content': '# 가이드', 'chunk_index': 3, 'chunk_text': '파일 업로드',
+         'embedding': [0.1, 0.2, 0.3], 'metadata': {'heading_path': ['가이드', '파일']}, 'content_hash': 'abc123'},
+        {'filename': 'b.md', 'content': '', 'chunk_index': 0, 'chunk_text': '푸시',
+         'embedding': [1.0, 0.0, -1.0], 'metadata': None, 'content_hash': None}
+    ]
+    data = copy_binary_rows(rows)
+    assert data.startswith(COPY_BINARY_HEADER) and len(COPY_BINARY_HEADER) == 19
+    assert data.endswith(COPY_BINARY_TRAILER) and COPY_BINARY_TRAILER == b'\xff\xff'
+
+    parsed = parse_copy_rows(data)
+    assert len(parsed) == 2 and all(len(fields) == len(DOCUMENT_COLUMNS) for fields in parsed)
+    for row, fields in zip(rows, parsed):
+        values = dict(zip(DOCUMENT_COLUMNS, fields))
+        assert values['filename'].decode('utf-8') == row['filename']
+        assert values['content'].decode('utf-8') == row['content']
+        assert values['chunk_text'].decode('utf-8') == row['chunk_text']
+        assert len(values['chunk_index']) == 4 and struct.unpack('>i', values['chunk_index'])[0] == row['chunk_index']
+        assert values['embedding'] == encode_vector(row['embedding'])
+        # jsonb 바이너리: 버전 1 + JSON 텍스트 (metadata가 없으면 빈 객체)
+        assert values['metadata'][:1] == b'\x01'
+        assert json.loads(values['metadata'][1:].decode('utf-8')) == (row['metadata'] or {})
+    assert parsed[0][DOCUMENT_COLUMNS.index('content_hash')] == b'abc123'
+    assert parsed[1][DOCUMENT_COLUMNS.index('content_hash')] is None
+    # NULL은 길이 -1만 있고 값 바이트가 없음
+    assert data[-6:] == struct.pack('>i', -1) + COPY_BINARY_TRAILER
+
+    assert copy_binary_rows([]) == COPY_BINARY_HEADER + COPY_BINARY_TRAILER
+    print(f"   ✅ 통과 ({len(data)}바이트)")
+
+if __name__ == "__main__":
+    test_encode_vector()
+    test_copy_binary_rows()
+    print("\n🎉 모든 테스트 통과!")
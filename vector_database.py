@@ -0,0 +1,696 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PostgreSQL + pgvector 벡터 데이터베이스
+문서 청크 테이블(documents)을 만들고 HNSW 또는 IVFFlat 근사 최근접 이웃(ANN) 색인을 생성/유지합니다.
+검색은 색인을 탈 수 있는 `ORDER BY embedding <=> 질의 LIMIT k` 형태로 후보를 가져온 뒤 유사도 임계값을 적용하며,
+색인 검색과 정확 검색(전체 스캔)의 지연 시간과 재현율(recall@k)을 비교하는 벤치마크를 제공합니다.
+청크 저장은 배치 단위 트랜잭션의 COPY (바이너리 형식, 벡터도 바이너리로 인코딩)로 하고,
+검색은 스레드 안전한 연결 풀에서 연결을 빌려 동시에 실행합니다.
+"""
+
+import io
+import json
+import time
+import struct
+import argparse
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from document_embedder import EMBEDDING_MODEL, EMBEDDING_DIMENSION
+
+# 기본 접속 설정 (노트북은 DB_CONFIG로 덮어씀)
+DEFAULT_DB_CONFIG = {
+    'host': 'localhost',
+    'port': 5432,
+    'database': 'vector_qa',
+    'user': 'postgres',
+    'password': 'postgres'
+}
+
+EMBEDDING_INDEX_NAME = 'documents_embedding_idx'
+
+# ANN 색인 설정
+VECTOR_INDEX_TYPE = 'hnsw'  # 'hnsw' 또는 'ivfflat'
+HNSW_M = 16  # 노드별 연결 수 (클수록 재현율↑, 색인 크기/생성 시간↑)
+HNSW_EF_CONSTRUCTION = 64  # 색인 생성 시 후보 목록 크기
+HNSW_EF_SEARCH = 40  # 검색 시 후보 목록 크기 (LIMIT보다 작으면 결과가 LIMIT보다 적을 수 있음)
+IVFFLAT_PROBES = 10  # 검색 시 살펴볼 리스트 수
+IVFFLAT_MIN_LISTS = 10
+
+# 저장/연결 설정
+INSERT_BATCH_ROWS = 500  # 트랜잭션 하나에 저장할 청크 수
+POOL_SIZE = 4  # 검색/저장용 연결 풀 크기 (self.conn 제외)
+
+DOCUMENT_COLUMNS = ['filename', 'content', 'chunk_index', 'chunk_text', 'embedding', 'metadata', 'content_hash']
+
+# PostgreSQL COPY 바이너리 형식 헤더 (서명 + 플래그 + 헤더 확장 길이)
+COPY_BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+COPY_BINARY_TRAILER = struct.pack('>h', -1)
+
+def ivfflat_lists(row_count: int) -> int:
+    """
+    IVFFlat 리스트 수 (pgvector 권장: 100만 행까지 행 수 / 1000, 그 이상은 sqrt(행 수))
+
+    Args:
+        row_count (int): 색인할 행 수
+
+    Returns:
+        int: 리스트 수
+    """
+    if row_count > 1_000_000:
+        return int(np.sqrt(row_count))
+    return max(IVFFLAT_MIN_LISTS, row_count // 1000)
+
+def _copy_field(value: Optional[bytes]) -> bytes:
+    """COPY 바이너리 필드 (길이 + 값, NULL은 길이 -1)"""
+    if value is None:
+        return struct.pack('>i', -1)
+    return struct.pack('>i', len(value)) + value
+
+def _copy_text(value: Optional[str]) -> Optional[bytes]:
+    return None if value is None else value.encode('utf-8')
+
+def encode_vector(embedding) -> bytes:
+    """pgvector 바이너리 형식 (차원 int16 + 예약 int16 + float32 big-endian 값)"""
+    values = np.asarray(embedding, dtype='>f4')
+    return struct.pack('>hh', len(values), 0) + values.tobytes()
+
+def copy_binary_rows(rows: List[Dict]) -> bytes:
+    """
+    documents 청크 행 → COPY ... FROM STDIN (FORMAT BINARY) 입력
+
+    Args:
+        rows (List[Dict]): filename, content, chunk_index, chunk_text, embedding, metadata, content_hash
+
+    Returns:
+        bytes: 헤더 + 행 + 종료 표시
+    """
+    buffer = io.BytesIO()
+    buffer.write(COPY_BINARY_HEADER)
+    field_count = struct.pack('>h', len(DOCUMENT_COLUMNS))
+    for row in rows:
+        buffer.write(field_count)
+        buffer.write(_copy_field(_copy_text(row['filename'])))
+        buffer.write(_copy_field(_copy_text(row['content'])))
+        buffer.write(_copy_field(struct.pack('>i', int(row['chunk_index']))))
+        buffer.write(_copy_field(_copy_text(row['chunk_text'])))
+        buffer.write(_copy_field(encode_vector(row['embedding'])))
+        # jsonb 바이너리 형식: 버전(1) + JSON 텍스트
+        buffer.write(_copy_field(b'\x01' + json.dumps(row.get('metadata') or {}, ensure_ascii=False).encode('utf-8')))
+        buffer.write(_copy_field(_copy_text(row.get('content_hash'))))
+    buffer.write(COPY_BINARY_TRAILER)
+    return buffer.getvalue()
+
+def _require_psycopg2():
+    """psycopg2 + pgvector 어댑터 (필요할 때만 import)"""
+    try:
+        import psycopg2
+        import psycopg2.pool
+        import psycopg2.extras
+        from pgvector.psycopg2 import register_vector
+    except ImportError:
+        raise ImportError("PostgreSQL 벡터 데이터베이스에는 psycopg2와 pgvector가 필요합니다. "
+                          "pip install psycopg2-binary pgvector")
+    return psycopg2, register_vector
+
+def _metadata(value) -> dict:
+    """JSONB 컬럼 값 → dict (psycopg2는 JSONB를 dict로 돌려줌)"""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    return json.loads(value)
+
+class VectorDatabase:
+    """
+    documents 테이블과 ANN 색인을 관리하는 PostgreSQL + pgvector 벡터 데이터베이스
+    """
+
+    def __init__(self, config: dict, embedding_dim: int = EMBEDDING_DIMENSION,
+                 embedding_model: str = EMBEDDING_MODEL, index_type: str = VECTOR_INDEX_TYPE,
+                 hnsw_m: int = HNSW_M, hnsw_ef_construction: int = HNSW_EF_CONSTRUCTION,
+                 hnsw_ef_search: int = HNSW_EF_SEARCH, ivfflat_lists: Optional[int] = None,
+                 ivfflat_probes: int = IVFFLAT_PROBES, pool_size: int = POOL_SIZE,
+                 insert_method: str = 'copy', insert_batch_rows: int = INSERT_BATCH_ROWS):
+        """
+        Args:
+            config (dict): psycopg2 접속 설정
+            embedding_dim (int): 임베딩 차원수
+            embedding_model (str): 임베딩 모델 이름
+            index_type (str): ANN 색인 종류 ('hnsw' 또는 'ivfflat')
+            hnsw_m (int): HNSW 노드별 연결 수
+            hnsw_ef_construction (int): HNSW 색인 생성 시 후보 목록 크기
+            hnsw_ef_search (int): HNSW 검색 시 후보 목록 크기
+            ivfflat_lists (int): IVFFlat 리스트 수 (None이면 행 수로 자동 결정)
+            ivfflat_probes (int): IVFFlat 검색 시 살펴볼 리스트 수
+            pool_size (int): 검색/저장용 연결 풀 크기 (동시에 실행할 수 있는 검색 수)
+            insert_method (str): 'copy' (COPY 바이너리) 또는 'values' (여러 행 INSERT ... VALUES)
+            insert_batch_rows (int): 트랜잭션 하나에 저장할 청크 수
+        """
+        if index_type not in ('hnsw', 'ivfflat'):
+            raise ValueError(f"지원하지 않는 색인 종류입니다: {index_type} (hnsw 또는 ivfflat)")
+        if insert_method not in ('copy', 'values'):
+            raise ValueError(f"지원하지 않는 저장 방식입니다: {insert_method} (copy 또는 values)")
+
+        self.config = config
+        self.conn = None
+        self.embedding_model = embedding_model
+        self.embedding_dim = embedding_dim
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivfflat_lists = ivfflat_lists
+        self.ivfflat_probes = ivfflat_probes
+        self.pool_size = pool_size
+        self.insert_method = insert_method
+        self.insert_batch_rows = insert_batch_rows
+        self.pool = None
+        # 풀은 연결이 모자라면 예외를 내므로, 빌릴 수 있는 수만큼 세마포어로 대기
+        self._pool_slots = threading.BoundedSemaphore(max(1, pool_size))
+        # 연결별로 마지막에 적용한 검색 파라미터 (id(연결) → [연결, (ef_search, probes)])
+        # 연결 객체도 함께 보관하므로 닫힌 연결의 id가 새 연결에 재사용되지 않음
+        self._applied_params = {}
+
+    def connect(self) -> bool:
+        """데이터베이스에 연결 (관리용 연결 self.conn + 검색/저장용 연결 풀)"""
+        psycopg2, register_vector = _require_psycopg2()
+        try:
+            self.conn = psycopg2.connect(**self.config)
+            self.conn.autocommit = True
+            register_vector(self.conn)
+            self.pool = psycopg2.pool.ThreadedConnectionPool(1, max(1, self.pool_size), **self.config)
+            print(f"✅ PostgreSQL 연결 성공 (연결 풀 {self.pool_size}개)")
+            return True
+        except Exception as e:
+            print(f"❌ PostgreSQL 연결 실패: {e}")
+            print("\n💡 PostgreSQL 서버가 실행 중인지 확인하세요:")
+            print("   brew services start postgresql@14")
+            print("   또는 Docker: docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=postgres postgres:14")
+            return False
+
+    def create_database_if_not_exists(self):
+        """데이터베이스가 없으면 생성"""
+        psycopg2, _ = _require_psycopg2()
+        try:
+            # postgres 데이터베이스에 연결하여 vector_qa 데이터베이스 생성
+            temp_config = self.config.copy()
+            temp_config['database'] = 'postgres'
+
+            temp_conn = psycopg2.connect(**temp_config)
+            temp_conn.autocommit = True
+
+            with temp_conn.cursor() as cur:
+                # 데이터베이스 존재 확인
+                cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (self.config['database'],))
+                if not cur.fetchone():
+                    cur.execute(f"CREATE DATABASE {self.config['database']}")
+                    print(f"✅ 데이터베이스 '{self.config['database']}' 생성 완료")
+                else:
+                    print(f"ℹ️  데이터베이스 '{self.config['database']}' 이미 존재")
+
+            temp_conn.close()
+        except Exception as e:
+            print(f"❌ 데이터베이스 생성 실패: {e}")
+
+    def setup_tables(self) -> bool:
+        """필요한 테이블, 확장 및 벡터 색인 설정"""
+        if not self.conn:
+            print("❌ 데이터베이스 연결이 필요합니다")
+            return False
+
+        try:
+            with self.conn.cursor() as cur:
+                # pgvector 확장 설치
+                cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+                print("✅ pgvector 확장 설치 완료")
+
+                # 문서 테이블 생성
+                cur.execute(f"""
+                    CREATE TABLE IF NOT EXISTS documents (
+                        id SERIAL PRIMARY KEY,
+                        filename VARCHAR(255) NOT NULL,
+                        content TEXT NOT NULL,
+                        chunk_index INTEGER NOT NULL,
+                        chunk_text TEXT NOT NULL,
+                        embedding vector({self.embedding_dim}),
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        metadata JSONB,
+                        content_hash VARCHAR(64)
+                    )
+                """)
+
+                # 증분 색인용 청크 해시 컬럼 (이전 버전 테이블에 추가)
+                cur.execute("ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)")
+                cur.execute("CREATE INDEX IF NOT EXISTS documents_content_hash_idx ON documents (content_hash)")
+
+            print("✅ 테이블 설정 완료")
+            self.ensure_index()
+            self.set_search_params()
+            return True
+
+        except Exception as e:
+            print(f"❌ 테이블 설정 실패: {e}")
+            return False
+
+    @contextmanager
+    def connection(self):
+        """
+        연결 풀에서 연결 빌리기 (풀이 모두 사용 중이면 반납될 때까지 대기)
+
+        빌린 연결은 autocommit이며 현재 검색 파라미터(hnsw.ef_search, ivfflat.probes)가 적용되어 있습니다.
+        """
+        if self.pool is None:
+            raise RuntimeError("connect()를 먼저 호출하세요")
+        _, register_vector = _require_psycopg2()
+
+        with self._pool_slots:
+            conn = self.pool.getconn()
+            try:
+                state = self._applied_params.get(id(conn))
+                if state is None:
+                    conn.autocommit = True
+                    register_vector(conn)
+                    state = self._applied_params[id(conn)] = [conn, None]
+                params = (self.hnsw_ef_search, self.ivfflat_probes)
+                if state[1] != params:
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT set_config('hnsw.ef_search', %s, false), "
+                                    "set_config('ivfflat.probes', %s, false)", tuple(str(value) for value in params))
+                    state[1] = params
+                yield conn
+            finally:
+                self.pool.putconn(conn)
+
+    def index_definition(self) -> Optional[str]:
+        """현재 벡터 색인 정의 (없으면 None)"""
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT indexdef FROM pg_indexes WHERE tablename = 'documents' AND indexname = %s",
+                        (EMBEDDING_INDEX_NAME,))
+            row = cur.fetchone()
+        return row[0] if row else None
+
+    def _row_count(self) -> int:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM documents")
+            return cur.fetchone()[0]
+
+    def build_index(self, index_type: Optional[str] = None) -> bool:
+        """
+        벡터 색인을 (다시) 생성
+
+        HNSW는 빈 테이블에도 만들 수 있고 이후 INSERT가 그래프에 바로 반영됩니다.
+        IVFFlat은 생성 시점의 데이터로 리스트 중심을 학습하므로 데이터를 적재한 뒤 만들어야 합니다.
+
+        Args:
+            index_type (str): 'hnsw' 또는 'ivfflat' (None이면 현재 설정)
+
+        Returns:
+            bool: 성공 여부
+        """
+        if not self.conn:
+            print("❌ 데이터베이스 연결이 필요합니다")
+            return False
+
+        if index_type:
+            if index_type not in ('hnsw', 'ivfflat'):
+                raise ValueError(f"지원하지 않는 색인 종류입니다: {index_type} (hnsw 또는 ivfflat)")
+            self.index_type = index_type
+
+        row_count = self._row_count()
+        if self.index_type == 'hnsw':
+            options = f"m = {self.hnsw_m}, ef_construction = {self.hnsw_ef_construction}"
+        else:
+            if row_count == 0:
+                print("ℹ️  IVFFlat 색인은 문서를 적재한 뒤 생성합니다")
+                return False
+            lists = self.ivfflat_lists or ivfflat_lists(row_count)
+            options = f"lists = {lists}"
+
+        start_time = time.time()
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(f"DROP INDEX IF EXISTS {EMBEDDING_INDEX_NAME}")
+                cur.execute(f"""
+                    CREATE INDEX {EMBEDDING_INDEX_NAME}
+                    ON documents USING {self.index_type} (embedding vector_cosine_ops)
+                    WITH ({options})
+                """)
+            print(f"✅ {self.index_type.upper()} 색인 생성 완료 ({options}, {row_count:,}행, "
+                  f"{time.time() - start_time:.1f}초)")
+            return True
+        except Exception as e:
+            print(f"❌ 벡터 색인 생성 실패: {e}")
+            return False
+
+    def ensure_index(self) -> bool:
+        """
+        설정과 맞는 벡터 색인 유지 (문서 적재 후 호출)
+
+        - 색인이 없거나 종류가 다르면 생성
+        - IVFFlat은 행 수가 늘어 적정 리스트 수가 현재의 2배를 넘으면 다시 생성
+
+        Returns:
+            bool: 사용 가능한 색인이 있는지 여부
+        """
+        definition = self.index_definition()
+        if definition is None or f"USING {self.index_type}" not in definition:
+            return self.build_index()
+
+        if self.index_type == 'ivfflat' and self.ivfflat_lists is None:
+            current = definition.split("lists='")[-1].split("'")[0] if "lists='" in definition else None
+            wanted = ivfflat_lists(self._row_count())
+            if current and current.isdigit() and wanted > 2 * int(current):
+                print(f"🔄 IVFFlat 리스트 수 조정: {current} → {wanted}")
+                return self.build_index()
+        return True
+
+    def set_search_params(self, hnsw_ef_search: Optional[int] = None, ivfflat_probes: Optional[int] = None):
+        """
+        검색 파라미터 설정 (세션 단위: hnsw.ef_search, ivfflat.probes)
+
+        Args:
+            hnsw_ef_search (int): HNSW 검색 후보 목록 크기 (클수록 재현율↑, 지연 시간↑)
+            ivfflat_probes (int): IVFFlat 검색 리스트 수 (클수록 재현율↑, 지연 시간↑)
+        """
+        if hnsw_ef_search is not None:
+            self.hnsw_ef_search = hnsw_ef_search
+        if ivfflat_probes is not None:
+            self.ivfflat_probes = ivfflat_probes
+        # 풀 연결은 다음에 빌릴 때 적용, 관리용 연결은 바로 적용
+        if not self.conn:
+            return
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT set_config('hnsw.ef_search', %s, false), set_config('ivfflat.probes', %s, false)",
+                        (str(self.hnsw_ef_search), str(self.ivfflat_probes)))
+
+    def search(self, query_embedding, limit: int = 5, similarity_threshold: float = 0.0,
+               exact: bool = False) -> List[Dict]:
+        """
+        코사인 유사도 기준 최근접 청크 검색
+
+        색인을 사용할 수 있도록 거리 식 하나로 정렬해 LIMIT개 후보를 가져온 뒤 임계값을 적용합니다.
+        (WHERE 절의 유사도 조건은 색인 정렬을 막아 전체 스캔이 되므로 후보 조회 뒤에 거릅니다.)
+
+        Args:
+            query_embedding (List[float]): 질의 임베딩
+            limit (int): 반환할 최대 결과 수
+            similarity_threshold (float): 유사도 임계값 (0~1)
+            exact (bool): True면 색인 없이 전체 스캔 (재현율 기준값)
+
+        Returns:
+            List[Dict]: 유사도 내림차순 청크 리스트
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        with self.connection() as conn, conn.cursor() as cur:
+            if exact:
+                cur.execute("SET enable_indexscan = off")
+            try:
+                cur.execute("""
+                    SELECT id, filename, chunk_index, chunk_text, metadata, 1 - distance AS similarity
+                    FROM (
+                        SELECT id, filename, chunk_index, chunk_text, metadata,
+                               embedding <=> %s AS distance
+                        FROM documents
+                        ORDER BY distance
+                        LIMIT %s
+                    ) nearest
+                    WHERE 1 - distance > %s
+                    ORDER BY distance
+                """, (query, limit, similarity_threshold))
+                rows = cur.fetchall()
+            finally:
+                if exact:
+                    cur.execute("RESET enable_indexscan")
+
+        return [{
+            'id': row[0],
+            'filename': row[1],
+            'chunk_index': row[2],
+            'chunk_text': row[3],
+            'metadata': _metadata(row[4]),
+            'similarity': float(row[5])
+        } for row in rows]
+
+    def insert(self, rows: List[Dict]) -> int:
+        """
+        청크 행 일괄 저장 (insert_batch_rows개씩 트랜잭션 하나, 배치마다 COPY 또는 여러 행 INSERT 한 번)
+
+        실패한 배치는 롤백되고 예외를 전달합니다 (앞서 커밋된 배치는 유지).
+
+        Args:
+            rows (List[Dict]): filename, content, chunk_index, chunk_text, embedding, metadata, content_hash
+
+        Returns:
+            int: 저장한 행 수
+        """
+        psycopg2, _ = _require_psycopg2()
+        columns = ', '.join(DOCUMENT_COLUMNS)
+        saved = 0
+        start_time = time.time()
+
+        with self.connection() as conn:
+            conn.autocommit = False
+            try:
+                for start in range(0, len(rows), self.insert_batch_rows):
+                    batch = rows[start:start + self.insert_batch_rows]
+                    with conn.cursor() as cur:
+                        if self.insert_method == 'copy':
+                            cur.copy_expert(f"COPY documents ({columns}) FROM STDIN WITH (FORMAT BINARY)",
+                                            io.BytesIO(copy_binary_rows(batch)))
+                        else:
+                            psycopg2.extras.execute_values(cur, f"INSERT INTO documents ({columns}) VALUES %s", [(
+                                row['filename'],
+                                row['content'],
+                                row['chunk_index'],
+                                row['chunk_text'],
+                                np.asarray(row['embedding'], dtype=np.float32),
+                                json.dumps(row.get('metadata') or {}),
+                                row.get('content_hash')
+                            ) for row in batch], page_size=len(batch))
+                    conn.commit()
+                    saved += len(batch)
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.autocommit = True
+
+        elapsed = max(time.time() - start_time, 1e-9)
+        print(f"  💾 {saved:,}개 청크 저장 ({self.insert_method}, 배치 {self.insert_batch_rows}행, "
+              f"{saved / elapsed:,.0f} 행/초)")
+        return saved
+
+    def chunk_rows(self) -> List[tuple]:
+        """증분 색인용 기존 행 목록 [(id, filename, chunk_index, content_hash, 원문 md5)]"""
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT id, filename, chunk_index, content_hash, md5(content) FROM documents")
+            return cur.fetchall()
+
+    def chunks(self) -> List[tuple]:
+        """저장된 청크 목록 [(id, filename, chunk_index, chunk_text)] (키워드 색인용)"""
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT id, filename, chunk_index, chunk_text FROM documents ORDER BY id")
+            return cur.fetchall()
+
+    def embeddings_for(self, content_hashes: List[str]) -> Dict[str, np.ndarray]:
+        """청크 해시별 저장된 임베딩 (해시당 하나, 없는 해시는 결과에 없음)"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT DISTINCT ON (content_hash) content_hash, embedding
+                FROM documents WHERE content_hash = ANY(%s)
+            """, (list(content_hashes),))
+            return dict(cur.fetchall())
+
+    def update_chunks(self, updates: List[tuple]):
+        """청크 원문/번호/metadata 갱신 [(id, content, chunk_index, metadata)]"""
+        with self.conn.cursor() as cur:
+            for row_id, content, chunk_index, metadata in updates:
+                cur.execute("""
+                    UPDATE documents SET content = %s, chunk_index = %s, metadata = %s WHERE id = %s
+                """, (content, chunk_index, json.dumps(metadata), row_id))
+
+    def delete(self, ids: List[int]):
+        """id 목록의 행 삭제"""
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM documents WHERE id = ANY(%s)", (list(ids),))
+
+    def clear(self):
+        """모든 행 삭제"""
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM documents")
+
+    def stats(self) -> Dict:
+        """
+        저장 현황 (파일 수, 청크 수, 파일별 청크 수/청크 길이, 벡터 색인)
+
+        Returns:
+            Dict: 통계 정보 (file_stats: [(파일명, 청크 수, 평균/최대/최소 청크 길이)])
+        """
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT filename, COUNT(*), AVG(LENGTH(chunk_text))::float,
+                       MAX(LENGTH(chunk_text)), MIN(LENGTH(chunk_text))
+                FROM documents GROUP BY filename ORDER BY filename
+            """)
+            file_stats = cur.fetchall()
+        return {
+            'total_files': len(file_stats),
+            'total_chunks': sum(row[1] for row in file_stats),
+            'file_stats': file_stats,
+            'index': self.index_definition()
+        }
+
+    def sample_embeddings(self, n: int = 50, seed: float = 0.42) -> List[np.ndarray]:
+        """벤치마크 질의로 쓸 저장된 임베딩 표본 (같은 seed면 같은 표본)"""
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT setseed(%s)", (seed,))
+            cur.execute("SELECT embedding FROM documents ORDER BY random() LIMIT %s", (n,))
+            return [np.asarray(row[0], dtype=np.float32) for row in cur.fetchall()]
+
+    def close(self):
+        """데이터베이스 연결 및 연결 풀 종료"""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+            self._applied_params = {}
+        if self.conn:
+            self.conn.close()
+            print("🔒 데이터베이스 연결 종료")
+
+def benchmark_search(vector_db: VectorDatabase, query_embeddings: List, k: int = 10,
+                     search_params: Optional[List[dict]] = None, concurrency: int = 1) -> pd.DataFrame:
+    """
+    색인 검색 vs 정확 검색 지연 시간과 recall@k 비교
+
+    Args:
+        vector_db (VectorDatabase | LocalVectorStore): 연결된 벡터 저장소
+        query_embeddings (List): 질의 임베딩 리스트
+        k (int): 검색 결과 수
+        search_params (List[dict]): 비교할 검색 파라미터 조합
+            (예: [{'hnsw_ef_search': 20}, {'hnsw_ef_search': 80}], 양자화 로컬 저장소는 [{'rerank_candidates': 50}],
+            None이면 현재 설정 하나)
+        concurrency (int): 색인 검색을 동시에 실행할 스레드 수 (연결 풀 크기 이하 권장)
+
+    Returns:
+        pd.DataFrame: 설정별 평균/p50/p95 지연 시간(ms), 처리량(QPS), 평균 recall@k
+    """
+    def timed_search(query, exact):
+        start = time.perf_counter()
+        results = vector_db.search(query, limit=k, similarity_threshold=-1.0, exact=exact)
+        return (time.perf_counter() - start) * 1000, [result['id'] for result in results]
+
+    exact_times, exact_ids = [], []
+    start = time.perf_counter()
+    for query in query_embeddings:
+        elapsed, ids = timed_search(query, exact=True)
+        exact_times.append(elapsed)
+        exact_ids.append(set(ids))
+    exact_wall = time.perf_counter() - start
+
+    rows = [{
+        '검색': '정확 검색 (전체 스캔)',
+        '평균(ms)': np.mean(exact_times),
+        'p50(ms)': np.percentile(exact_times, 50),
+        'p95(ms)': np.percentile(exact_times, 95),
+        'QPS': len(query_embeddings) / max(exact_wall, 1e-9),
+        f'recall@{k}': 1.0
+    }]
+
+    original = {name: getattr(vector_db, name) for name in ('hnsw_ef_search', 'ivfflat_probes', 'rerank_candidates')
+                if hasattr(vector_db, name)}
+    try:
+        for params in (search_params or [{}]):
+            vector_db.set_search_params(**params)
+            if vector_db.index_type == 'hnsw':
+                label = f"HNSW ef_search={vector_db.hnsw_ef_search}"
+            elif vector_db.index_type == 'ivfflat':
+                label = f"IVFFlat probes={vector_db.ivfflat_probes}"
+            elif hasattr(vector_db, 'rerank_candidates') and vector_db.index_type != 'exact':
+                label = f"{vector_db.index_type} re-rank 후보={vector_db.rerank_candidates}"
+            else:
+                label = vector_db.index_type
+            if concurrency > 1:
+                label += f" (동시 {concurrency})"
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                timings = list(executor.map(lambda query: timed_search(query, exact=False), query_embeddings))
+            wall = time.perf_counter() - start
+            times = [elapsed for elapsed, _ in timings]
+            recalls = [len(expected & set(ids)) / len(expected) if expected else 1.0
+                       for (_, ids), expected in zip(timings, exact_ids)]
+            rows.append({
+                '검색': label,
+                '평균(ms)': np.mean(times),
+                'p50(ms)': np.percentile(times, 50),
+                'p95(ms)': np.percentile(times, 95),
+                'QPS': len(query_embeddings) / max(wall, 1e-9),
+                f'recall@{k}': np.mean(recalls)
+            })
+    finally:
+        vector_db.set_search_params(**original)
+
+    return pd.DataFrame(rows)
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='pgvector ANN 색인 생성 및 검색 벤치마크')
+    parser.add_argument('--host', default=DEFAULT_DB_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=DEFAULT_DB_CONFIG['port'])
+    parser.add_argument('--database', default=DEFAULT_DB_CONFIG['database'])
+    parser.add_argument('--user', default=DEFAULT_DB_CONFIG['user'])
+    parser.add_argument('--password', default=DEFAULT_DB_CONFIG['password'])
+    parser.add_argument('--index-type', choices=['hnsw', 'ivfflat'], default=VECTOR_INDEX_TYPE, help='ANN 색인 종류')
+    parser.add_argument('--m', type=int, default=HNSW_M, help='HNSW m')
+    parser.add_argument('--ef-construction', type=int, default=HNSW_EF_CONSTRUCTION, help='HNSW ef_construction')
+    parser.add_argument('--lists', type=int, default=None, help='IVFFlat lists (기본: 행 수로 자동)')
+    parser.add_argument('--rebuild', action='store_true', help='색인 다시 생성')
+    parser.add_argument('--queries', type=int, default=50, help='벤치마크 질의 수 (저장된 임베딩 표본)')
+    parser.add_argument('--k', type=int, default=10, help='검색 결과 수')
+    parser.add_argument('--ef-search', type=int, nargs='*', default=[20, 40, 80, 160], help='비교할 HNSW ef_search 값')
+    parser.add_argument('--probes', type=int, nargs='*', default=[1, 5, 10, 20], help='비교할 IVFFlat probes 값')
+    parser.add_argument('--pool-size', type=int, default=POOL_SIZE, help='연결 풀 크기')
+    parser.add_argument('--concurrency', type=int, default=1, help='색인 검색 동시 실행 스레드 수')
+    args = parser.parse_args()
+
+    config = {'host': args.host, 'port': args.port, 'database': args.database,
+              'user': args.user, 'password': args.password}
+    vector_db = VectorDatabase(config, index_type=args.index_type, hnsw_m=args.m,
+                               hnsw_ef_construction=args.ef_construction, ivfflat_lists=args.lists,
+                               pool_size=args.pool_size)
+    if not vector_db.connect():
+        return
+
+    try:
+        if args.rebuild:
+            vector_db.build_index()
+        elif not vector_db.ensure_index():
+            return
+
+        stats = vector_db.stats()
+        print(f"\n📊 {stats['total_chunks']:,}개 청크 / 색인: {stats['index']}")
+
+        queries = vector_db.sample_embeddings(args.queries)
+        if not queries:
+            print("❌ 저장된 임베딩이 없습니다")
+            return
+
+        if args.index_type == 'hnsw':
+            search_params = [{'hnsw_ef_search': value} for value in args.ef_search]
+        else:
+            search_params = [{'ivfflat_probes': value} for value in args.probes]
+        report = benchmark_search(vector_db, queries, k=args.k, search_params=search_params,
+                                  concurrency=args.concurrency)
+        print(f"\n⚡ 검색 벤치마크 (질의 {len(queries)}개, k={args.k}, 동시 {args.concurrency})")
+        print(report.round(3).to_string(index=False))
+    finally:
+        vector_db.close()
+
+if __name__ == "__main__":
+    main()
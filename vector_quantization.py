@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임베딩 양자화
+정규화된 float32 임베딩을 검색용 압축 코드로 바꿉니다.
+- sq8: 차원별 최소/최대 기준 8비트 스칼라 양자화 (벡터당 차원 수 바이트, 약 4배 절감)
+- pq: 곱 양자화 - 벡터를 부분 공간으로 나누어 부분 공간별 256개 중심점 번호로 저장 (768차원 96개 부분 공간이면 약 32배 절감)
+검색은 코드로 근사 점수를 구해 후보를 고르고, 후보만 원본 float32 벡터로 다시 점수를 매깁니다(re-rank).
+"""
+
+import os
+import time
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+QUANTIZER_FILE = 'quantizer.npz'
+
+PQ_SUBVECTORS = 96  # 곱 양자화 부분 공간 수 (임베딩 차원의 약수)
+PQ_CENTROIDS = 256  # 부분 공간별 중심점 수 (코드 1바이트)
+PQ_TRAIN_ROWS = 8192  # 중심점 학습에 쓸 최대 표본 수
+PQ_TRAIN_ITERATIONS = 12  # k-means 반복 횟수
+
+RERANK_CANDIDATES = 100  # 원본 벡터로 다시 점수를 매길 후보 수 (결과 수보다 작으면 결과 수 사용)
+
+QUANTIZATION_TYPES = ('sq8', 'pq')
+
+# 검색 시 한 번에 내적을 계산할 행 수 (메모리 맵 전체를 한 번에 올리지 않도록)
+SEARCH_BLOCK_ROWS = 65536
+
+class ScalarQuantizer:
+    """
+    차원별 8비트 스칼라 양자화 (x ≈ lower + scale × code)
+    """
+
+    kind = 'sq8'
+
+    def __init__(self, lower: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None):
+        self.lower = lower
+        self.scale = scale
+
+    @property
+    def trained(self) -> bool:
+        return self.lower is not None
+
+    def code_bytes(self, dim: int) -> int:
+        """벡터 하나의 코드 바이트 수"""
+        return dim
+
+    def fit(self, vectors: np.ndarray, seed: int = 42) -> 'ScalarQuantizer':
+        """학습 벡터의 차원별 최소/최대로 구간 설정"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.lower = vectors.min(axis=0)
+        upper = vectors.max(axis=0)
+        self.scale = np.maximum(upper - self.lower, 1e-12).astype(np.float32) / 255
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """벡터 → (행 수, 차원) uint8 코드 (학습 구간 밖 값은 끝 값으로 자름)"""
+        codes = np.rint((np.asarray(vectors, dtype=np.float32) - self.lower) / self.scale)
+        return np.clip(codes, 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """코드 → 근사 벡터"""
+        return self.lower + codes.astype(np.float32) * self.scale
+
+    def scorer(self, queries: np.ndarray):
+        """
+        코드 블록 → 질의별 근사 내적 함수
+
+        q·x ≈ q·lower + (q × scale)·code 이므로 질의마다 한 번 계산한 값과 코드의 내적만 구합니다.
+        """
+        weighted = (queries * self.scale).astype(np.float32)
+        offsets = (queries @ self.lower)[:, None]
+        return lambda codes: weighted @ codes.astype(np.float32).T + offsets
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {'lower': self.lower, 'scale': self.scale}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> 'ScalarQuantizer':
+        return cls(state['lower'], state['scale'])
+
+class ProductQuantizer:
+    """
+    곱 양자화 (부분 공간별 k-means 중심점 번호)
+    """
+
+    kind = 'pq'
+
+    def __init__(self, subvectors: int = PQ_SUBVECTORS, centroids: int = PQ_CENTROIDS,
+                 codebooks: Optional[np.ndarray] = None):
+        """
+        Args:
+            subvectors (int): 부분 공간 수 (차원의 약수)
+            centroids (int): 부분 공간별 중심점 수 (최대 256)
+            codebooks (np.ndarray): 학습된 중심점 (부분 공간 수, 중심점 수, 부분 차원)
+        """
+        if not 1 <= centroids <= 256:
+            raise ValueError(f"centroids는 1~256이어야 합니다 ({centroids})")
+        self.subvectors = subvectors
+        self.centroids = centroids
+        self.codebooks = codebooks
+
+    @property
+    def trained(self) -> bool:
+        return self.codebooks is not None
+
+    def code_bytes(self, dim: int) -> int:
+        """벡터 하나의 코드 바이트 수"""
+        return self.subvectors
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        """(행 수, 차원) → (부분 공간 수, 행 수, 부분 차원)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape[1] % self.subvectors:
+            raise ValueError(f"임베딩 차원({vectors.shape[1]})이 부분 공간 수({self.subvectors})로 나누어 떨어지지 않습니다")
+        return vectors.reshape(len(vectors), self.subvectors, -1).transpose(1, 0, 2)
+
+    @staticmethod
+    def _nearest(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+        """점별 가장 가까운 중심점 번호 (||c||² - 2x·c 최소)"""
+        return np.argmin((centers * centers).sum(axis=1) - 2 * points @ centers.T, axis=1)
+
+    def fit(self, vectors: np.ndarray, seed: int = 42,
+            train_rows: int = PQ_TRAIN_ROWS, iterations: int = PQ_TRAIN_ITERATIONS) -> 'ProductQuantizer':
+        """
+        부분 공간별 k-means로 중심점 학습 (표본은 최대 train_rows개, 같은 seed면 같은 결과)
+
+        Args:
+            vectors (np.ndarray): 학습 벡터
+            seed (int): 표본/초기 중심점 시드
+            train_rows (int): 학습 표본 수 상한
+            iterations (int): k-means 반복 횟수
+        """
+        rng = np.random.default_rng(seed)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(vectors) > train_rows:
+            vectors = vectors[np.sort(rng.choice(len(vectors), train_rows, replace=False))]
+        subspaces = self._split(vectors)
+        centroids = min(self.centroids, len(vectors))
+
+        codebooks = np.zeros((self.subvectors, self.centroids, subspaces.shape[2]), dtype=np.float32)
+        for j, points in enumerate(subspaces):
+            centers = points[rng.choice(len(points), centroids, replace=False)].copy()
+            for _ in range(iterations):
+                assignment = self._nearest(points, centers)
+                counts = np.bincount(assignment, minlength=centroids)
+                sums = np.zeros_like(centers)
+                np.add.at(sums, assignment, points)
+                filled = counts > 0
+                # 비어 있는 중심점은 이전 위치 유지
+                centers[filled] = sums[filled] / counts[filled, None]
+            codebooks[j, :centroids] = centers
+            # 표본이 중심점 수보다 적으면 남는 번호는 첫 중심점으로 채움 (인코딩에서 선택되지 않음)
+            codebooks[j, centroids:] = centers[0]
+        self.codebooks = codebooks
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """벡터 → (행 수, 부분 공간 수) uint8 코드"""
+        subspaces = self._split(vectors)
+        codes = np.empty((subspaces.shape[1], self.subvectors), dtype=np.uint8)
+        for j, points in enumerate(subspaces):
+            codes[:, j] = self._nearest(points, self.codebooks[j])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """코드 → 근사 벡터"""
+        return np.concatenate([self.codebooks[j][codes[:, j]] for j in range(self.subvectors)], axis=1)
+
+    def scorer(self, queries: np.ndarray):
+        """
+        코드 블록 → 질의별 근사 내적 함수 (비대칭 거리 계산)
+
+        질의마다 부분 공간별 (중심점 수,) 내적 표를 한 번 만들고, 코드로 표를 찾아 더합니다.
+        """
+        # (질의 수, 부분 공간 수, 중심점 수)
+        tables = np.einsum('qjd,jcd->qjc', self._split(queries).transpose(1, 0, 2), self.codebooks)
+
+        def score(codes: np.ndarray) -> np.ndarray:
+            columns = np.ascontiguousarray(codes.T)  # 부분 공간별 코드를 연속 메모리로
+            scores = np.zeros((len(queries), len(codes)), dtype=np.float32)
+            for j in range(self.subvectors):
+                scores += tables[:, j, columns[j]]
+            return scores
+        return score
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {'codebooks': self.codebooks, 'centroids': np.array(self.centroids)}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> 'ProductQuantizer':
+        codebooks = state['codebooks']
+        return cls(subvectors=codebooks.shape[0], centroids=int(state['centroids']), codebooks=codebooks)
+
+def make_quantizer(kind: str, pq_subvectors: int = PQ_SUBVECTORS):
+    """
+    양자화 방식 이름으로 양자화기 생성
+
+    Args:
+        kind (str): 'sq8' 또는 'pq'
+        pq_subvectors (int): 곱 양자화 부분 공간 수
+
+    Returns:
+        ScalarQuantizer | ProductQuantizer: 학습 전 양자화기
+    """
+    if kind == 'sq8':
+        return ScalarQuantizer()
+    if kind == 'pq':
+        return ProductQuantizer(subvectors=pq_subvectors)
+    raise ValueError(f"지원하지 않는 양자화 방식입니다: {kind} (사용 가능: {', '.join(QUANTIZATION_TYPES)})")
+
+def save_quantizer(path: str, quantizer, codes: np.ndarray, trained_rows: int):
+    """양자화기와 코드를 npz로 저장 (임시 파일 → 교체)"""
+    path = Path(path)
+    temp_path = path.with_name(path.name + '.tmp.npz')
+    np.savez(temp_path, kind=np.array(quantizer.kind), codes=codes, trained_rows=np.array(trained_rows),
+             **quantizer.state())
+    os.replace(temp_path, path)
+
+def load_quantizer(path: str) -> tuple:
+    """
+    저장된 양자화기와 코드 읽기
+
+    Returns:
+        tuple: (양자화기, 코드, 학습 당시 행 수)
+    """
+    with np.load(path) as data:
+        state = {name: data[name] for name in data.files}
+    kind = str(state['kind'])
+    quantizer = (ScalarQuantizer if kind == 'sq8' else ProductQuantizer).from_state(state)
+    return quantizer, state['codes'], int(state['trained_rows'])
+
+def top_k(matrix: np.ndarray, queries: np.ndarray, k: int,
+          block_rows: int = SEARCH_BLOCK_ROWS, scorer: Optional[Callable] = None) -> tuple:
+    """
+    블록 단위 내적으로 질의별 상위 k개 행 찾기
+
+    Args:
+        matrix (np.ndarray): (행 수, 차원) 정규화된 벡터 행렬 (메모리 맵 가능) 또는 양자화 코드
+        queries (np.ndarray): (질의 수, 차원) 정규화된 질의 행렬
+        k (int): 질의별 결과 수
+        block_rows (int): 한 번에 계산할 행 수
+        scorer (Callable): 행 블록 → (질의 수, 블록 행 수) 점수 함수 (기본: 질의와의 내적)
+
+    Returns:
+        tuple: (행 위치, 점수) — 각각 (질의 수, min(k, 행 수)) 배열, 점수 내림차순
+    """
+    n_rows = len(matrix)
+    k = min(k, n_rows)
+    best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+    best_positions = np.zeros((len(queries), 0), dtype=np.int64)
+    if k == 0:
+        return best_positions, best_scores
+
+    for start in range(0, n_rows, block_rows):
+        block = np.asarray(matrix[start:start + block_rows])
+        scores = scorer(block) if scorer else queries @ block.T
+        positions = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+        # 이전 블록까지의 상위 k개와 합쳐 다시 상위 k개만 유지
+        scores = np.concatenate([best_scores, scores], axis=1)
+        positions = np.concatenate([best_positions, positions], axis=1)
+        if scores.shape[1] > k:
+            keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            scores = np.take_along_axis(scores, keep, axis=1)
+            positions = np.take_along_axis(positions, keep, axis=1)
+        best_scores, best_positions = scores, positions
+
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    return np.take_along_axis(best_positions, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+def evaluate_quantization(vectors: np.ndarray, queries: np.ndarray, k: int = 10,
+                          kinds: tuple = QUANTIZATION_TYPES, rerank_candidates: int = RERANK_CANDIDATES,
+                          pq_subvectors: int = PQ_SUBVECTORS) -> pd.DataFrame:
+    """
+    양자화 방식별 메모리 절감과 recall@k 손실 측정 (기준: float32 정확 검색)
+
+    Args:
+        vectors (np.ndarray): 정규화된 저장 벡터
+        queries (np.ndarray): 정규화된 질의 벡터
+        k (int): 검색 결과 수
+        kinds (tuple): 비교할 양자화 방식
+        rerank_candidates (int): re-rank 후보 수
+        pq_subvectors (int): 곱 양자화 부분 공간 수
+
+    Returns:
+        pd.DataFrame: 방식별 벡터당 바이트, 압축률, 학습 시간, re-rank 전/후 recall@k, 질의당 검색 시간(ms)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    queries = np.asarray(queries, dtype=np.float32)
+    dim = vectors.shape[1]
+
+    start = time.perf_counter()
+    exact_positions, _ = top_k(vectors, queries, k)
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    expected = [set(row) for row in exact_positions]
+
+    def recall(positions):
+        return float(np.mean([len(want & set(got[:k])) / len(want) for want, got in zip(expected, positions)]))
+
+    report = [{'방식': 'float32 (정확 검색)', '벡터당 바이트': dim * 4, '압축률': 1.0, '학습(초)': 0.0,
+             f'recall@{k}': 1.0, f'recall@{k} (re-rank)': 1.0, '질의당(ms)': exact_ms}]
+    for kind in kinds:
+        quantizer = make_quantizer(kind, pq_subvectors)
+        start = time.perf_counter()
+        quantizer.fit(vectors)
+        codes = quantizer.encode(vectors)
+        train_seconds = time.perf_counter() - start
+
+        approx_positions, _ = top_k(codes, queries, k, scorer=quantizer.scorer(queries))
+
+        start = time.perf_counter()
+        candidates, _ = top_k(codes, queries, max(rerank_candidates, k), scorer=quantizer.scorer(queries))
+        reranked = []
+        for query, candidate_rows in zip(queries, candidates):
+            scores = vectors[candidate_rows] @ query
+            reranked.append(candidate_rows[np.argsort(-scores, kind='stable')[:k]])
+        search_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        code_bytes = quantizer.code_bytes(dim)
+        report.append({
+            '방식': f"{kind} (후보 {max(rerank_candidates, k)}개 re-rank)",
+            '벡터당 바이트': code_bytes,
+            '압축률': dim * 4 / code_bytes,
+            '학습(초)': train_seconds,
+            f'recall@{k}': recall(approx_positions),
+            f'recall@{k} (re-rank)': recall(reranked),
+            '질의당(ms)': search_ms
+        })
+    return pd.DataFrame(report)
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='임베딩 양자화 메모리 절감/recall 손실 측정')
+    parser.add_argument('--root', default=None, help='로컬 벡터 저장소 폴더 (없으면 무작위 벡터)')
+    parser.add_argument('--rows', type=int, default=20000, help='무작위 벡터 수 (--root가 없을 때)')
+    parser.add_argument('--dim', type=int, default=768, help='무작위 벡터 차원 (--root가 없을 때)')
+    parser.add_argument('--queries', type=int, default=100, help='측정 질의 수')
+    parser.add_argument('--k', type=int, default=10, help='검색 결과 수')
+    parser.add_argument('--rerank', type=int, default=RERANK_CANDIDATES, help='re-rank 후보 수')
+    parser.add_argument('--subvectors', type=int, default=PQ_SUBVECTORS, help='곱 양자화 부분 공간 수')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    if args.root:
+        from local_vector_store import LocalVectorStore
+        store = LocalVectorStore(args.root)
+        if not store.metadata_path.exists():
+            print(f"❌ {args.root} 저장소가 없습니다")
+            return
+        store.connect()
+        vectors = np.array(store._vectors)
+        store.close()
+    else:
+        # 실제 임베딩처럼 몇 개의 주제 방향 주변에 모인 벡터
+        topics = rng.normal(size=(64, args.dim))
+        vectors = topics[rng.integers(0, 64, args.rows)] + 0.8 * rng.normal(size=(args.rows, args.dim))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors.astype(np.float32)
+    if len(vectors) == 0:
+        print("❌ 저장된 벡터가 없습니다")
+        return
+
+    queries = vectors[rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)]
+    queries = queries + 0.05 * rng.normal(size=queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    print(f"📊 {len(vectors):,}개 × {vectors.shape[1]}차원, 질의 {len(queries)}개, k={args.k}")
+    report = evaluate_quantization(vectors, queries, k=args.k, rerank_candidates=args.rerank,
+                                   pq_subvectors=args.subvectors)
+    print(report.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+if __name__ == "__main__":
+    main()